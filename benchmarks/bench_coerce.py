@@ -0,0 +1,105 @@
+"""Cells per second coercing a mixed-type sheet: per cell vs per column.
+
+Run from the repository root::
+
+    python benchmarks/bench_coerce.py [--rows 100000] [--repeat 3]
+
+Builds rows of raw cell values as Excel hands them over — whole numbers as
+floats, padded text, yes/no booleans, ';'-separated lists, link ids — for
+one column of each kind the reader handles (string, enum, integer, number,
+boolean, multi-value, to-one and to-many link). Then coerces every cell
+twice: with ``coerce_cell(value, col)``, which works out the column's
+coercion on each call, and with the reader's way, ``column_coercer(col)``
+looked up once per column and applied down the rows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List
+
+from gen3_metadata_templates.model import ColumnKind, ColumnSpec
+from gen3_metadata_templates.workbook.reader import coerce_cell, column_coercer
+
+
+def _col(name: str, data_type: str, kind=ColumnKind.PROPERTY, is_multi=False) -> ColumnSpec:
+    return ColumnSpec(
+        header=name,
+        prop_name=name,
+        kind=kind,
+        data_type=data_type,
+        required=False,
+        is_multi=is_multi,
+    )
+
+
+COLUMNS = [
+    _col("submitter_id", "string", ColumnKind.PK),
+    _col("sex", "enum"),
+    _col("age", "integer"),
+    _col("weight", "number"),
+    _col("consented", "boolean"),
+    _col("aliases", "string", is_multi=True),
+    _col("subjects", "string", ColumnKind.LINK),
+    _col("visits", "string", ColumnKind.LINK, is_multi=True),
+]
+
+
+def _rows(count: int) -> List[list]:
+    return [
+        [
+            f" subject_{i} ",
+            "Female" if i % 2 else "Male",
+            float(i % 90),
+            str(60 + i % 40 / 3),
+            "yes" if i % 3 else 0,
+            f"a{i}; b{i}",
+            f"parent_{i}",
+            f"v{i};v{i + 1}",
+        ]
+        for i in range(count)
+    ]
+
+
+def _best(fn: Callable[[], None], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    cells = args.rows * len(COLUMNS)
+    indexed = list(enumerate(COLUMNS))
+
+    def per_cell() -> None:
+        for values in rows:
+            for i, col in indexed:
+                coerce_cell(values[i], col)
+
+    def per_column() -> None:
+        coercers = [(i, column_coercer(col)) for i, col in indexed]
+        for values in rows:
+            for i, coerce in coercers:
+                coerce(values[i])
+
+    assert [[coerce_cell(v, c) for v, c in zip(r, COLUMNS)] for r in rows[:100]] == [
+        [column_coercer(c)(v) for v, c in zip(r, COLUMNS)] for r in rows[:100]
+    ]
+    print(f"{args.rows:,} rows x {len(COLUMNS)} mixed-type columns ({cells:,} cells):")
+    for label, fn in (("coerce_cell per cell", per_cell), ("column_coercer", per_column)):
+        seconds = _best(fn, args.repeat)
+        print(f"  {label:<22}{seconds:7.2f} s   {cells / seconds:>12,.0f} cells/s")
+
+
+if __name__ == "__main__":
+    main()
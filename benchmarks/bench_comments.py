@@ -0,0 +1,82 @@
+"""Full header comments vs compact input messages: size, read and annotate time.
+
+Run from the repository root::
+
+    python benchmarks/bench_comments.py [--repeat 3]
+
+For the ACDC schema (every node) and a synthetic 200-node dictionary, writes the
+template with a comment on every header (the default) and with
+``compact_comments=True``, then times ``read_workbook`` and
+``write_annotated_copy`` — the slow one, since openpyxl loads every comment and
+VML drawing to rewrite the file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_synthetic_schema
+
+from gen3_metadata_templates import (
+    SchemaBundle,
+    build_spec_for_nodes,
+    validate_workbook,
+    write_template,
+)
+from gen3_metadata_templates.workbook.annotate import write_annotated_copy
+from gen3_metadata_templates.workbook.reader import read_workbook
+
+ACDC = Path(__file__).parent.parent / "examples" / "schema" / "json" / "acdc_schema.json"
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _measure(label: str, schema: str, repeat: int, tmp: Path) -> None:
+    bundle = SchemaBundle(schema)
+    spec = build_spec_for_nodes(bundle, bundle.node_names)
+    columns = sum(len(nt.columns) for nt in spec.nodes)
+    print(f"{label}: {len(spec.nodes)} sheets, {columns} columns")
+    for compact in (False, True):
+        name = "compact" if compact else "full"
+        out = tmp / f"{label}-{name}.xlsx"
+        write_s = _best(
+            lambda o=out, c=compact: write_template(spec, o, compact_comments=c), repeat
+        )
+        size = os.path.getsize(out)
+        read_s = _best(lambda o=out: read_workbook(o, spec), repeat)
+        report = validate_workbook(out, schema)
+        annotated = tmp / f"{label}-{name}-annotated.xlsx"
+        annotate_s = _best(
+            lambda o=out, r=report, a=annotated: write_annotated_copy(o, r, a), repeat
+        )
+        print(
+            f"  {name:<8} size {size / 1024:7.0f} KB   write {write_s * 1000:7.0f} ms"
+            f"   read {read_s * 1000:7.0f} ms   annotate {annotate_s * 1000:7.0f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        _measure("acdc", str(ACDC), args.repeat, tmp)
+        synthetic = write_synthetic_schema(tmp / "synthetic.json", nodes=200)
+        _measure("synthetic", synthetic, args.repeat, tmp)
+
+
+if __name__ == "__main__":
+    main()
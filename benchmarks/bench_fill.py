@@ -0,0 +1,69 @@
+"""Memory and time for ``fill_template`` as the number of rows grows.
+
+Run from the repository root::
+
+    python benchmarks/bench_fill.py [--rows 50000 500000]
+
+For each row count, a fresh process fills the ACDC subject -> sample template
+with that many generated records per sheet, streamed from a generator, and
+reports the wall time, the file size and the process's peak resident memory.
+Flat memory means the peak barely moves as the row count grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ACDC = Path(__file__).parent.parent / "examples" / "schema" / "json" / "acdc_schema.json"
+
+
+def _records(node: str, count: int):
+    for i in range(count):
+        record = {"submitter_id": f"{node}_{i}", f"{node}_id": f"{node.upper()}{i}"}
+        if node == "sample":
+            record["subjects"] = {"submitter_id": f"subject_{i}"}
+            record["sample_type"] = "Blood"
+        yield record
+
+
+def _child(rows: int) -> None:
+    from gen3_metadata_templates import SchemaBundle, build_template_spec
+    from gen3_metadata_templates.workbook.writer import fill_template
+
+    bundle = SchemaBundle(str(ACDC))
+    spec = build_template_spec(bundle, "sample", ["subject", "sample"])
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "filled.xlsx"
+        start = time.perf_counter()
+        fill_template(spec, out, {n: _records(n, rows) for n in spec.node_order})
+        seconds = time.perf_counter() - start
+        size = os.path.getsize(out)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"  {rows:>9,} rows/sheet   {seconds:7.1f} s   {size / 2**20:7.1f} MB   peak {peak_mb:6.0f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 500_000])
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        _child(args.child)
+        return
+
+    print("ACDC subject -> sample, filled with generated records")
+    for rows in args.rows:
+        subprocess.run([sys.executable, __file__, "--child", str(rows)], check=True)
+
+
+if __name__ == "__main__":
+    main()
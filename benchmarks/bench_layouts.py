@@ -0,0 +1,83 @@
+"""Grid vs table sheet layout: file size, write time and read time.
+
+Run from the repository root::
+
+    python benchmarks/bench_layouts.py [--records 10] [--repeat 3]
+
+For the ACDC schema (every node) and a synthetic 200-node dictionary, writes the
+template in the grid layout (5000 provisioned rows) and the table layout (a
+20-row Excel Table per sheet), fills ``--records`` rows on every sheet, and
+times ``read_workbook`` on the result.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import openpyxl
+from synthetic import write_synthetic_schema
+
+from gen3_metadata_templates import SchemaBundle, build_spec_for_nodes, write_template
+from gen3_metadata_templates.constants import LAYOUTS
+from gen3_metadata_templates.workbook.reader import read_workbook
+from gen3_metadata_templates.workbook.writer import first_data_row_for
+
+ACDC = Path(__file__).parent.parent / "examples" / "schema" / "json" / "acdc_schema.json"
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _fill(path: Path, spec, layout: str, records: int) -> None:
+    """Put ``records`` rows of plain text on every node sheet."""
+    wb = openpyxl.load_workbook(path)
+    first = first_data_row_for(layout)
+    for nt in spec.nodes:
+        ws = wb[nt.sheet_name]
+        for r in range(records):
+            ws.cell(first + r, 1).value = f"{nt.node}_{r}"
+    wb.save(path)
+
+
+def _measure(label: str, bundle: SchemaBundle, records: int, repeat: int, tmp: Path) -> None:
+    spec = build_spec_for_nodes(bundle, bundle.node_names)
+    columns = sum(len(nt.columns) for nt in spec.nodes)
+    print(f"{label}: {len(spec.nodes)} sheets, {columns} columns, {records} records/sheet")
+    for layout in LAYOUTS:
+        out = tmp / f"{label}-{layout}.xlsx"
+        write_s = _best(lambda o=out, lay=layout: write_template(spec, o, layout=lay), repeat)
+        size = os.path.getsize(out)
+        _fill(out, spec, layout, records)
+        first = first_data_row_for(layout)
+        read_s = _best(lambda o=out, f=first: read_workbook(o, spec, first_data_row=f), repeat)
+        print(
+            f"  {layout:<6} write {write_s * 1000:8.1f} ms   size {size / 1024:8.1f} KB"
+            f"   read {read_s * 1000:8.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        _measure("acdc", SchemaBundle(str(ACDC)), args.records, args.repeat, tmp)
+        synthetic = write_synthetic_schema(tmp / "synthetic.json", nodes=200)
+        _measure("synthetic", SchemaBundle(synthetic), args.records, args.repeat, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Time and peak memory of ``read_workbook`` on large filled workbooks.
+
+Run from the repository root::
+
+    python benchmarks/bench_read.py [--rows 10000 100000] [--engine native openpyxl]
+                                    [--workers 1 4] [--formatted 5000]
+
+For each row count, fills the mini schema's subject -> sample template with
+that many generated records per sheet, then reads it back with each read
+engine, every read in a fresh process, and reports rows per second and the
+process's peak resident memory for the read (the fill happens in a separate
+process, so it doesn't count). ``--workers`` reads with the native engine once
+per process-pool size given; 1 is a serial read. Peak memory is this
+process's only, not the pool workers'. ``--formatted N`` re-saves each
+workbook with openpyxl after giving N empty rows under the records a font,
+as a template re-saved with formatted rows has; try it with ``--rows 10``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gen3_metadata_templates import SchemaBundle, build_template_spec
+from gen3_metadata_templates.constants import FIRST_DATA_ROW, READ_ENGINE_NATIVE, READ_ENGINES
+from gen3_metadata_templates.workbook import handle
+from gen3_metadata_templates.workbook.reader import read_workbook
+from gen3_metadata_templates.workbook.writer import fill_template
+
+MINI = Path(__file__).parent.parent / "tests" / "fixtures" / "mini_schema.json"
+
+
+def _spec():
+    return build_template_spec(SchemaBundle(str(MINI)), "sample", ["subject", "sample"])
+
+
+def _records(node: str, count: int):
+    for i in range(count):
+        if node == "subject":
+            yield {"submitter_id": f"subject_{i}", "subject_id": f"S{i}", "age": i % 90}
+        else:
+            yield {
+                "submitter_id": f"sample_{i}",
+                "sample_id": f"X{i}",
+                "sample_type": "Blood",
+                "subjects": {"submitter_id": f"subject_{i}"},
+            }
+
+
+def _fill(path: str, rows: int, formatted: int) -> None:
+    spec = _spec()
+    fill_template(spec, path, {n: _records(n, rows) for n in spec.node_order})
+    if formatted:
+        import openpyxl
+        from openpyxl.styles import Font
+
+        wb = openpyxl.load_workbook(path)
+        first = FIRST_DATA_ROW + rows
+        for node_template in spec.nodes:
+            ws = wb[node_template.sheet_name]
+            for row in range(first, first + formatted):
+                for col in range(1, len(node_template.columns) + 1):
+                    ws.cell(row, col).font = Font(italic=True)
+        wb.save(path)
+
+
+def _read(path: str, engine: str, workers: int) -> None:
+    spec = _spec()
+    if workers > 1:
+        # Pool whatever size these sheets are, to show the split on small ones too.
+        handle.PARALLEL_READ_MIN_BYTES = 0
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    parsed = read_workbook(path, spec, engine=engine, workers=workers)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    records = sum(len(r) for r in parsed.records.values())
+    label = engine if engine != READ_ENGINE_NATIVE else f"{engine} x{workers}"
+    print(
+        f"  {label:<11}{records:>9,} records   {seconds:7.2f} s   {records / seconds:>9,.0f} rows/s"
+        f"   peak {peak / 1024:6.0f} MB (+{(peak - before) / 1024:.0f} MB for the read)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--formatted", type=int, default=0)
+    parser.add_argument("--fill", nargs=3, help=argparse.SUPPRESS)
+    parser.add_argument("--engine", nargs="+", choices=READ_ENGINES, default=list(READ_ENGINES))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--read", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.fill:
+        _fill(args.fill[0], int(args.fill[1]), int(args.fill[2]))
+        return
+    if args.read:
+        _read(args.read[0], args.read[1], int(args.read[2]))
+        return
+
+    formatted = f", {args.formatted:,} formatted blank rows under them" if args.formatted else ""
+    print(f"read_workbook, mini subject -> sample, rows per sheet{formatted}:")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = str(Path(tmp) / f"filled-{rows}.xlsx")
+            subprocess.run(
+                [sys.executable, __file__, "--fill", path, str(rows), str(args.formatted)],
+                check=True,
+            )
+            for engine in args.engine:
+                pools = args.workers if engine == READ_ENGINE_NATIVE else [1]
+                for workers in pools:
+                    subprocess.run(
+                        [sys.executable, __file__, "--read", path, engine, str(workers)],
+                        check=True,
+                    )
+
+
+if __name__ == "__main__":
+    main()
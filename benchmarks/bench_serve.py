@@ -0,0 +1,78 @@
+"""Requests per second for serving a single-node template.
+
+Run from the repository root::
+
+    python benchmarks/bench_serve.py [--node sample] [--seconds 3]
+
+Builds the ACDC template for ``--node`` once, then serves it repeatedly three
+ways: written to a temporary file and read back (the old way to stream it),
+built in memory with ``template_bytes``, and served from a ``WorkbookCache``.
+Spec building is outside the timed loop; only producing the bytes is timed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from gen3_metadata_templates import (
+    SchemaBundle,
+    WorkbookCache,
+    build_template_spec,
+    enumerate_paths,
+    template_bytes,
+    write_template,
+)
+from gen3_metadata_templates.constants import DEFAULT_EXCLUDED_NODES
+
+ACDC = Path(__file__).parent.parent / "examples" / "schema" / "json" / "acdc_schema.json"
+
+
+def _rate(fn, seconds: float) -> float:
+    """Calls per second of ``fn`` over roughly ``seconds``."""
+    fn()  # warm up
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--node", default="sample")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    bundle = SchemaBundle(str(ACDC))
+    path = enumerate_paths(bundle, args.node, DEFAULT_EXCLUDED_NODES)[0]
+    spec = build_template_spec(bundle, args.node, path)
+
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+
+        def via_temp_file() -> bytes:
+            with tempfile.NamedTemporaryFile(suffix=".xlsx", dir=tmp) as handle:
+                write_template(spec, handle.name)
+                return Path(handle.name).read_bytes()
+
+        cache = WorkbookCache(tmp / "cache")
+        results = {
+            "temp file": _rate(via_temp_file, args.seconds),
+            "in memory": _rate(lambda: template_bytes(spec), args.seconds),
+            "cached": _rate(lambda: template_bytes(spec, cache=cache), args.seconds),
+        }
+        assert via_temp_file() == template_bytes(spec) == template_bytes(spec, cache=cache)
+
+    size = len(template_bytes(spec)) / 1024
+    print(f"ACDC '{args.node}' template: {len(spec.nodes)} sheets, {size:.0f} KB")
+    for label, rate in results.items():
+        print(f"  {label:<10} {rate:8.1f} req/s")
+    print("  output: identical across all three")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Serial vs parallel ``build_spec_for_nodes`` on a synthetic 500-node dictionary.
+
+Run from the repository root::
+
+    python benchmarks/bench_spec_build.py [--nodes 500] [--workers 4] [--repeat 5]
+
+Prints the best-of-N wall time for a serial build, a thread-pool build and a
+process-pool build, and checks that all three produce byte-identical specs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from synthetic import write_synthetic_schema
+
+from gen3_metadata_templates import SchemaBundle, build_spec_for_nodes
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--props", type=int, default=21)
+    parser.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        schema = write_synthetic_schema(
+            Path(tmp) / "synthetic.json", nodes=args.nodes, props=args.props
+        )
+        bundle = SchemaBundle(schema)
+    nodes = [f"node_{i:04d}" for i in range(args.nodes)]
+
+    def serial():
+        return build_spec_for_nodes(bundle, nodes)
+
+    reference = serial().to_json()
+    results = {"serial": _best(serial, args.repeat)}
+
+    for label, pool_cls in (("threads", ThreadPoolExecutor), ("processes", ProcessPoolExecutor)):
+        with pool_cls(max_workers=args.workers) as pool:
+            built = build_spec_for_nodes(bundle, nodes, executor=pool)  # also warms the pool
+            assert built.to_json() == reference, f"{label} build differs from serial"
+            results[label] = _best(
+                lambda pool=pool: build_spec_for_nodes(bundle, nodes, executor=pool), args.repeat
+            )
+
+    columns = sum(len(nt.columns) for nt in serial().nodes)
+    print(f"{args.nodes} nodes, {columns} columns, {args.workers} workers, best of {args.repeat}")
+    for label, seconds in results.items():
+        speedup = results["serial"] / seconds if seconds else float("inf")
+        print(f"  {label:<10} {seconds * 1000:8.1f} ms   x{speedup:.2f}")
+    print("  output: identical across all three")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Reading a filled TSV bundle vs the equivalent .xlsx.
+
+Run from the repository root::
+
+    python benchmarks/bench_tsv.py [--rows 100000] [--tsv-rows 1000000]
+
+Fills the mini schema's subject -> sample template with ``--rows`` generated
+records per node, once as a workbook (``fill_template``) and once as a zipped
+TSV bundle, and times ``read_workbook`` on each. ``--tsv-rows`` then reads a
+larger bundle on its own, since parsing that many rows from .xlsx takes
+minutes and gigabytes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from gen3_metadata_templates import SchemaBundle, build_template_spec
+from gen3_metadata_templates.workbook.reader import read_workbook
+from gen3_metadata_templates.workbook.tsv import write_tsv_bundle
+from gen3_metadata_templates.workbook.writer import fill_template
+
+MINI = Path(__file__).parent.parent / "tests" / "fixtures" / "mini_schema.json"
+
+
+def _records(node: str, count: int):
+    for i in range(count):
+        if node == "subject":
+            yield {"submitter_id": f"subject_{i}", "subject_id": f"S{i}", "age": i % 90}
+        else:
+            yield {
+                "submitter_id": f"sample_{i}",
+                "sample_id": f"X{i}",
+                "sample_type": "Blood",
+                "subjects": {"submitter_id": f"subject_{i}"},
+            }
+
+
+def _write_bundle(spec, out: Path, rows: int) -> Path:
+    """A zipped bundle holding ``rows`` records per node."""
+    folder = write_tsv_bundle(spec, out.with_suffix(""))
+    for nt in spec.nodes:
+        headers = [c.header for c in nt.columns]
+        with open(folder / f"{nt.node}.tsv", "a", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle, delimiter="\t", lineterminator="\n")
+            for record in _records(nt.node, rows):
+                flat = {
+                    k: v["submitter_id"] if isinstance(v, dict) else v for k, v in record.items()
+                }
+                by_header = {c.header: flat.get(c.prop_name, "") for c in nt.columns}
+                writer.writerow(by_header[h] for h in headers)
+    return Path(shutil.make_archive(str(out.with_suffix("")), "zip", folder))
+
+
+def _time_read(path: Path, spec) -> float:
+    start = time.perf_counter()
+    parsed = read_workbook(path, spec)
+    seconds = time.perf_counter() - start
+    assert all(parsed.records[nt.node] for nt in spec.nodes)
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--tsv-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    spec = build_template_spec(SchemaBundle(str(MINI)), "sample", ["subject", "sample"])
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        xlsx = tmp / "filled.xlsx"
+        fill_template(spec, xlsx, {n: _records(n, args.rows) for n in spec.node_order})
+        bundle = _write_bundle(spec, tmp / "filled.zip", args.rows)
+        xlsx_s = _time_read(xlsx, spec)
+        tsv_s = _time_read(bundle, spec)
+        total = args.rows * len(spec.nodes)
+        print(f"{args.rows:,} rows per node ({total:,} records)")
+        print(f"  xlsx  read {xlsx_s:7.2f} s   {total / xlsx_s:>10,.0f} rows/s")
+        print(
+            f"  tsv   read {tsv_s:7.2f} s   {total / tsv_s:>10,.0f} rows/s   ({xlsx_s / tsv_s:.1f}x)"
+        )
+
+        if args.tsv_rows:
+            big = _write_bundle(spec, tmp / "big.zip", args.tsv_rows)
+            big_s = _time_read(big, spec)
+            total = args.tsv_rows * len(spec.nodes)
+            print(f"{args.tsv_rows:,} rows per node, TSV only")
+            print(f"  tsv   read {big_s:7.2f} s   {total / big_s:>10,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
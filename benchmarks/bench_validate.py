@@ -0,0 +1,189 @@
+"""Time and peak memory of ``validate_workbook`` on large filled workbooks.
+
+Run from the repository root::
+
+    python benchmarks/bench_validate.py [--rows 10000 100000] [--staging memory sqlite]
+        [--workers 1 4]
+    python benchmarks/bench_validate.py --deep 15 [--rows 2000 20000]
+
+For each row count, fills the mini schema's subject -> sample template with
+that many generated records per sheet — every sample linking to a subject, one
+age in ten not a number — and validates it in a fresh process, reporting rows
+per second, findings, and the process's peak resident memory for the run (the
+fill happens in a separate process, so it doesn't count). ``--staging`` runs
+each workbook once per staging backend, and ``--workers`` once per process
+count for the schema checks (by default, one).
+
+``--deep N`` fills a synthetic dictionary's chain of N nodes instead, each
+record linking to one on the sheet before, and also times what rebuilding the
+identifier index of every sheet once per linked node — as the runner did
+before it indexed records as they stream past — would add.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gen3_validator.bulk import build_identifier_index, extract_links
+from synthetic import write_synthetic_schema
+
+from gen3_metadata_templates import (
+    SchemaBundle,
+    build_spec_for_nodes,
+    build_template_spec,
+    validate_workbook,
+)
+from gen3_metadata_templates.constants import STAGING_MEMORY, STAGINGS
+from gen3_metadata_templates.workbook.reader import read_workbook
+from gen3_metadata_templates.workbook.writer import fill_template
+
+MINI = Path(__file__).parent.parent / "tests" / "fixtures" / "mini_schema.json"
+
+
+def _records(node: str, count: int):
+    for i in range(count):
+        if node == "subject":
+            age = "unknown" if i % 10 == 0 else i % 90
+            yield {"submitter_id": f"subject_{i}", "subject_id": f"S{i}", "age": age}
+        else:
+            yield {
+                "submitter_id": f"sample_{i}",
+                "sample_id": f"X{i}",
+                "sample_type": "Blood",
+                "subjects": {"submitter_id": f"subject_{i}"},
+            }
+
+
+def _deep_records(node: str, parent: str, count: int):
+    # One value of each synthetic property kind, keyed "<kind>_<nn>".
+    values = {
+        "string": "text",
+        "integer": 7,
+        "number": 0.5,
+        "boolean": True,
+        "array": ["a", "b"],
+        "enum": f"{node} value 0",
+        "shared": "Term 000 (shared ontology value)",
+    }
+    props = {f"{kind}_{p:02d}": value for p, (kind, value) in enumerate(values.items())}
+    for i in range(count):
+        record = {"submitter_id": f"{node}_{i}", **props}
+        if parent != "project":
+            record["parents"] = {"submitter_id": f"{parent}_{i}"}
+        yield record
+
+
+def _spec(schema: str):
+    bundle = SchemaBundle(schema)
+    if schema == str(MINI):
+        return build_template_spec(bundle, "sample", ["subject", "sample"])
+    return build_spec_for_nodes(bundle, [n for n in bundle.node_names if n.startswith("node_")])
+
+
+def _fill(path: str, rows: int, schema: str) -> None:
+    spec = _spec(schema)
+    if schema == str(MINI):
+        records = {n: _records(n, rows) for n in spec.node_order}
+    else:
+        parents = {
+            n: f"node_{i - 1:04d}" if i else "project" for i, n in enumerate(spec.node_order)
+        }
+        records = {n: _deep_records(n, parents[n], rows) for n in spec.node_order}
+    fill_template(spec, path, records)
+
+
+def _validate(path: str, staging: str, workers: str, schema: str) -> None:
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    report = validate_workbook(path, schema, staging=staging, workers=int(workers))
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    records = sum(count for count, _ in report.node_counts.values())
+    print(
+        f"  {staging:<6} -j{workers:<2} {records:>9,} records   {len(report.findings):>7,} findings   {seconds:7.2f} s"
+        f"   {records / seconds:>8,.0f} rows/s   peak {peak / 1024:6.0f} MB"
+        f" (+{(peak - before) / 1024:.0f} MB for the run)"
+    )
+
+
+def _rebuilt_index(path: str, schema: str) -> None:
+    """Time one identifier index over every sheet, built once per node with links."""
+    spec = _spec(schema)
+    bundle = SchemaBundle(schema)
+    records = read_workbook(path, spec).records
+    linked = [n for n in spec.node_order if extract_links(bundle.resolved(n))]
+    start = time.perf_counter()
+    index = build_identifier_index(records)
+    identifiers = sum(len(values) for keys in index.values() for values in keys.values())
+    once = time.perf_counter() - start
+    for _node in linked[1:]:
+        build_identifier_index(records)
+    every = time.perf_counter() - start
+    print(
+        f"  index of {identifiers:,} identifiers: built once"
+        f" {once:5.2f} s; once per linked node ({len(linked)}) {every:6.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+")
+    parser.add_argument("--staging", nargs="+", choices=STAGINGS, default=[STAGING_MEMORY])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--deep", type=int, metavar="N", help="validate a chain of N sheets")
+    parser.add_argument("--fill", nargs=3, help=argparse.SUPPRESS)
+    parser.add_argument("--validate", nargs=4, help=argparse.SUPPRESS)
+    parser.add_argument("--rebuild", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.fill:
+        path, rows, schema = args.fill
+        _fill(path, int(rows), schema)
+        return
+    if args.validate:
+        _validate(*args.validate)
+        return
+    if args.rebuild:
+        _rebuilt_index(*args.rebuild)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.deep:
+            schema = write_synthetic_schema(
+                Path(tmp) / "chain.json", nodes=args.deep, props=7, fanout=1
+            )
+            rows_per_sheet = args.rows or [2_000, 20_000]
+            print(f"validate_workbook, synthetic chain of {args.deep} sheets, rows per sheet:")
+        else:
+            schema = str(MINI)
+            rows_per_sheet = args.rows or [10_000, 100_000]
+            print("validate_workbook, mini subject -> sample, rows per sheet:")
+        for rows in rows_per_sheet:
+            path = str(Path(tmp) / f"filled-{rows}.xlsx")
+            subprocess.run(
+                [sys.executable, __file__, "--fill", path, str(rows), schema], check=True
+            )
+            for staging, workers in itertools.product(args.staging, args.workers):
+                command = [
+                    sys.executable,
+                    __file__,
+                    "--validate",
+                    path,
+                    staging,
+                    str(workers),
+                    schema,
+                ]
+                subprocess.run(command, check=True)
+            if args.deep:
+                command = [sys.executable, __file__, "--rebuild", path, schema]
+                subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
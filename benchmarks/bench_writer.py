@@ -0,0 +1,180 @@
+"""How ``write_template`` scales: time, peak memory and size per workbook part.
+
+Run from the repository root::
+
+    python benchmarks/bench_writer.py            # print the table
+    python benchmarks/bench_writer.py --check    # also fail on regressions
+    python benchmarks/bench_writer.py --update   # record a new baseline
+
+Each case writes one workbook and sweeps one dimension at a time: provisioned
+rows (the mini fixture schema), columns per sheet, description length (header
+comments) and enum size (synthetic 20-node dictionaries), plus the whole ACDC
+schema in both layouts and with compact comments. For every workbook it
+reports the best write time, the peak Python memory while writing
+(``tracemalloc``), the file size, and the compressed bytes taken by each kind
+of part: sheet XML, the data validations inside it, comment XML and the VML
+drawings that position the comments.
+
+``--check`` compares file size and peak memory against
+``writer_baseline.json`` and exits non-zero if either grew by more than its
+tolerance. Both are deterministic for a given g3mt/xlsxwriter version, so the
+committed baseline holds on any machine. Write time depends on the machine, so
+it is only checked with ``--check-time``, against a baseline recorded on the
+same machine (``--update --baseline mine.json`` on the base commit first).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from synthetic import write_synthetic_schema
+
+from gen3_metadata_templates import SchemaBundle, build_spec_for_nodes, write_template
+from gen3_metadata_templates.constants import LAYOUT_GRID, LAYOUT_TABLE
+
+HERE = Path(__file__).parent
+ROOT = HERE.parent
+ACDC = ROOT / "examples" / "schema" / "json" / "acdc_schema.json"
+MINI = ROOT / "tests" / "fixtures" / "mini_schema.json"
+BASELINE = HERE / "writer_baseline.json"
+
+SIZE_TOLERANCE = 0.10
+MEMORY_TOLERANCE = 0.25
+TIME_TOLERANCE = 0.50
+
+_VALIDATIONS = re.compile(rb"<dataValidations\b.*?</dataValidations>", re.S)
+
+
+@dataclass
+class Result:
+    seconds: float
+    peak_kb: int
+    size: int
+    parts: Dict[str, int]
+
+
+def _part_sizes(path: Path) -> Dict[str, int]:
+    """Compressed bytes per kind of part; validations are estimated by compressing them alone."""
+    parts = {"sheets": 0, "validations": 0, "comments": 0, "vml": 0, "other": 0}
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            name = info.filename
+            if name.startswith("xl/worksheets/") and name.endswith(".xml"):
+                blocks = _VALIDATIONS.findall(zf.read(name))
+                validations = sum(len(zlib.compress(b)) for b in blocks)
+                parts["validations"] += validations
+                parts["sheets"] += max(info.compress_size - validations, 0)
+            elif name.startswith("xl/comments"):
+                parts["comments"] += info.compress_size
+            elif name.startswith("xl/drawings/vmlDrawing"):
+                parts["vml"] += info.compress_size
+            else:
+                parts["other"] += info.compress_size
+    return parts
+
+
+def _measure(write: Callable[[Path], None], out: Path, repeat: int) -> Result:
+    tracemalloc.start()
+    write(out)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        write(out)
+        times.append(time.perf_counter() - start)
+    return Result(round(min(times), 4), peak // 1024, out.stat().st_size, _part_sizes(out))
+
+
+def _cases(tmp: Path) -> List[Tuple[str, Callable[[Path], None]]]:
+    def writer(schema: str, **options) -> Callable[[Path], None]:
+        bundle = SchemaBundle(schema)
+        spec = build_spec_for_nodes(bundle, bundle.node_names)
+        return lambda out: write_template(spec, out, **options)
+
+    def synthetic(name: str, **kwargs) -> str:
+        return write_synthetic_schema(tmp / f"{name}.json", nodes=20, **kwargs)
+
+    cases = []
+    for rows in (100, 1000, 5000, 20000):
+        cases.append((f"rows/{rows}", writer(str(MINI), data_rows=rows)))
+    for props in (7, 21, 63):
+        cases.append((f"columns/{props}", writer(synthetic(f"c{props}", props=props))))
+    for chars in (40, 400, 2000):
+        schema = synthetic(f"d{chars}", description_chars=chars)
+        cases.append((f"description/{chars}", writer(schema)))
+    for size in (8, 64, 512):
+        cases.append((f"enum/{size}", writer(synthetic(f"e{size}", enum_size=size))))
+    cases.append(("acdc/grid", writer(str(ACDC), layout=LAYOUT_GRID)))
+    cases.append(("acdc/table", writer(str(ACDC), layout=LAYOUT_TABLE)))
+    cases.append(("acdc/compact", writer(str(ACDC), compact_comments=True)))
+    return cases
+
+
+def _regressions(results: Dict[str, Result], baseline: dict, check_time: bool) -> List[str]:
+    problems = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        checks = [("size", result.size, base["size"], SIZE_TOLERANCE)]
+        checks.append(("peak memory", result.peak_kb, base["peak_kb"], MEMORY_TOLERANCE))
+        if check_time:
+            checks.append(("write time", result.seconds, base["seconds"], TIME_TOLERANCE))
+        for what, now, was, tolerance in checks:
+            if now > was * (1 + tolerance):
+                problems.append(f"{name}: {what} {now:,.3f} vs baseline {was:,.3f}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update", action="store_true", help="write results to the baseline")
+    parser.add_argument("--check", action="store_true", help="fail if size or memory regressed")
+    parser.add_argument("--check-time", action="store_true", help="also fail on slower writes")
+    args = parser.parse_args()
+
+    results: Dict[str, Result] = {}
+    header = f"{'case':<18}{'time':>9}{'peak':>9}{'size':>9}"
+    header += "".join(f"{p:>12}" for p in ("sheets", "validations", "comments", "vml", "other"))
+    print(header + "\n" + "-" * len(header))
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        for name, write in _cases(tmp):
+            result = _measure(write, tmp / "out.xlsx", args.repeat)
+            results[name] = result
+            print(
+                f"{name:<18}{result.seconds * 1000:7.0f}ms{result.peak_kb / 1024:7.1f}MB"
+                f"{result.size / 1024:7.0f}KB"
+                + "".join(f"{v / 1024:10.1f}KB" for v in result.parts.values())
+            )
+
+    if args.update:
+        data = {name: asdict(result) for name, result in results.items()}
+        args.baseline.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+    if args.check or args.check_time:
+        baseline = json.loads(args.baseline.read_text())
+        problems = _regressions(results, baseline, args.check_time)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Synthetic Gen3 dictionaries for the benchmarks.
+
+Real dictionaries top out around a few dozen nodes, which hides anything that
+scales badly. ``write_synthetic_schema`` writes a schema bundle of any size in
+the same shape as ``tests/fixtures/mini_schema.json``: a program -> project
+root, then ``node_0000 .. node_NNNN`` arranged as a tree (each node links to an
+earlier one; ``fanout=1`` makes it one deep chain), every node carrying a mix of string, integer, number, boolean,
+array and enum properties.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Union
+
+_FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "mini_schema.json"
+
+# Every node reuses one long, ontology-style enum, the way real dictionaries
+# share ``_terms`` value lists across many properties.
+_SHARED_TERMS = [f"Term {i:03d} (shared ontology value)" for i in range(60)]
+
+
+def _node(index: int, parent: str, props: int, enum_size: int, description_chars: int) -> dict:
+    name = f"node_{index:04d}"
+    properties: dict = {"$ref": "_definitions.yaml#/ubiquitous_properties"}
+    required = ["submitter_id", "type", "parents"]
+    kinds = ("string", "integer", "number", "boolean", "array", "enum", "shared")
+    for p in range(props):
+        kind = kinds[p % len(kinds)]
+        key = f"{kind}_{p:02d}"
+        description = f"Synthetic {kind} property {p} of {name}."
+        if description_chars > len(description):
+            padding = " Lorem ipsum dolor sit amet." * (description_chars // 28 + 1)
+            description = (description + padding)[:description_chars]
+        if kind == "array":
+            properties[key] = {"type": "array", "items": {"type": "string"}}
+        elif kind == "enum":
+            properties[key] = {"enum": [f"{name} value {v}" for v in range(enum_size)]}
+        elif kind == "shared":
+            properties[key] = {"enum": list(_SHARED_TERMS)}
+        else:
+            properties[key] = {"type": kind}
+        properties[key]["description"] = description
+        if p % 3 == 0:
+            required.append(key)
+    properties["parents"] = {"$ref": "_definitions.yaml#/to_one"}
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": name,
+        "title": name,
+        "type": "object",
+        "category": f"group_{index % 10}",
+        "description": f"Synthetic node {index}.",
+        "submittable": True,
+        "required": required,
+        "links": [
+            {
+                "name": "parents",
+                "backref": f"{name}s",
+                "label": "child_of",
+                "target_type": parent,
+                "multiplicity": "many_to_one",
+                "required": True,
+            }
+        ],
+        "properties": properties,
+        "additionalProperties": False,
+    }
+
+
+def synthetic_schema(
+    nodes: int = 500,
+    props: int = 21,
+    enum_size: int = 8,
+    description_chars: int = 0,
+    fanout: int = 3,
+) -> dict:
+    """A schema bundle dict with ``nodes`` synthetic nodes below the project.
+
+    ``description_chars`` pads every property description to that length;
+    each node has up to ``fanout`` children.
+    """
+    base = json.loads(_FIXTURE.read_text())
+    bundle = {
+        key: base[key]
+        for key in ("_settings.yaml", "_terms.yaml", "_definitions.yaml", "program.yaml")
+    }
+    bundle["project.yaml"] = base["project.yaml"]
+    for i in range(nodes):
+        parent = "project" if i == 0 else f"node_{(i - 1) // fanout:04d}"
+        bundle[f"node_{i:04d}.yaml"] = _node(i, parent, props, enum_size, description_chars)
+    return bundle
+
+
+def write_synthetic_schema(path: Union[str, Path], **kwargs) -> str:
+    """Write :func:`synthetic_schema` to ``path`` and return it as a string."""
+    Path(path).write_text(json.dumps(synthetic_schema(**kwargs)))
+    return str(path)
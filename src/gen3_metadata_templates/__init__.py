@@ -4,10 +4,12 @@ from __future__ import annotations
 
 __version__ = "2.3.0"
 
+from gen3_metadata_templates.cache import SpecCache
 from gen3_metadata_templates.errors import (
     AmbiguousPathError,
     CyclicGraphError,
     G3mtError,
+    RecordSourceError,
     SchemaError,
     SelectionError,
     UnknownCategoryError,
@@ -31,9 +33,12 @@ from gen3_metadata_templates.selection import (
     layered_topological_order,
     resolve_selection,
 )
+from gen3_metadata_templates.sources import RecordFiles
 from gen3_metadata_templates.validation.report import Finding, ValidationReport
-from gen3_metadata_templates.validation.runner import validate_workbook
-from gen3_metadata_templates.workbook.writer import write_template
+from gen3_metadata_templates.validation.runner import validate_export, validate_workbook
+from gen3_metadata_templates.workbook.cache import WorkbookCache
+from gen3_metadata_templates.workbook.tsv import write_tsv_bundle
+from gen3_metadata_templates.workbook.writer import fill_template, template_bytes, write_template
 
 __all__ = [
     "__version__",
@@ -44,6 +49,7 @@ __all__ = [
     "AmbiguousPathError",
     "WorkbookFormatError",
     "SelectionError",
+    "RecordSourceError",
     "CyclicGraphError",
     "SchemaBundle",
     "LinkInfo",
@@ -54,6 +60,7 @@ __all__ = [
     "NodeTemplate",
     "ColumnSpec",
     "ColumnKind",
+    "SpecCache",
     "enumerate_paths",
     "resolve_path",
     "resolve_selection",
@@ -61,6 +68,12 @@ __all__ = [
     "TargetResolution",
     "layered_topological_order",
     "write_template",
+    "template_bytes",
+    "write_tsv_bundle",
+    "WorkbookCache",
+    "fill_template",
+    "RecordFiles",
+    "validate_export",
     "validate_workbook",
     "ValidationReport",
     "Finding",
@@ -0,0 +1,236 @@
+"""Generate many templates from one schema in a single run.
+
+A data portal typically offers a template for every node and every category of
+each dictionary release. Producing those one ``g3mt generate`` at a time
+resolves the schema hundreds of times; here it is resolved once, every
+selection is planned against it, and the workbooks are written on a process
+pool. Each workbook is built by exactly the same calls as ``g3mt generate
+--node ...`` / ``--category ...``, so the files are identical.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from gen3_metadata_templates.cache import SpecCache
+from gen3_metadata_templates.constants import (
+    DEFAULT_EXCLUDED_COLUMNS,
+    DEFAULT_EXCLUDED_NODES,
+    LAYOUT_GRID,
+)
+from gen3_metadata_templates.errors import SelectionError
+from gen3_metadata_templates.model import TemplateSpec, build_multi_template_spec
+from gen3_metadata_templates.schema import SchemaBundle
+from gen3_metadata_templates.selection import resolve_selection
+from gen3_metadata_templates.workbook.cache import WorkbookCache
+from gen3_metadata_templates.workbook.writer import write_template
+
+_CATEGORY_PREFIX = "category:"
+
+
+def default_filename(category: Optional[str], targets: Sequence[str]) -> str:
+    """Work out a sensible output filename for whatever was selected."""
+    if category:
+        safe = re.sub(r"\W+", "_", category.strip().lower()).strip("_")
+        return f"{safe}_template.xlsx"
+    if len(targets) == 1:
+        return f"{targets[0]}_template.xlsx"
+    if len(targets) <= 3:
+        return f"{'_'.join(targets)}_template.xlsx"
+    return f"{targets[0]}_and_{len(targets) - 1}_more_template.xlsx"
+
+
+@dataclass(frozen=True)
+class BatchSelection:
+    """One workbook to produce: a whole category, or some nodes plus their ancestors."""
+
+    category: Optional[str] = None
+    nodes: Tuple[str, ...] = ()
+
+    @classmethod
+    def parse(cls, text: str) -> "BatchSelection":
+        """Read ``category:NAME`` or a comma-separated node list (``subject,sample``).
+
+        :raises SelectionError: if the text selects nothing.
+        """
+        cleaned = (text or "").strip()
+        if cleaned.lower().startswith(_CATEGORY_PREFIX):
+            name = cleaned[len(_CATEGORY_PREFIX) :].strip()
+            if name:
+                return cls(category=name)
+        else:
+            nodes = tuple(dict.fromkeys(n.strip() for n in cleaned.split(",") if n.strip()))
+            if nodes:
+                return cls(nodes=nodes)
+        raise SelectionError(
+            f"'{text}' doesn't select anything. Use a node list such as "
+            f"'subject,sample' or a category such as 'category:clinical'."
+        )
+
+    @property
+    def label(self) -> str:
+        if self.category:
+            return f"{_CATEGORY_PREFIX}{self.category}"
+        return ",".join(self.nodes)
+
+
+@dataclass
+class BatchJob:
+    """A planned workbook: the selection, the spec built for it, and where it goes."""
+
+    selection: BatchSelection
+    spec: TemplateSpec
+    output: Path
+
+
+@dataclass
+class BatchPlan:
+    """Every workbook to write, plus any selections that were skipped, and why."""
+
+    jobs: List[BatchJob] = field(default_factory=list)
+    skipped: List[Tuple[str, str]] = field(default_factory=list)  # (label, reason)
+
+    def merge(self, other: "BatchPlan") -> None:
+        """Add ``other``'s jobs and skips; a job whose file is already planned is skipped."""
+        planned = {job.output: job.selection.label for job in self.jobs}
+        for job in other.jobs:
+            if job.output in planned:
+                self.skipped.append(
+                    (job.selection.label, _same_output(job.output, planned[job.output]))
+                )
+                continue
+            planned[job.output] = job.selection.label
+            self.jobs.append(job)
+        self.skipped.extend(other.skipped)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """How writing one workbook went."""
+
+    output: Path
+    sheets: int
+    seconds: float
+    size: int  # bytes on disk
+
+
+def every_node(bundle: SchemaBundle, excluded_nodes: Sequence[str]) -> List[BatchSelection]:
+    """One selection per node in the schema that isn't excluded."""
+    excluded = set(excluded_nodes)
+    return [BatchSelection(nodes=(n,)) for n in bundle.node_names if n not in excluded]
+
+
+def every_category(bundle: SchemaBundle) -> List[BatchSelection]:
+    """One selection per category the schema declares."""
+    return [BatchSelection(category=name) for name in bundle.categories()]
+
+
+def plan_batch(
+    bundle: SchemaBundle,
+    selections: Sequence[BatchSelection],
+    output_dir: Union[str, Path],
+    *,
+    excluded_nodes: Sequence[str] = DEFAULT_EXCLUDED_NODES,
+    excluded_columns: Sequence[str] = DEFAULT_EXCLUDED_COLUMNS,
+    cache: Optional[SpecCache] = None,
+    skip_empty: bool = False,
+) -> BatchPlan:
+    """Resolve every selection against the one bundle and build its spec.
+
+    Selections that name the same output file are planned once: any after the
+    first is recorded as skipped, naming the selection it collides with.
+
+    :param skip_empty: record a selection whose nodes are all excluded as
+        skipped instead of raising. Meant for ``every_node``/``every_category``,
+        where such a selection is expected (e.g. the administrative category).
+    :raises SelectionError: a selection is empty or contradictory (unless
+        ``skip_empty``), or names an unknown node/category.
+    """
+    plan = BatchPlan()
+    seen: Dict[Path, str] = {}
+    for selection in selections:
+        explicit = list(selection.nodes)
+        from_category = bundle.nodes_in_category(selection.category) if selection.category else []
+        targets = list(dict.fromkeys(explicit + from_category))
+        try:
+            resolved = resolve_selection(
+                bundle,
+                targets,
+                excluded_nodes=excluded_nodes,
+                category=selection.category,
+                strict_targets=explicit,
+            )
+        except SelectionError as exc:
+            if not skip_empty:
+                raise
+            plan.skipped.append((selection.label, str(exc)))
+            continue
+
+        output = Path(output_dir) / default_filename(selection.category, resolved.targets)
+        if output in seen:
+            plan.skipped.append((selection.label, _same_output(output, seen[output])))
+            continue
+        seen[output] = selection.label
+        spec = build_multi_template_spec(
+            bundle, resolved, excluded_columns=excluded_columns, cache=cache
+        )
+        plan.jobs.append(BatchJob(selection, spec, output))
+    return plan
+
+
+def _same_output(output: Path, label: str) -> str:
+    return f"same output file as {label} ({output.name})."
+
+
+def _write_job(args: tuple) -> BatchResult:
+    """Write one planned workbook. Module level so a process pool can run it."""
+    spec, output, data_rows, layout, compact_comments, cache = args
+    start = time.perf_counter()
+    write_template(
+        spec,
+        output,
+        data_rows=data_rows,
+        layout=layout,
+        compact_comments=compact_comments,
+        cache=cache,
+    )
+    seconds = time.perf_counter() - start
+    return BatchResult(Path(output), len(spec.nodes), seconds, os.path.getsize(output))
+
+
+def run_batch(
+    jobs: Sequence[BatchJob],
+    *,
+    data_rows: Optional[int] = None,
+    layout: str = LAYOUT_GRID,
+    compact_comments: bool = False,
+    workers: Optional[int] = None,
+    cache: Optional[WorkbookCache] = None,
+) -> List[BatchResult]:
+    """Write every job's workbook, in parallel, returning results in job order.
+
+    :param data_rows: rows per sheet; defaults as for ``write_template``.
+    :param layout: ``"grid"`` or ``"table"``, as for ``write_template``.
+    :param compact_comments: input messages instead of header comments, as for
+        ``write_template``.
+    :param workers: processes to use; defaults to the number of CPUs. With one
+        worker (or one job) everything is written in this process.
+    :param cache: copy unchanged workbooks from this cache instead of rewriting
+        them. Hit counts are only kept when writing in this process.
+    """
+    if not jobs:
+        return []
+    for job in jobs:
+        job.output.parent.mkdir(parents=True, exist_ok=True)
+    tasks = [(job.spec, job.output, data_rows, layout, compact_comments, cache) for job in jobs]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return [_write_job(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_write_job, tasks))
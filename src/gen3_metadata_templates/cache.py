@@ -0,0 +1,208 @@
+"""Reuse template specs instead of re-deriving them from the schema.
+
+A :class:`~gen3_metadata_templates.model.TemplateSpec` is a pure function of
+the schema file, the ordered node list, and the few selection details that are
+recorded alongside it (targets, paths, depth, category, excluded columns). So
+once a spec has been built, the same inputs can be answered from a cache:
+validating a stream of workbooks made from one template then derives its
+columns once, not once per file.
+
+Specs are held in their serialised JSON form. Every hit hands back a fresh
+object, so a caller that tweaks the spec it was given (``build_template_spec``
+does) can never corrupt the cached copy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Mapping, Optional, Sequence, Union
+
+from gen3_metadata_templates import __version__
+from gen3_metadata_templates.constants import DEFAULT_EXCLUDED_COLUMNS
+from gen3_metadata_templates.model import SPEC_FORMAT, TemplateSpec, build_spec_for_nodes
+from gen3_metadata_templates.schema import SchemaBundle
+
+# How many specs an in-memory cache keeps before evicting the least recently used.
+DEFAULT_SPEC_CACHE_SIZE = 64
+
+
+def spec_cache_key(
+    bundle: SchemaBundle,
+    ordered_nodes: Sequence[str],
+    *,
+    target_nodes: Sequence[str] = (),
+    paths: Optional[Mapping[str, Sequence[str]]] = None,
+    depth: Optional[Mapping[str, int]] = None,
+    category: Optional[str] = None,
+    excluded_columns: Sequence[str] = DEFAULT_EXCLUDED_COLUMNS,
+) -> str:
+    """The cache key for a ``build_spec_for_nodes`` call: a SHA-256 hex digest.
+
+    The g3mt version and spec format are part of the key, so upgrading the tool
+    never serves a spec laid out by an older release.
+    """
+    parts = {
+        "g3mt": __version__,
+        "spec_format": SPEC_FORMAT,
+        "schema": bundle.fingerprint,
+        "schema_path": bundle.schema_path,
+        "nodes": list(ordered_nodes),
+        "target_nodes": list(target_nodes),
+        "paths": {t: list(p) for t, p in (paths or {}).items()},
+        "depth": dict(depth or {}),
+        "category": category,
+        "excluded_columns": sorted(set(excluded_columns)),
+    }
+    text = json.dumps(parts, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SpecCache:
+    """A bounded LRU of built specs, optionally backed by a directory on disk.
+
+    The in-memory layer serves repeat requests within one process (a validation
+    service); the directory layer survives between processes (repeated CLI
+    runs). A missing, unreadable or out-of-date file on disk is treated as a
+    miss and silently rebuilt — the cache can only ever save work, not fail it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_SPEC_CACHE_SIZE,
+        directory: Optional[Union[str, Path]] = None,
+    ):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Forget the in-memory entries (files on disk are left alone)."""
+        self._entries.clear()
+
+    def get(self, key: str) -> Optional[TemplateSpec]:
+        """The cached spec for ``key``, or None on a miss."""
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+            return TemplateSpec.from_json(text)
+
+        text = self._read_file(key)
+        if text is None:
+            return None
+        try:
+            spec = TemplateSpec.from_json(text)
+        except (ValueError, KeyError, TypeError):
+            return None
+        self._remember(key, text)
+        return spec
+
+    def put(self, key: str, spec: TemplateSpec) -> None:
+        text = spec.to_json()
+        self._remember(key, text)
+        self._write_file(key, text)
+
+    def get_or_build(
+        self,
+        bundle: SchemaBundle,
+        ordered_nodes: Sequence[str],
+        *,
+        target_nodes: Sequence[str] = (),
+        paths: Optional[Mapping[str, Sequence[str]]] = None,
+        depth: Optional[Mapping[str, int]] = None,
+        category: Optional[str] = None,
+        excluded_columns: Sequence[str] = DEFAULT_EXCLUDED_COLUMNS,
+        executor: Optional[Executor] = None,
+    ) -> TemplateSpec:
+        """Return the cached spec for these arguments, building it on a miss.
+
+        Takes exactly the arguments of
+        :func:`~gen3_metadata_templates.model.build_spec_for_nodes`.
+        """
+        key = spec_cache_key(
+            bundle,
+            ordered_nodes,
+            target_nodes=target_nodes,
+            paths=paths,
+            depth=depth,
+            category=category,
+            excluded_columns=excluded_columns,
+        )
+        spec = self.get(key)
+        if spec is not None:
+            self.hits += 1
+            return spec
+
+        self.misses += 1
+        spec = build_spec_for_nodes(
+            bundle,
+            ordered_nodes,
+            target_nodes=target_nodes,
+            paths=paths,
+            depth=depth,
+            category=category,
+            excluded_columns=excluded_columns,
+            executor=executor,
+        )
+        self.put(key, spec)
+        return spec
+
+    def _remember(self, key: str, text: str) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(self.maxsize, 0):
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / f"spec-{key}.json"
+
+    def _read_file(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _write_file(self, key: str, text: str) -> None:
+        """Write atomically, so a concurrent reader never sees half a file."""
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".spec-", suffix=".tmp", dir=str(path.parent))
+        except OSError:
+            # A read-only cache directory just means no disk caching.
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(text)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+# The process-wide cache validation uses when the caller doesn't supply one.
+_default_cache = SpecCache()
+
+
+def default_spec_cache() -> SpecCache:
+    """The shared in-memory cache used by ``validate_workbook`` by default."""
+    return _default_cache
@@ -11,8 +11,8 @@ from __future__ import annotations
 
 import json
 import logging
-import re
 import sys
+import time
 from pathlib import Path
 from typing import List, Optional
 
@@ -21,16 +21,37 @@ from rich.console import Console
 from rich.table import Table
 
 from gen3_metadata_templates import __version__
-from gen3_metadata_templates.constants import DEFAULT_EXCLUDED_NODES
-from gen3_metadata_templates.errors import G3mtError, SelectionError
+from gen3_metadata_templates.batch import (
+    BatchSelection,
+    default_filename,
+    every_category,
+    every_node,
+    plan_batch,
+    run_batch,
+)
+from gen3_metadata_templates.cache import SpecCache
+from gen3_metadata_templates.constants import (
+    DEFAULT_EXCLUDED_NODES,
+    LAYOUT_GRID,
+    LAYOUTS,
+    STAGING_MEMORY,
+    STAGINGS,
+    TEMPLATE_FORMATS,
+)
+from gen3_metadata_templates.errors import G3mtError, RecordSourceError, SelectionError
 from gen3_metadata_templates.model import build_multi_template_spec
 from gen3_metadata_templates.paths import enumerate_paths, resolve_path
 from gen3_metadata_templates.schema import SchemaBundle
 from gen3_metadata_templates.selection import resolve_selection
+from gen3_metadata_templates.sources import RecordFiles
 from gen3_metadata_templates.validation.report import render_console, to_json
-from gen3_metadata_templates.validation.runner import validate_workbook
+from gen3_metadata_templates.validation.runner import validate_export, validate_workbook
 from gen3_metadata_templates.workbook.annotate import write_annotated_copy
-from gen3_metadata_templates.workbook.writer import write_template
+from gen3_metadata_templates.workbook.cache import WorkbookCache
+from gen3_metadata_templates.workbook.exports import is_export
+from gen3_metadata_templates.workbook.handle import WorkbookHandle
+from gen3_metadata_templates.workbook.tsv import write_tsv_bundle
+from gen3_metadata_templates.workbook.writer import fill_template, write_template
 
 app = typer.Typer(
     add_completion=False,
@@ -138,18 +159,6 @@ def _parse_path_overrides(values: List[str], targets: List[str], single_target_m
     return overrides
 
 
-def _default_filename(category: Optional[str], targets: List[str]) -> str:
-    """Work out a sensible output filename for whatever was selected."""
-    if category:
-        safe = re.sub(r"\W+", "_", category.strip().lower()).strip("_")
-        return f"{safe}_template.xlsx"
-    if len(targets) == 1:
-        return f"{targets[0]}_template.xlsx"
-    if len(targets) <= 3:
-        return f"{'_'.join(targets)}_template.xlsx"
-    return f"{targets[0]}_and_{len(targets) - 1}_more_template.xlsx"
-
-
 def _print_paths(bundle, targets: List[str], excluded) -> None:
     """Print the numbered paths to each selected node."""
     if len(targets) == 1:
@@ -211,6 +220,34 @@ def _report_selection(out_path, spec, selection, bundle) -> None:
         )
 
 
+def _spec_cache(cache_dir: Optional[Path]) -> Optional[SpecCache]:
+    """A disk-backed spec cache for ``--cache-dir``, or None to use the default."""
+    return SpecCache(directory=cache_dir) if cache_dir is not None else None
+
+
+def _check_layout(value: str) -> str:
+    if value not in LAYOUTS:
+        raise typer.BadParameter(f"Choose one of: {', '.join(LAYOUTS)}.")
+    return value
+
+
+def _check_format(value: str) -> str:
+    if value not in TEMPLATE_FORMATS:
+        raise typer.BadParameter(f"Choose one of: {', '.join(TEMPLATE_FORMATS)}.")
+    return value
+
+
+def _check_staging(value: str) -> str:
+    if value not in STAGINGS:
+        raise typer.BadParameter(f"Choose one of: {', '.join(STAGINGS)}.")
+    return value
+
+
+def _workbook_cache(cache_dir: Optional[Path]) -> Optional[WorkbookCache]:
+    """A cache of finished workbooks for ``--cache-dir``, or None to always write."""
+    return WorkbookCache(cache_dir) if cache_dir is not None else None
+
+
 def _choose_path(bundle, target, path_arg, excluded) -> List[str]:
     """Resolve a path, prompting interactively only when a TTY is available."""
     paths = enumerate_paths(bundle, target, excluded)
@@ -243,11 +280,36 @@ def generate(
         rich_help_panel="Output",
         help="Where to write the .xlsx (default: derived from what you selected).",
     ),
-    rows: int = typer.Option(
-        5000,
+    rows: Optional[int] = typer.Option(
+        None,
         "--rows",
         rich_help_panel="Output",
-        help="Number of blank data rows to provision per sheet.",
+        help="Number of blank data rows to provision per sheet "
+        "(default: 5000, or 20 with --layout table).",
+    ),
+    layout: str = typer.Option(
+        LAYOUT_GRID,
+        "--layout",
+        callback=_check_layout,
+        rich_help_panel="Output",
+        help="'grid' (fixed rows under a hint row) or 'table' (Excel Tables that grow "
+        "as rows are typed).",
+    ),
+    template_format: str = typer.Option(
+        "xlsx",
+        "--format",
+        callback=_check_format,
+        rich_help_panel="Output",
+        help="'xlsx' (an Excel workbook) or 'tsv' (one TSV per node plus metadata, as a "
+        ".zip or, for an -o without .zip, a directory). --rows, --layout and "
+        "--compact-comments only apply to xlsx.",
+    ),
+    compact_comments: bool = typer.Option(
+        False,
+        "--compact-comments",
+        rich_help_panel="Output",
+        help="Show a short note when a cell is selected instead of a full comment on "
+        "every header; the full text stays on the Dictionary sheet. Smaller files.",
     ),
     force: bool = typer.Option(
         False,
@@ -307,6 +369,13 @@ def generate(
         help="Keep the normally-excluded nodes (program, project, "
         "core_metadata_collection, acknowledgement).",
     ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        rich_help_panel="Output",
+        help="Reuse template plans and finished workbooks stored in this directory "
+        "(created if missing).",
+    ),
 ):
     """Generate an Excel template, for one node or for many at once.
 
@@ -356,14 +425,28 @@ def generate(
             strict_targets=explicit,
         )
         columns = list(DEFAULT_EXCLUDED_COLUMNS) + list(exclude_column)
-        spec = build_multi_template_spec(bundle, selection, excluded_columns=columns)
+        spec = build_multi_template_spec(
+            bundle, selection, excluded_columns=columns, cache=_spec_cache(cache_dir)
+        )
 
-        out_path = output or Path(_default_filename(category, selection.targets))
+        out_path = output or Path(default_filename(category, selection.targets))
+        if output is None and template_format == "tsv":
+            out_path = out_path.with_suffix(".zip")
         if out_path.exists() and not force:
             err_console.print(f"[red]{out_path} already exists.[/] Use --force to overwrite.")
             raise typer.Exit(2)
 
-        write_template(spec, out_path, data_rows=rows)
+        if template_format == "tsv":
+            write_tsv_bundle(spec, out_path)
+        else:
+            write_template(
+                spec,
+                out_path,
+                data_rows=rows,
+                layout=layout,
+                compact_comments=compact_comments,
+                cache=_workbook_cache(cache_dir),
+            )
 
         if single_target_mode:
             console.print(
@@ -374,10 +457,345 @@ def generate(
             _report_selection(out_path, spec, selection, bundle)
 
 
+@app.command("generate-batch")
+def generate_batch(
+    schema: str = typer.Argument(
+        ..., help="Path or http(s):// URL to the Gen3 JSON schema bundle."
+    ),
+    select: List[str] = typer.Option(
+        [],
+        "--select",
+        rich_help_panel="Node selection",
+        help="One workbook per value: a node list (subject,sample) or a category "
+        "(category:clinical). Repeatable.",
+    ),
+    select_file: Optional[Path] = typer.Option(
+        None,
+        "--select-file",
+        exists=True,
+        dir_okay=False,
+        rich_help_panel="Node selection",
+        help="A file with one --select value per line (# starts a comment).",
+    ),
+    every_node_flag: bool = typer.Option(
+        False,
+        "--every-node",
+        rich_help_panel="Node selection",
+        help="One workbook for every node that isn't excluded.",
+    ),
+    every_category_flag: bool = typer.Option(
+        False,
+        "--every-category",
+        rich_help_panel="Node selection",
+        help="One workbook for every category in the schema.",
+    ),
+    output_dir: Path = typer.Option(
+        Path("."),
+        "--output-dir",
+        "-d",
+        rich_help_panel="Output",
+        help="Directory to write the workbooks into (created if missing).",
+    ),
+    rows: Optional[int] = typer.Option(
+        None,
+        "--rows",
+        rich_help_panel="Output",
+        help="Number of blank data rows to provision per sheet "
+        "(default: 5000, or 20 with --layout table).",
+    ),
+    layout: str = typer.Option(
+        LAYOUT_GRID,
+        "--layout",
+        callback=_check_layout,
+        rich_help_panel="Output",
+        help="'grid' (fixed rows under a hint row) or 'table' (Excel Tables that grow "
+        "as rows are typed).",
+    ),
+    compact_comments: bool = typer.Option(
+        False,
+        "--compact-comments",
+        rich_help_panel="Output",
+        help="Show a short note when a cell is selected instead of a full comment on "
+        "every header; the full text stays on the Dictionary sheet. Smaller files.",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        rich_help_panel="Output",
+        help="Overwrite workbooks that already exist.",
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-j",
+        rich_help_panel="Output",
+        help="Processes to write with (default: one per CPU).",
+    ),
+    include_node: List[str] = typer.Option(
+        [],
+        "--include-node",
+        rich_help_panel="Node & column filters",
+        help="Re-include a node excluded by default (e.g. --include-node project).",
+    ),
+    exclude_node: List[str] = typer.Option(
+        [],
+        "--exclude-node",
+        rich_help_panel="Node & column filters",
+        help="Exclude an extra node from every template.",
+    ),
+    exclude_column: List[str] = typer.Option(
+        [],
+        "--exclude-column",
+        rich_help_panel="Node & column filters",
+        help="Exclude an extra property column from every sheet.",
+    ),
+    no_default_excludes: bool = typer.Option(
+        False,
+        "--no-default-excludes",
+        rich_help_panel="Node & column filters",
+        help="Keep the normally-excluded nodes (program, project, "
+        "core_metadata_collection, acknowledgement).",
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        rich_help_panel="Output",
+        help="Reuse template plans and finished workbooks stored in this directory "
+        "(created if missing).",
+    ),
+):
+    """Generate many templates at once, resolving the schema only once.
+
+    Each workbook is exactly what [bold]g3mt generate --node ...[/] or
+    [bold]--category ...[/] would write for the same selection. Workbooks are
+    written in parallel and a per-workbook timing summary is printed.
+    """
+    from gen3_metadata_templates.constants import DEFAULT_EXCLUDED_COLUMNS
+
+    with _handle_errors():
+        bundle = SchemaBundle(schema)
+        excluded = _effective_excluded(include_node, exclude_node, no_default_excludes)
+
+        texts = list(select)
+        if select_file is not None:
+            for line in select_file.read_text(encoding="utf-8").splitlines():
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    texts.append(line)
+        selections = [BatchSelection.parse(text) for text in texts]
+        generated = []
+        if every_node_flag:
+            generated.extend(every_node(bundle, excluded))
+        if every_category_flag:
+            generated.extend(every_category(bundle))
+        if not selections and not generated:
+            raise SelectionError(
+                "Nothing selected. Use --select, --select-file, --every-node or --every-category.\n"
+                f"  g3mt generate-batch {schema} --every-category -d templates/"
+            )
+
+        columns = list(DEFAULT_EXCLUDED_COLUMNS) + list(exclude_column)
+        cache = _spec_cache(cache_dir)
+        plan = plan_batch(
+            bundle,
+            selections,
+            output_dir,
+            excluded_nodes=excluded,
+            excluded_columns=columns,
+            cache=cache,
+        )
+        extra = plan_batch(
+            bundle,
+            generated,
+            output_dir,
+            excluded_nodes=excluded,
+            excluded_columns=columns,
+            cache=cache,
+            skip_empty=True,
+        )
+        plan.merge(extra)
+
+        existing = [job.output for job in plan.jobs if job.output.exists()]
+        if existing and not force:
+            err_console.print(
+                f"[red]{len(existing)} workbook(s) already exist[/] (e.g. {existing[0]}). "
+                "Use --force to overwrite."
+            )
+            raise typer.Exit(2)
+
+        start = time.perf_counter()
+        results = run_batch(
+            plan.jobs,
+            data_rows=rows,
+            layout=layout,
+            compact_comments=compact_comments,
+            workers=workers,
+            cache=_workbook_cache(cache_dir),
+        )
+        elapsed = time.perf_counter() - start
+
+        table = Table(header_style="bold")
+        table.add_column("Workbook")
+        table.add_column("Selection")
+        table.add_column("Sheets", justify="right")
+        table.add_column("Size", justify="right")
+        table.add_column("Time", justify="right")
+        for job, result in zip(plan.jobs, results):
+            table.add_row(
+                str(result.output),
+                job.selection.label,
+                str(result.sheets),
+                f"{result.size / 1024:.0f} KB",
+                f"{result.seconds:.2f} s",
+            )
+        console.print(table)
+        for label, reason in plan.skipped:
+            console.print(f"[dim]Skipped {label}: {reason.splitlines()[0]}[/]")
+        console.print(
+            f"[green]Wrote {len(results)} workbook(s)[/] in {elapsed:.2f} s "
+            f"[dim](writing time summed over workbooks: "
+            f"{sum(r.seconds for r in results):.2f} s)[/]"
+        )
+
+
+@app.command()
+def fill(
+    schema: str = typer.Argument(
+        ..., help="Path or http(s):// URL to the Gen3 JSON schema bundle."
+    ),
+    records: List[Path] = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        help="Records to put in the template: .json, .jsonl, .csv or .tsv files. A CSV/TSV "
+        "without a 'type' column holds the node it is named after (subject.tsv).",
+    ),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        rich_help_panel="Output",
+        help="Where to write the .xlsx (default: derived from the nodes in the records).",
+    ),
+    rows: Optional[int] = typer.Option(
+        None,
+        "--rows",
+        rich_help_panel="Output",
+        help="Blank rows to provision after the filled ones (default: 5000).",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        rich_help_panel="Output",
+        help="Overwrite the output file if it already exists.",
+    ),
+    compact_comments: bool = typer.Option(
+        False,
+        "--compact-comments",
+        rich_help_panel="Output",
+        help="Show a short note when a cell is selected instead of a full comment on "
+        "every header; the full text stays on the Dictionary sheet. Smaller files.",
+    ),
+    include_node: List[str] = typer.Option(
+        [],
+        "--include-node",
+        rich_help_panel="Node & column filters",
+        help="Re-include a node excluded by default (e.g. --include-node project).",
+    ),
+    exclude_node: List[str] = typer.Option(
+        [],
+        "--exclude-node",
+        rich_help_panel="Node & column filters",
+        help="Leave this node's sheet (and its records) out.",
+    ),
+    exclude_column: List[str] = typer.Option(
+        [],
+        "--exclude-column",
+        rich_help_panel="Node & column filters",
+        help="Exclude an extra property column from every sheet.",
+    ),
+    no_default_excludes: bool = typer.Option(
+        False,
+        "--no-default-excludes",
+        rich_help_panel="Node & column filters",
+        help="Keep the normally-excluded nodes (program, project, "
+        "core_metadata_collection, acknowledgement).",
+    ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        rich_help_panel="Output",
+        help="Reuse template plans stored in this directory (created if missing).",
+    ),
+):
+    """Write a template already filled with existing records.
+
+    The template covers every node the records belong to, plus their
+    ancestors, exactly as [bold]g3mt generate --node ...[/] would lay it out.
+    Rows are streamed to disk, so files with hundreds of thousands of records
+    are fine.
+    """
+    from gen3_metadata_templates.constants import DEFAULT_EXCLUDED_COLUMNS
+
+    with _handle_errors():
+        bundle = SchemaBundle(schema)
+        excluded = _effective_excluded(include_node, exclude_node, no_default_excludes)
+        sources = RecordFiles(records)
+
+        found = sources.nodes
+        targets = [n for n in found if n not in set(excluded)]
+        if not targets:
+            raise SelectionError(
+                "The records only belong to excluded nodes "
+                f"({', '.join(found) or 'none found'}). Use --include-node to keep one."
+            )
+        selection = resolve_selection(
+            bundle, targets, excluded_nodes=excluded, strict_targets=targets
+        )
+        columns = list(DEFAULT_EXCLUDED_COLUMNS) + list(exclude_column)
+        spec = build_multi_template_spec(
+            bundle, selection, excluded_columns=columns, cache=_spec_cache(cache_dir)
+        )
+
+        default_name = default_filename(None, selection.targets)
+        out_path = output or Path(default_name.replace("_template.xlsx", "_filled.xlsx"))
+        if out_path.exists() and not force:
+            err_console.print(f"[red]{out_path} already exists.[/] Use --force to overwrite.")
+            raise typer.Exit(2)
+
+        start = time.perf_counter()
+        filled = fill_template(
+            spec,
+            out_path,
+            sources.by_node(spec.node_order),
+            data_rows=rows,
+            compact_comments=compact_comments,
+        )
+        elapsed = time.perf_counter() - start
+
+        table = Table(header_style="bold")
+        table.add_column("Sheet")
+        table.add_column("Rows", justify="right")
+        for nt in spec.nodes:
+            table.add_row(nt.sheet_name, f"{filled.get(nt.node, 0):,}")
+        console.print(table)
+        skipped = [n for n in found if n not in filled]
+        if skipped:
+            console.print(f"[dim]Skipped records for excluded node(s): {', '.join(skipped)}.[/]")
+        console.print(
+            f"[green]Wrote[/] {out_path} with {sum(filled.values()):,} record(s) in {elapsed:.2f} s"
+        )
+
+
 @app.command()
 def validate(
-    workbook: Path = typer.Argument(
-        ..., exists=True, dir_okay=False, help="The filled .xlsx template to check."
+    inputs: List[Path] = typer.Argument(
+        ...,
+        metavar="WORKBOOK_OR_FILES...",
+        help=(
+            "The filled .xlsx template to check, or a TSV bundle (.zip or directory); "
+            "or Gen3 .tsv/.csv/.jsonl exports ('-' reads one from standard input)."
+        ),
     ),
     schema: str = typer.Option(
         ...,
@@ -397,23 +815,82 @@ def validate(
     path: Optional[str] = typer.Option(
         None, "--path", help="Node path, if the workbook has no g3mt metadata."
     ),
+    cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--cache-dir",
+        help="Reuse template plans stored in this directory (created if missing).",
+    ),
+    staging: str = typer.Option(
+        STAGING_MEMORY,
+        "--staging",
+        callback=_check_staging,
+        help="Where to keep identifiers and links for the cross-sheet checks: 'memory', "
+        "or 'sqlite' (a temporary file) to keep memory flat on very large inputs.",
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-j",
+        help="Processes to schema-check large sheets with (default: 1, this process).",
+    ),
 ):
-    """Validate a filled template and report problems by sheet, row, and column."""
+    """Validate a filled template and report problems by sheet, row, and column.
+
+    Text exports are checked the same way, node by node, with problems
+    reported by file and line.
+    """
     with _handle_errors():
-        report = validate_workbook(workbook, schema, path_arg=path)
+        if len(inputs) == 1 and not is_export(inputs[0]):
+            _validate_workbook(
+                inputs[0], schema, annotate, json_out, verbose, path, cache_dir, staging, workers
+            )
+        not_exports = [str(p) for p in inputs if not is_export(p)]
+        if not_exports:
+            raise RecordSourceError(
+                "Validate one workbook or bundle at a time, or any number of .tsv, .csv "
+                f"and .jsonl files; not {', '.join(not_exports)} alongside others."
+            )
+        report = validate_export(
+            inputs, schema, spec_cache=_spec_cache(cache_dir), staging=staging, workers=workers
+        )
+        _print_report(report, json_out, verbose)
+        if annotate is not None:
+            err_console.print("[yellow]--annotate only works on .xlsx workbooks; skipped.[/]")
+        raise typer.Exit(0 if report.ok else 1)
 
-        if json_out:
-            console.print_json(json.dumps(to_json(report)))
-        else:
-            render_console(report, console, verbose=verbose)
 
-        if annotate is not None:
-            write_annotated_copy(workbook, report, annotate)
+def _validate_workbook(
+    workbook, schema, annotate, json_out, verbose, path, cache_dir, staging, workers
+) -> None:
+    if not workbook.exists():
+        raise typer.BadParameter(f"Path '{workbook}' does not exist.", param_hint="WORKBOOK")
+    with WorkbookHandle(workbook) as handle:
+        report = validate_workbook(
+            handle,
+            schema,
+            path_arg=path,
+            spec_cache=_spec_cache(cache_dir),
+            staging=staging,
+            workers=workers,
+        )
+        _print_report(report, json_out, verbose)
+
+        if annotate is not None and handle.is_bundle:
+            err_console.print("[yellow]--annotate only works on .xlsx workbooks; skipped.[/]")
+        elif annotate is not None:
+            write_annotated_copy(handle, report, annotate)
             console.print(f"[green]Wrote annotated copy[/] {annotate}")
 
         raise typer.Exit(0 if report.ok else 1)
 
 
+def _print_report(report, json_out: bool, verbose: bool) -> None:
+    if json_out:
+        console.print_json(json.dumps(to_json(report)))
+    else:
+        render_console(report, console, verbose=verbose)
+
+
 @app.command()
 def nodes(
     schema: str = typer.Argument(
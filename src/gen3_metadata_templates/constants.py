@@ -40,26 +40,76 @@ HEADER_ROW = 1  # column headers
 HINT_ROW = 2  # type + required/optional hint, locked
 FIRST_DATA_ROW = 3  # first row a submitter types into
 
+# Node sheet layouts. "grid" (the default) provisions a fixed block of rows
+# under a locked hint row. "table" makes each sheet an Excel Table that grows
+# as rows are typed below it: no hint row, so data starts straight under the
+# header, and the sheet is left unprotected so the table can expand.
+LAYOUT_GRID = "grid"
+LAYOUT_TABLE = "table"
+LAYOUTS = (LAYOUT_GRID, LAYOUT_TABLE)
+TABLE_FIRST_DATA_ROW = 2
+
+# The TSV bundle: one tab-separated file per node, named after the node, plus
+# a sidecar JSON holding the same metadata as the META_SHEET. Line 1 is the
+# header; records start on line 2. Written as a .zip, or as a directory.
+LAYOUT_TSV = "tsv"
+TSV_FIRST_DATA_ROW = 2
+BUNDLE_META_FILE = "_g3mt.json"
+TEMPLATE_FORMATS = ("xlsx", "tsv")
+
+# How read_workbook parses an .xlsx: its own XML parser (falling back to
+# openpyxl for anything it can't read identically), or always openpyxl.
+READ_ENGINE_NATIVE = "native"
+READ_ENGINE_OPENPYXL = "openpyxl"
+READ_ENGINES = (READ_ENGINE_NATIVE, READ_ENGINE_OPENPYXL)
+
+# Where validation keeps what it needs across records (every node's
+# identifiers and every link reference): in memory, or in a temporary SQLite
+# file, for workbooks too large to hold that for.
+STAGING_MEMORY = "memory"
+STAGING_SQLITE = "sqlite"
+STAGINGS = (STAGING_MEMORY, STAGING_SQLITE)
+
+# Node sheet XML (uncompressed, all sheets together) below which the native
+# reader parses sheets one after another: under this, starting a process pool
+# and shipping records back costs more than it saves.
+PARALLEL_READ_MIN_BYTES = 32 * 1024 * 1024
+
+# Records per schema-check task when validation spreads over processes. A
+# workbook none of whose sheets reaches this many records never starts a pool.
+PARALLEL_VALIDATE_CHUNK = 2000
+
+# Rows a table-layout sheet starts with; it extends itself from there.
+DEFAULT_TABLE_ROWS = 20
+
 # Reserved sheet names.
 INSTRUCTIONS_SHEET = "Instructions"
 DICTIONARY_SHEET = "Dictionary"
 META_SHEET = "_g3mt"  # hidden machine-readable metadata
 
 # Version of the _g3mt sheet layout. 1 = single target_node/path (g3mt <= 2.2.0);
-# 2 adds node_order/target_nodes/target_paths for multi-node templates.
-META_FORMAT = 2
+# 2 adds node_order/target_nodes/target_paths for multi-node templates;
+# 3 embeds the full serialised spec (spec_hash/spec_parts/spec_N);
+# 4 records the sheet layout and its first data row (layout/first_data_row).
+META_FORMAT = 4
 LISTS_SHEET = "_lists"  # hidden backing store for long enum dropdowns
 
 # Sheet names the workbook itself uses; a node must never be given one of these.
 RESERVED_SHEET_NAMES = (INSTRUCTIONS_SHEET, DICTIONARY_SHEET, META_SHEET, LISTS_SHEET)
 
-# Excel caps a worksheet name at 31 characters.
+# Excel caps a worksheet name at 31 characters, and a sheet at 1,048,576 rows.
 MAX_SHEET_NAME_LEN = 31
+EXCEL_MAX_ROWS = 1_048_576
 
 # Excel rejects an inline data-validation list whose joined text exceeds 255
 # characters; longer enums are written to LISTS_SHEET and referenced by name.
 MAX_INLINE_LIST_LEN = 255
 
+# Excel's limits on a data-validation input message, the short note shown when
+# a cell is selected. Compact templates use these instead of header comments.
+MAX_INPUT_TITLE_LEN = 32
+MAX_INPUT_MESSAGE_LEN = 255
+
 # Separator used inside a single cell for to-many links and array-valued
 # properties (e.g. "id_a; id_b; id_c").
 LIST_SPLIT_CHAR = ";"
@@ -74,6 +74,10 @@ class WorkbookFormatError(G3mtError):
     """The uploaded workbook is not a recognisable g3mt template."""
 
 
+class RecordSourceError(G3mtError):
+    """A records file couldn't be read, or its records don't say what node they are."""
+
+
 class SelectionError(G3mtError):
     """The set of nodes to put in a template couldn't be worked out.
 
@@ -10,9 +10,12 @@ what the columns are.
 
 from __future__ import annotations
 
+import hashlib
+import json
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from gen3_metadata_templates.constants import (
     DEFAULT_EXCLUDED_COLUMNS,
@@ -23,6 +26,17 @@ from gen3_metadata_templates.schema import LinkInfo, SchemaBundle
 from gen3_metadata_templates.selection import NodeSelection
 from gen3_metadata_templates.workbook.naming import fk_header, sheet_names
 
+if TYPE_CHECKING:  # pragma: no cover - import only for annotations
+    from gen3_metadata_templates.cache import SpecCache
+
+# Version of the serialised spec layout produced by ``TemplateSpec.to_dict``.
+# Bump it whenever a field is added, removed or changes meaning, so stale
+# cached or embedded specs are rebuilt instead of misread.
+SPEC_FORMAT = 1
+
+# Nodes handed to each process-pool worker at a time by ``build_spec_for_nodes``.
+_MAP_CHUNKSIZE = 8
+
 
 class ColumnKind(str, Enum):
     """What role a column plays, which decides how it is written and read."""
@@ -55,6 +69,39 @@ class ColumnSpec:
     link_multiplicity: Optional[str] = None
     is_multi: bool = False
 
+    def to_dict(self) -> Dict[str, Any]:
+        """A JSON-ready dict, with fields in declaration order."""
+        return {
+            "header": self.header,
+            "prop_name": self.prop_name,
+            "kind": self.kind.value,
+            "data_type": self.data_type,
+            "required": self.required,
+            "description": self.description,
+            "enum": list(self.enum) if self.enum is not None else None,
+            "pattern": self.pattern,
+            "link_target": self.link_target,
+            "link_multiplicity": self.link_multiplicity,
+            "is_multi": self.is_multi,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ColumnSpec":
+        enum = data.get("enum")
+        return cls(
+            header=data["header"],
+            prop_name=data["prop_name"],
+            kind=ColumnKind(data["kind"]),
+            data_type=data["data_type"],
+            required=bool(data["required"]),
+            description=data.get("description") or "",
+            enum=tuple(enum) if enum is not None else None,
+            pattern=data.get("pattern"),
+            link_target=data.get("link_target"),
+            link_multiplicity=data.get("link_multiplicity"),
+            is_multi=bool(data.get("is_multi", False)),
+        )
+
 
 @dataclass
 class NodeTemplate:
@@ -71,6 +118,23 @@ class NodeTemplate:
     def column_by_prop(self, prop: str) -> Optional[ColumnSpec]:
         return next((c for c in self.columns if c.prop_name == prop), None)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "node": self.node,
+            "sheet_name": self.sheet_name,
+            "description": self.description,
+            "columns": [c.to_dict() for c in self.columns],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "NodeTemplate":
+        return cls(
+            node=data["node"],
+            sheet_name=data["sheet_name"],
+            description=data.get("description") or "",
+            columns=[ColumnSpec.from_dict(c) for c in data.get("columns", [])],
+        )
+
 
 @dataclass
 class TemplateSpec:
@@ -111,6 +175,62 @@ class TemplateSpec:
     def node_template(self, node: str) -> Optional[NodeTemplate]:
         return next((n for n in self.nodes if n.node == node), None)
 
+    # --- serialisation ----------------------------------------------------
+    #
+    # A spec is a pure function of its inputs, so it can be stored and reused
+    # instead of re-derived from the schema. The JSON form keeps every mapping
+    # in its original order (no key sorting), which means a round-tripped spec
+    # produces byte-identical workbook output.
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "spec_format": SPEC_FORMAT,
+            "schema_path": self.schema_path,
+            "schema_version": self.schema_version,
+            "target_node": self.target_node,
+            "path": list(self.path),
+            "target_nodes": list(self.target_nodes),
+            "paths": {t: list(p) for t, p in self.paths.items()},
+            "depth": dict(self.depth),
+            "category": self.category,
+            "nodes": [nt.to_dict() for nt in self.nodes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "TemplateSpec":
+        """Rebuild a spec from :meth:`to_dict` output.
+
+        :raises ValueError: if the data was written in a different spec format.
+        """
+        if data.get("spec_format") != SPEC_FORMAT:
+            raise ValueError(
+                f"Unsupported spec format {data.get('spec_format')!r} (expected {SPEC_FORMAT})."
+            )
+        return cls(
+            schema_path=data["schema_path"],
+            target_node=data["target_node"],
+            path=list(data["path"]),
+            nodes=[NodeTemplate.from_dict(nt) for nt in data["nodes"]],
+            schema_version=data.get("schema_version"),
+            target_nodes=list(data.get("target_nodes") or []),
+            paths={t: list(p) for t, p in (data.get("paths") or {}).items()},
+            depth={n: int(d) for n, d in (data.get("depth") or {}).items()},
+            category=data.get("category"),
+        )
+
+    def to_json(self) -> str:
+        """Compact, deterministic JSON: the same spec always gives the same text."""
+        return json.dumps(self.to_dict(), separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> "TemplateSpec":
+        return cls.from_dict(json.loads(text))
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of :meth:`to_json`; equal specs always share a hash."""
+        return hashlib.sha256(self.to_json().encode("utf-8")).hexdigest()
+
 
 def _collect_enum(prop: dict) -> Optional[Tuple[str, ...]]:
     """Pull allowed values out of a resolved property.
@@ -219,6 +339,58 @@ def _link_columns(
     return columns
 
 
+def _node_template_task(task: tuple) -> NodeTemplate:
+    """Derive one node's sheet from the inputs gathered by ``build_spec_for_nodes``.
+
+    ``task`` is ``(node, resolved, links, positions, sheet_name, excluded)``,
+    where ``positions`` maps each in-template parent to its sheet index. Module
+    level and free of the bundle so a process pool can run it.
+    """
+    node, resolved, links, positions, sheet_name, excluded = task
+    properties: dict = resolved.get("properties", {})
+    required = set(resolved.get("required", []))
+    link_names = {link.name for link in links}
+
+    columns: List[ColumnSpec] = []
+
+    # 1. Primary key.
+    if PRIMARY_KEY in properties:
+        columns.append(
+            ColumnSpec(
+                header=PRIMARY_KEY,
+                prop_name=PRIMARY_KEY,
+                kind=ColumnKind.PK,
+                data_type="string",
+                required=True,
+                description=(
+                    "Your own unique identifier for this row. Reuse the same "
+                    "value on child sheets to link records together."
+                ),
+            )
+        )
+
+    # 2. Link (foreign-key) columns, ordered by parent position in the sheets.
+    columns.extend(_link_columns(links, positions, required))
+
+    # 3. Remaining properties: required first (alphabetical), then optional.
+    plain_props = [
+        name
+        for name in properties
+        if name != PRIMARY_KEY and name not in link_names and name not in excluded
+    ]
+    required_plain = sorted(p for p in plain_props if p in required)
+    optional_plain = sorted(p for p in plain_props if p not in required)
+    for name in required_plain + optional_plain:
+        columns.append(_derive_property_column(name, properties[name], required=name in required))
+
+    return NodeTemplate(
+        node=node,
+        sheet_name=sheet_name,
+        description=resolved.get("description", ""),
+        columns=columns,
+    )
+
+
 def build_spec_for_nodes(
     bundle: SchemaBundle,
     ordered_nodes: Sequence[str],
@@ -228,6 +400,8 @@ def build_spec_for_nodes(
     depth: Optional[Mapping[str, int]] = None,
     category: Optional[str] = None,
     excluded_columns: Sequence[str] = DEFAULT_EXCLUDED_COLUMNS,
+    cache: Optional["SpecCache"] = None,
+    executor: Optional[Executor] = None,
 ) -> TemplateSpec:
     """Build a spec from an explicit, already-ordered node list.
 
@@ -239,63 +413,51 @@ def build_spec_for_nodes(
         ancestors that came along). Defaults to the last node, matching the
         single-target case.
     :param excluded_columns: property names stripped from every sheet.
+    :param cache: a :class:`~gen3_metadata_templates.cache.SpecCache` to reuse
+        a spec previously built from the same schema and arguments.
+    :param executor: a ``concurrent.futures`` thread or process pool to derive
+        the nodes' columns on. Worth it for all-node or large category
+        templates; the result is identical to a serial build.
     """
-    excluded_col_set = set(excluded_columns)
+    if cache is not None:
+        return cache.get_or_build(
+            bundle,
+            ordered_nodes,
+            target_nodes=target_nodes,
+            paths=paths,
+            depth=depth,
+            category=category,
+            excluded_columns=excluded_columns,
+            executor=executor,
+        )
+
+    excluded_col_set = frozenset(excluded_columns)
     included_nodes = list(ordered_nodes)
     node_index = {node: i for i, node in enumerate(included_nodes)}
     sheet_map = sheet_names(included_nodes)
 
-    node_templates: List[NodeTemplate] = []
+    # Gather each node's inputs up front: this is the only part that touches the
+    # bundle, and the result is plain picklable data, so the derivation itself
+    # can run in any executor — threads or processes.
+    tasks = []
     for node in included_nodes:
-        resolved = bundle.resolved(node)
-        properties: dict = resolved.get("properties", {})
-        required = set(resolved.get("required", []))
         links = bundle.links(node)
-        link_names = {link.name for link in links}
-
-        columns: List[ColumnSpec] = []
-
-        # 1. Primary key.
-        if PRIMARY_KEY in properties:
-            columns.append(
-                ColumnSpec(
-                    header=PRIMARY_KEY,
-                    prop_name=PRIMARY_KEY,
-                    kind=ColumnKind.PK,
-                    data_type="string",
-                    required=True,
-                    description=(
-                        "Your own unique identifier for this row. Reuse the same "
-                        "value on child sheets to link records together."
-                    ),
-                )
-            )
-
-        # 2. Link (foreign-key) columns, ordered by parent position in the sheets.
-        columns.extend(_link_columns(links, node_index, required))
-
-        # 3. Remaining properties: required first (alphabetical), then optional.
-        plain_props = [
-            name
-            for name in properties
-            if name != PRIMARY_KEY and name not in link_names and name not in excluded_col_set
-        ]
-        required_plain = sorted(p for p in plain_props if p in required)
-        optional_plain = sorted(p for p in plain_props if p not in required)
-        for name in required_plain + optional_plain:
-            columns.append(
-                _derive_property_column(name, properties[name], required=name in required)
-            )
-
-        node_templates.append(
-            NodeTemplate(
-                node=node,
-                sheet_name=sheet_map[node],
-                description=resolved.get("description", ""),
-                columns=columns,
-            )
+        positions = {
+            link.target_type: node_index[link.target_type]
+            for link in links
+            if link.target_type in node_index
+        }
+        tasks.append(
+            (node, bundle.resolved(node), links, positions, sheet_map[node], excluded_col_set)
         )
 
+    if executor is None or len(tasks) < 2:
+        node_templates = [_node_template_task(task) for task in tasks]
+    else:
+        # ``map`` yields in submission order, so the sheets come back in
+        # ``ordered_nodes`` order however the work was scheduled.
+        node_templates = list(executor.map(_node_template_task, tasks, chunksize=_MAP_CHUNKSIZE))
+
     targets = [t for t in target_nodes] or ([included_nodes[-1]] if included_nodes else [])
     path_map = {t: list(p) for t, p in (paths or {}).items()}
     primary = targets[0] if targets else ""
@@ -320,6 +482,7 @@ def build_template_spec(
     *,
     excluded_nodes: Sequence[str] = DEFAULT_EXCLUDED_NODES,
     excluded_columns: Sequence[str] = DEFAULT_EXCLUDED_COLUMNS,
+    cache: Optional["SpecCache"] = None,
 ) -> TemplateSpec:
     """Assemble the template plan for one target reached along one path.
 
@@ -330,6 +493,7 @@ def build_template_spec(
         excluded nodes for display.
     :param excluded_nodes: nodes that get no sheet.
     :param excluded_columns: property names stripped from every sheet.
+    :param cache: optional :class:`~gen3_metadata_templates.cache.SpecCache`.
     """
     excluded_node_set = {n for n in excluded_nodes}
     included = [n for n in path if n not in excluded_node_set]
@@ -340,6 +504,7 @@ def build_template_spec(
         target_nodes=[target_node],
         paths={target_node: list(path)},
         excluded_columns=excluded_columns,
+        cache=cache,
     )
     # Preserve the caller's target/path verbatim, including any excluded nodes
     # the path ran through — the workbook metadata records them for display.
@@ -353,6 +518,7 @@ def build_multi_template_spec(
     selection: NodeSelection,
     *,
     excluded_columns: Sequence[str] = DEFAULT_EXCLUDED_COLUMNS,
+    cache: Optional["SpecCache"] = None,
 ) -> TemplateSpec:
     """Assemble the template plan for a resolved multi-node selection.
 
@@ -367,4 +533,5 @@ def build_multi_template_spec(
         depth=selection.depth,
         category=selection.category,
         excluded_columns=excluded_columns,
+        cache=cache,
     )
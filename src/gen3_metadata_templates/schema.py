@@ -10,6 +10,7 @@ module is the only place that has to change.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import tempfile
@@ -55,6 +56,15 @@ def _download_schema(url: str) -> bytes:
     return data
 
 
+def _file_sha256(path: str) -> str:
+    """Hex SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 @dataclass(frozen=True)
 class LinkInfo:
     """A parent relationship as seen from the child node.
@@ -101,13 +111,18 @@ class SchemaBundle:
     ``schema_path`` may be a local file path or an ``http(s)://`` URL pointing at
     a Gen3 schema bundle (e.g. a raw file on GitHub). URLs are downloaded to a
     temporary file, resolved, and cleaned up.
+
+    ``fingerprint`` is the SHA-256 of the schema file's bytes, so anything derived
+    purely from the schema (such as a template spec) can be cached against it.
     """
 
     def __init__(self, schema_path: Union[str, Path]):
         self.schema_path = str(schema_path)
         self._category_map: Optional[Dict[str, List[str]]] = None
+        self._resolved_index: Optional[Dict[str, dict]] = None
         local_path, is_temp = self._materialise(self.schema_path)
         try:
+            self.fingerprint = _file_sha256(local_path)
             self._resolver = ResolveSchema(local_path)
             self._resolver.resolve_schema()
         except SchemaError:
@@ -161,7 +176,7 @@ class SchemaBundle:
         return sorted(names)
 
     def has_node(self, node: str) -> bool:
-        return self._strip_yaml(node) in set(self.node_names)
+        return self._strip_yaml(node) in self._resolved_by_id()
 
     @property
     def schema_version(self) -> Optional[str]:
@@ -231,12 +246,28 @@ class SchemaBundle:
             raise UnknownCategoryError(category, counts)
         return list(grouped[matches[0]])
 
+    def _resolved_by_id(self) -> Dict[str, dict]:
+        """Build (once) the node id -> resolved schema map.
+
+        The resolver only offers a linear search per lookup, which turns every
+        pass over a large dictionary's nodes quadratic. First match wins, as it
+        does in ``ResolveSchema.return_resolved_schema``.
+        """
+        if self._resolved_index is None:
+            index: Dict[str, dict] = {}
+            for node in self._resolver.schema_list_resolved:
+                node_id = node.get("id")
+                if node_id:
+                    index.setdefault(self._strip_yaml(node_id), node)
+            self._resolved_index = index
+        return self._resolved_index
+
     def resolved(self, node: str) -> dict:
         """Return the fully ref-resolved schema for one node.
 
         :raises SchemaError: if the node is not in the schema.
         """
-        result = self._resolver.return_resolved_schema(node)
+        result = self._resolved_by_id().get(self._strip_yaml(node))
         if result is None:
             raise SchemaError(f"Node '{node}' not found in schema.")
         return result
@@ -0,0 +1,192 @@
+"""Read per-node records from JSON, JSONL, CSV and TSV files.
+
+These are the shapes metadata usually arrives in outside a workbook: a Gen3
+export (one TSV per node, with a ``type`` column), a JSON list of records, or a
+JSON-lines stream. :class:`RecordFiles` finds out which nodes a set of files
+holds, then hands out each node's records lazily — files are re-read per node
+rather than held in memory, so hundreds of thousands of rows stream through
+with flat memory use.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, TypeVar, Union
+
+from gen3_metadata_templates.errors import RecordSourceError
+
+FORMATS = ("json", "jsonl", "csv", "tsv")
+
+_SUFFIXES = {
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".txt": "tsv",
+}
+
+# Gen3 exports can carry long free-text cells; the csv module's default cap
+# (128 KiB) is lower than Excel's own per-cell limit.
+_CSV_FIELD_LIMIT = 2**31 - 1
+_csv_limit_lock = threading.Lock()
+
+_Row = TypeVar("_Row")
+
+
+def long_csv_rows(reader: Iterator[_Row]) -> Iterator[_Row]:
+    """The rows of a csv reader, each parsed with the field size cap lifted.
+
+    The cap is process-wide, so it is raised only for the ``next()`` that
+    parses a row and put back before the row is yielded: a suspended or
+    interleaved stream never leaves it raised.
+    """
+    while True:
+        with _csv_limit_lock:
+            previous = csv.field_size_limit(_CSV_FIELD_LIMIT)
+            try:
+                row = next(reader, None)
+            finally:
+                csv.field_size_limit(previous)
+        if row is None:
+            return
+        yield row
+
+
+def detect_format(path: Union[str, Path]) -> str:
+    """The format of a records file, from its extension.
+
+    :raises RecordSourceError: for an extension that isn't recognised.
+    """
+    fmt = _SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise RecordSourceError(
+            f"Can't tell what format '{path}' is. Use a .json, .jsonl, .csv or .tsv file."
+        )
+    return fmt
+
+
+def iter_records(path: Union[str, Path], fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Every record in ``path``, each with its node in ``type``.
+
+    CSV/TSV values are strings; an empty cell is left out of the record. A
+    CSV/TSV file without a ``type`` column is taken to hold the node its file
+    is named after (``subject.tsv`` holds ``subject`` records), as in a Gen3
+    export. A JSON file may be a list of records or a ``{node: [records]}``
+    mapping; it is read whole, so prefer JSONL for very large inputs.
+
+    :raises RecordSourceError: for unreadable data or a record with no node.
+    """
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    if fmt in ("csv", "tsv"):
+        yield from _iter_delimited(path, "\t" if fmt == "tsv" else ",")
+    elif fmt == "jsonl":
+        yield from _iter_jsonl(path)
+    elif fmt == "json":
+        yield from _iter_json(path)
+    else:
+        raise RecordSourceError(f"Unknown records format '{fmt}'; expected one of {FORMATS}.")
+
+
+def _iter_delimited(path: Path, delimiter: str) -> Iterator[Dict[str, Any]]:
+    default_type = path.stem
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        for row in long_csv_rows(csv.DictReader(handle, delimiter=delimiter)):
+            record = {k: v for k, v in row.items() if k is not None and v not in (None, "")}
+            record.setdefault("type", default_type)
+            yield record
+
+
+def _iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise RecordSourceError(
+                    f"{path}, line {line_no}: not valid JSON ({exc})."
+                ) from None
+            yield _checked(record, f"{path}, line {line_no}")
+
+
+def _iter_json(path: Path) -> Iterator[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as exc:
+        raise RecordSourceError(f"{path}: not valid JSON ({exc}).") from None
+    if isinstance(data, dict):
+        for node, records in data.items():
+            for i, record in enumerate(records or []):
+                if isinstance(record, dict):
+                    record = {**record, "type": record.get("type", node)}
+                yield _checked(record, f"{path}, {node}[{i}]")
+    elif isinstance(data, list):
+        for i, record in enumerate(data):
+            yield _checked(record, f"{path}, record {i}")
+    else:
+        raise RecordSourceError(f"{path}: expected a list of records or a {{node: [records]}} map.")
+
+
+def _checked(record: Any, where: str) -> Dict[str, Any]:
+    if not isinstance(record, dict):
+        raise RecordSourceError(f"{where}: expected a JSON object, got {type(record).__name__}.")
+    if not record.get("type"):
+        raise RecordSourceError(f"{where}: the record has no 'type', so its node is unknown.")
+    return record
+
+
+class RecordFiles:
+    """A set of records files, served node by node.
+
+    ``nodes`` lists every node the files hold, in the order first seen. Finding
+    them means one pass over files that carry a ``type`` per record; files
+    whose node comes from the file name are not read at all until needed.
+    """
+
+    def __init__(self, paths: Sequence[Union[str, Path]]):
+        self.paths: List[Path] = [Path(p) for p in paths]
+        self._nodes_by_path: Dict[Path, List[str]] = {p: self._scan(p) for p in self.paths}
+
+    @property
+    def nodes(self) -> List[str]:
+        seen: Dict[str, None] = {}
+        for nodes in self._nodes_by_path.values():
+            seen.update(dict.fromkeys(nodes))
+        return list(seen)
+
+    def nodes_in(self, path: Union[str, Path]) -> List[str]:
+        """The nodes one of the files holds, in the order first seen."""
+        return list(self._nodes_by_path[Path(path)])
+
+    def records(self, node: str) -> Iterator[Dict[str, Any]]:
+        """Lazily yield ``node``'s records from every file that has any, in file order."""
+        for path, nodes in self._nodes_by_path.items():
+            if node not in nodes:
+                continue
+            if len(nodes) == 1:
+                yield from iter_records(path)
+            else:
+                yield from (r for r in iter_records(path) if r["type"] == node)
+
+    def by_node(self, nodes: Sequence[str]) -> Mapping[str, Iterator[Dict[str, Any]]]:
+        """``{node: records(node)}`` — lazy, so nothing is read until iterated."""
+        return {node: self.records(node) for node in nodes}
+
+    @staticmethod
+    def _scan(path: Path) -> List[str]:
+        fmt = detect_format(path)
+        if not path.is_file():
+            raise RecordSourceError(f"Records file '{path}' does not exist.")
+        if fmt in ("csv", "tsv"):
+            with open(path, newline="", encoding="utf-8-sig") as handle:
+                reader = csv.reader(handle, delimiter="\t" if fmt == "tsv" else ",")
+                header = next(long_csv_rows(reader), [])
+            if "type" not in header:
+                return [path.stem]
+        return list(dict.fromkeys(r["type"] for r in iter_records(path, fmt)))
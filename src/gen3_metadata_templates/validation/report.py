@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
-from gen3_metadata_templates.workbook.reader import CellRef
+from gen3_metadata_templates.workbook.reader import CellRef, LineRef
 
 
 @dataclass(frozen=True)
@@ -23,7 +23,7 @@ class Finding:
     @property
     def location(self) -> str:
         if self.cell is not None:
-            return f"{self.sheet}!{self.cell.a1}"
+            return self.cell.location
         return self.sheet
 
 
@@ -50,7 +50,7 @@ def to_json(report: ValidationReport) -> dict:
             {
                 "node": f.node,
                 "sheet": f.sheet,
-                "cell": f.cell.a1 if f.cell else None,
+                "cell": f.cell.label if f.cell else None,
                 "location": f.location,
                 "header": f.header,
                 "validator": f.validator,
@@ -103,7 +103,7 @@ def render_console(report: ValidationReport, console, verbose: bool = False) ->
         if verbose:
             table.add_column("Detail", style="dim")
         for finding in findings:
-            cell = finding.cell.a1 if finding.cell else "-"
+            cell = finding.cell.label if finding.cell else "-"
             row = [cell, finding.header or "-", finding.message]
             if verbose:
                 row.append(finding.raw_message)
@@ -113,7 +113,7 @@ def render_console(report: ValidationReport, console, verbose: bool = False) ->
     for warning in report.warnings:
         console.print(f"[yellow]![/] {warning}")
 
-    if not report.ok:
+    if not report.ok and not any(isinstance(f.cell, LineRef) for f in report.findings):
         console.print(
             "\n[dim]Tip: re-run with --annotate fixed.xlsx to get a copy with the "
             "problem cells highlighted.[/]"
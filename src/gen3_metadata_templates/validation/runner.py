@@ -1,65 +1,241 @@
-"""Orchestrate validation of a filled workbook.
+"""Orchestrate validation of a filled workbook (or a set of text exports).
 
 Pulls the pieces together: load the schema, recover (or resolve) the node path,
-parse the workbook, then run gen3_validator's per-object schema checks and
-cross-node link checks, plus a duplicate-key check. Every raw error is mapped
+stream the workbook's records, and run gen3_validator's per-object schema
+checks and cross-node link checks on them, plus a duplicate-key check. Every raw error is mapped
 back to the cell it came from and rephrased for a non-developer.
 """
 
 from __future__ import annotations
 
+import itertools
 import json
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Union
+from typing import IO, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from gen3_validator.bulk import build_identifier_index, extract_links, validate_record_links
-from gen3_validator.validate import validate_list_dict
+from gen3_validator.bulk import IDENTIFIER_KEYS, extract_links, validate_record_links
+from gen3_validator.validate import Draft4Validator, validate_object
 
+from gen3_metadata_templates.cache import SpecCache, default_spec_cache
 from gen3_metadata_templates.constants import (
     DEFAULT_EXCLUDED_COLUMNS,
     DEFAULT_EXCLUDED_NODES,
+    PARALLEL_VALIDATE_CHUNK,
     PRIMARY_KEY,
+    STAGING_MEMORY,
+    STAGING_SQLITE,
+    STAGINGS,
 )
-from gen3_metadata_templates.model import NodeTemplate, build_spec_for_nodes
+from gen3_metadata_templates.errors import RecordSourceError
+from gen3_metadata_templates.model import NodeTemplate, TemplateSpec, build_spec_for_nodes
 from gen3_metadata_templates.paths import Chooser, enumerate_paths, resolve_path
 from gen3_metadata_templates.schema import SchemaBundle
+from gen3_metadata_templates.selection import layered_topological_order
 from gen3_metadata_templates.validation.messages import friendly_message
 from gen3_metadata_templates.validation.report import Finding, ValidationReport
-from gen3_metadata_templates.workbook.reader import ParsedWorkbook, read_meta, read_workbook
+from gen3_metadata_templates.validation.staging import SqliteStage
+from gen3_metadata_templates.workbook.columnar import ColumnarSheet, pack_records
+from gen3_metadata_templates.workbook.embed import unpack_spec
+from gen3_metadata_templates.workbook.exports import ExportFiles
+from gen3_metadata_templates.workbook.handle import WorkbookHandle, open_workbook
+from gen3_metadata_templates.workbook.reader import ParsedWorkbook, data_start_row
+
+# Records read ahead through the embedded spec while the schema resolves; past
+# this, the read waits for the schema rather than holding more.
+_MAX_READ_AHEAD = 10_000
 
 
 def validate_workbook(
-    workbook_path: Union[str, Path],
+    workbook: Union[str, Path, WorkbookHandle],
     schema_path: Union[str, Path],
     *,
     path_arg: Optional[str] = None,
     chooser: Optional[Chooser] = None,
     excluded_nodes: Sequence[str] = DEFAULT_EXCLUDED_NODES,
     excluded_columns: Sequence[str] = DEFAULT_EXCLUDED_COLUMNS,
+    spec_cache: Optional[SpecCache] = None,
+    staging: str = STAGING_MEMORY,
+    staging_dir: Optional[Union[str, Path]] = None,
+    workers: int = 1,
+) -> ValidationReport:
+    """Validate ``workbook`` against ``schema_path`` and return a report.
+
+    Records are checked as they are read, so a workbook's records are never
+    all in memory at once; what is kept is what the checks need across
+    sheets: one index of the identifiers of every node some sheet links to,
+    built as the records go by, and the link values of records whose targets
+    haven't been read yet.
+
+    :param workbook: a path, or an open :class:`WorkbookHandle` to read from
+        (and leave open, e.g. for :func:`write_annotated_copy` to reuse).
+    :param spec_cache: where to look up the workbook's spec before deriving it
+        from the schema. Defaults to a shared in-memory cache, so validating
+        many workbooks made from the same template derives its columns once.
+    :param staging: where that cross-sheet state is kept: ``"memory"``, or
+        ``"sqlite"`` to stage it in a temporary SQLite file (in
+        ``staging_dir``, if given) and run the link and duplicate checks as
+        queries, so memory use doesn't grow with the workbook.
+    :param workers: processes to spread the schema checks over. The default,
+        1, checks everything in this process; with more, a sheet's records are
+        sent to them in runs of ``PARALLEL_VALIDATE_CHUNK``, packed as columns,
+        and a workbook with no sheet that long is still checked here. Link
+        and duplicate checks always run here. The report is the same either way.
+    :raises ValueError: for an unknown ``staging``.
+    """
+    _check_staging(staging)
+    with open_workbook(workbook) as handle:
+        meta = handle.meta()
+        bundle, early = _load_schema_and_stream(handle, schema_path, meta)
+
+        layout = _recover_layout(bundle, meta, path_arg, chooser, excluded_nodes)
+        spec = build_spec_for_nodes(
+            bundle,
+            layout.nodes,
+            target_nodes=layout.target_nodes,
+            paths=layout.paths,
+            excluded_columns=excluded_columns,
+            cache=spec_cache if spec_cache is not None else default_spec_cache(),
+        )
+        parsed, records = _reuse_or_restream(handle, spec, early, meta)
+
+        excluded_set = set(excluded_nodes)
+        with _record_checks(
+            staging, staging_dir, workers, bundle, spec, parsed, excluded_set
+        ) as checks:
+            for node, index, record, _coords in records:
+                checks.check(node, index, record)
+
+            report = ValidationReport(warnings=list(parsed.warnings))
+            _check_schema_version(meta, bundle, report)
+            for node_template in spec.nodes:
+                checks.finish_node(node_template, report)
+    return report
+
+
+def validate_export(
+    paths: Sequence[Union[str, Path]],
+    schema_path: Union[str, Path],
+    *,
+    excluded_columns: Sequence[str] = DEFAULT_EXCLUDED_COLUMNS,
+    spec_cache: Optional[SpecCache] = None,
+    stdin: Optional[IO[bytes]] = None,
+    staging: str = STAGING_MEMORY,
+    staging_dir: Optional[Union[str, Path]] = None,
+    workers: int = 1,
 ) -> ValidationReport:
-    """Validate ``workbook_path`` against ``schema_path`` and return a report."""
+    """Validate TSV, CSV or JSON-lines exports against ``schema_path``.
+
+    The nodes are the ones the files hold (a ``type`` column, or a TSV named
+    after its node), checked parents-first with the same checks as a
+    workbook's sheets; a finding points at a file and line rather than a
+    cell. Nodes the schema doesn't have are warned about and skipped.
+
+    :param paths: the files, each holding one or more nodes' records;
+        ``"-"`` reads standard input (``stdin``, if given), whose format is
+        worked out from what it starts with.
+    :param staging: as for :func:`validate_workbook`.
+    :param workers: as for :func:`validate_workbook`.
+    :raises RecordSourceError: if no file holds a node the schema has.
+    """
+    _check_staging(staging)
     bundle = SchemaBundle(schema_path)
-    meta = read_meta(workbook_path)
+    with ExportFiles(paths, stdin=stdin) as exports:
+        known = [node for node in exports.nodes if bundle.has_node(node)]
+        warnings = [
+            f"Node '{node}' is not in the schema — its records were not checked."
+            for node in exports.nodes
+            if node not in known
+        ]
+        if not known:
+            raise RecordSourceError(
+                f"None of the nodes in the files ({', '.join(exports.nodes) or 'none'}) "
+                "are in the schema."
+            )
+        ordered, depth = layered_topological_order(known, bundle.edges())
+        spec = build_spec_for_nodes(
+            bundle,
+            ordered,
+            target_nodes=ordered,
+            depth=depth,
+            excluded_columns=excluded_columns,
+            cache=spec_cache if spec_cache is not None else default_spec_cache(),
+        )
+        parsed = ParsedWorkbook()
+        # An export has no deliberately dropped columns: every link is checked.
+        with _record_checks(staging, staging_dir, workers, bundle, spec, parsed, set()) as checks:
+            for node, index, record, _coords in exports.iter_records(spec, parsed=parsed):
+                checks.check(node, index, record)
+
+            report = ValidationReport(warnings=[*warnings, *parsed.warnings])
+            for node_template in spec.nodes:
+                checks.finish_node(node_template, report)
+        # Group findings by the file they're in, where a workbook has a sheet.
+        report.findings = [
+            replace(finding, sheet=exports.file_name(finding.node) or finding.sheet)
+            for finding in report.findings
+        ]
+    return report
 
-    layout = _recover_layout(bundle, meta, path_arg, chooser, excluded_nodes)
-    spec = build_spec_for_nodes(
-        bundle,
-        layout.nodes,
-        target_nodes=layout.target_nodes,
-        paths=layout.paths,
-        excluded_columns=excluded_columns,
-    )
-    parsed = read_workbook(workbook_path, spec)
 
-    report = ValidationReport(warnings=list(parsed.warnings))
-    _check_schema_version(meta, bundle, report)
-    excluded_set = set(excluded_nodes)
+@dataclass
+class _EarlyRead:
+    """Records already streaming through the embedded spec while the schema resolved."""
 
-    for node_template in spec.nodes:
-        _validate_node(bundle, node_template, spec, parsed, report, excluded_set)
+    spec: TemplateSpec
+    parsed: ParsedWorkbook
+    read_ahead: List[tuple]
+    rest: Iterator[tuple]
 
-    return report
+
+def _load_schema_and_stream(workbook: WorkbookHandle, schema_path, meta):
+    """Resolve the schema, reading the workbook alongside it when possible.
+
+    A workbook that embeds the spec it was written from can be read without the
+    schema, so its records start streaming while the schema resolves in a
+    worker thread, and up to ``_MAX_READ_AHEAD`` of them are held until it has.
+    The early read is only provisional: :func:`_reuse_or_restream` carries on
+    with it solely if the spec rebuilt from the schema lays out the same columns.
+
+    :returns: ``(bundle, _EarlyRead or None)``.
+    """
+    embedded = unpack_spec(meta)
+    if embedded is None:
+        return SchemaBundle(schema_path), None
+    parsed = ParsedWorkbook()
+    records = workbook.iter_records(embedded, first_data_row=data_start_row(meta), parsed=parsed)
+    read_ahead = []
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(SchemaBundle, schema_path)
+        for item in records:
+            read_ahead.append(item)
+            if pending.done() or len(read_ahead) >= _MAX_READ_AHEAD:
+                break
+        bundle = pending.result()
+    return bundle, _EarlyRead(embedded, parsed, read_ahead, records)
+
+
+def _reuse_or_restream(
+    workbook: WorkbookHandle, spec: TemplateSpec, early: Optional[_EarlyRead], meta
+) -> Tuple[ParsedWorkbook, Iterator[tuple]]:
+    """The early read if its spec maps the same columns as ``spec``, else a fresh one.
+
+    The layouts differ when the schema has changed since the template was made,
+    or validation was asked to exclude different columns — the records must then
+    be read through the current spec, exactly as if nothing had been embedded.
+
+    :returns: ``(parsed, records)``: where the read records sheet-level
+        results, and the stream of records to check.
+    """
+    if early is not None:
+        if early.spec.nodes == spec.nodes:
+            return early.parsed, itertools.chain(early.read_ahead, early.rest)
+        early.rest.close()
+    parsed = ParsedWorkbook()
+    records = workbook.iter_records(spec, first_data_row=data_start_row(meta), parsed=parsed)
+    return parsed, records
 
 
 def _check_schema_version(meta, bundle, report) -> None:
@@ -194,26 +370,335 @@ def _validation_schema(
     return trimmed
 
 
-def _validate_node(bundle, node_template, spec, parsed, report, excluded_set) -> None:
-    node = node_template.node
-    records = parsed.records.get(node, [])
-    findings_before = len(report.findings)
+@dataclass
+class _NodeChecks:
+    """The findings for one node's records so far, and what its later checks need."""
+
+    node_template: NodeTemplate
+    validator: Draft4Validator  # for the node's trimmed schema
+    links: List[dict]  # on-path links, from extract_links
+    links_ready: bool  # every link target has been read
+    count: int = 0
+    schema_findings: List[Finding] = field(default_factory=list)
+    link_findings: List[Finding] = field(default_factory=list)
+    duplicate_findings: List[Finding] = field(default_factory=list)
+    # (record index, its link properties) to check once every target is read
+    deferred_links: List[Tuple[int, dict]] = field(default_factory=list)
+    warned: set = field(default_factory=set)
+    seen: dict = field(default_factory=dict)  # submitter_id -> index of its first record
+    # Records waiting to be schema-checked in a pool process, from number queued_from on
+    queued: List[dict] = field(default_factory=list)
+    queued_from: int = 0
+    schema_text: Optional[str] = None  # the trimmed schema, as pool processes get it
+
+
+class _RecordChecks:
+    """Run the per-record checks on records as they stream past, sheet by sheet.
+
+    Schema and duplicate-key checks only need the record in hand. Link checks
+    need every identifier of the target node, so the identifiers are indexed
+    as records go by; a record's links are checked straight away when all
+    their targets are on earlier sheets (parents come first in a template),
+    and otherwise kept until the end.
+
+    With more than one worker, schema checks are queued instead, and a run of
+    ``PARALLEL_VALIDATE_CHUNK`` records of one node is sent, as a
+    :class:`ColumnarSheet`, to a process pool started for the first such run.
+    The errors come back in the order the runs went out, so findings are
+    reported in the same order as when every record is checked here.
+    """
+
+    def __init__(
+        self,
+        bundle,
+        spec: TemplateSpec,
+        parsed: ParsedWorkbook,
+        excluded_set: set,
+        workers: int = 1,
+    ):
+        self.bundle = bundle
+        self.spec = spec
+        self.parsed = parsed
+        self.excluded_set = excluded_set
+        self.on_path = {nt.node for nt in spec.nodes}
+        # One identifier index for the whole run, kept only for the nodes
+        # some sheet links to: nothing looks up a leaf's identifiers.
+        targets = {
+            link["target_type"]
+            for nt in spec.nodes
+            for link in extract_links(bundle.resolved(nt.node))
+        }
+        self.index: Dict[str, dict] = {node: {} for node in self.on_path & targets}
+        # Records arrive in sheet order, so by a node's first record every
+        # sheet before it has been read to the end.
+        self.position = {nt.node: i for i, nt in enumerate(spec.nodes)}
+        self.nodes: Dict[str, _NodeChecks] = {}
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # (node, future of its schema errors) per run sent to the pool, oldest first
+        self._in_flight: Deque[Tuple[_NodeChecks, Future]] = deque()
+
+    def __enter__(self) -> "_RecordChecks":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release what the checks were keeping between records, and the pool."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def check(self, node: str, index: int, record: dict) -> None:
+        checks = self.nodes.get(node) or self._start_node(node)
+        checks.count += 1
+        node_template = checks.node_template
+
+        if self.workers > 1:
+            self._queue_schema_check(checks, index, record)
+        else:
+            for error in validate_object(record, index, checks.validator):
+                checks.schema_findings.append(_to_finding(error, node_template, self.parsed))
+
+        self._add_identifiers(checks, index, record)
+
+        if checks.links:
+            linked = {
+                link["name"]: record[link["name"]]
+                for link in checks.links
+                if link["name"] in record
+            }
+            if linked:
+                self._add_links(checks, index, linked)
+
+        self._check_duplicate(checks, index, record)
+
+    def finish_node(self, node_template: NodeTemplate, report: ValidationReport) -> None:
+        """Add one node's findings to ``report``, once every record has been checked."""
+        node = node_template.node
+        checks = self.nodes.get(node) or self._start_node(node)
+        findings_before = len(report.findings)
+
+        # 1. Missing required columns -> one sheet-level finding each.
+        _report_missing_required_columns(node_template, self.parsed, report)
+        # 2. Per-object schema validation.
+        self._finish_schema_checks()
+        report.findings.extend(checks.schema_findings)
+        # 3. Cross-node referential integrity (link targets exist).
+        self._finish_links(checks)
+        report.findings.extend(checks.link_findings)
+        for _, _name, target in checks.warned:
+            report.warnings.append(
+                f"Node '{node}' links to '{target}', which has no rows to check against."
+            )
+        # 4. Duplicate submitter_id within the sheet.
+        self._finish_duplicates(checks)
+        report.findings.extend(checks.duplicate_findings)
+
+        report.node_counts[node] = (checks.count, len(report.findings) - findings_before)
+
+    def _start_node(self, node: str) -> _NodeChecks:
+        # A new sheet: the ones before it have no more records to queue.
+        for other in self.nodes.values():
+            self._send_queued(other)
+        node_template = self.spec.node_template(node)
+        schema = _validation_schema(self.bundle, node_template, self.parsed, self.excluded_set)
+        # Only check links whose parent sheet is part of this template.
+        links = [
+            link
+            for link in extract_links(self.bundle.resolved(node))
+            if link["target_type"] in self.on_path
+        ]
+        position = self.position[node]
+        ready = all(self.position[link["target_type"]] < position for link in links)
+        # validate_list_dict builds this validator afresh for every record.
+        validator = Draft4Validator(schema)
+        checks = self.nodes[node] = _NodeChecks(node_template, validator, links, ready)
+        return checks
+
+    def _queue_schema_check(self, checks: _NodeChecks, index: int, record: dict) -> None:
+        if not checks.queued:
+            checks.queued_from = index
+        checks.queued.append(record)
+        if len(checks.queued) >= PARALLEL_VALIDATE_CHUNK:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self._send_queued(checks)
+
+    def _send_queued(self, checks: _NodeChecks) -> None:
+        """Send a node's queued records to the pool; check them here if there isn't one."""
+        if not checks.queued:
+            return
+        records, start = checks.queued, checks.queued_from
+        checks.queued = []
+        if self._pool is None:
+            for offset, record in enumerate(records):
+                for error in validate_object(record, start + offset, checks.validator):
+                    checks.schema_findings.append(
+                        _to_finding(error, checks.node_template, self.parsed)
+                    )
+            return
+        node_template = checks.node_template
+        if checks.schema_text is None:
+            checks.schema_text = json.dumps(checks.validator.schema)
+        sheet = pack_records(node_template, self.parsed._coords[node_template.node], records, start)
+        future = self._pool.submit(_schema_errors_in_worker, (checks.schema_text, sheet, start))
+        self._in_flight.append((checks, future))
+        # A couple of runs per process keeps them busy without the reader
+        # queueing up the whole workbook ahead of them.
+        while len(self._in_flight) > 2 * self.workers:
+            self._collect_oldest()
+
+    def _collect_oldest(self) -> None:
+        checks, future = self._in_flight.popleft()
+        for error in future.result():
+            checks.schema_findings.append(_to_finding(error, checks.node_template, self.parsed))
+
+    def _finish_schema_checks(self) -> None:
+        for checks in self.nodes.values():
+            self._send_queued(checks)
+        while self._in_flight:
+            self._collect_oldest()
+
+    def _add_identifiers(self, checks: _NodeChecks, index: int, record: dict) -> None:
+        identifiers = self.index.get(checks.node_template.node)
+        if identifiers is None:
+            return
+        for key in IDENTIFIER_KEYS:
+            value = record.get(key)
+            if value is not None:
+                identifiers.setdefault(key, set()).add(value)
+
+    def _add_links(self, checks: _NodeChecks, index: int, linked: dict) -> None:
+        if checks.links_ready:
+            self._check_links(checks, index, linked)
+        else:
+            checks.deferred_links.append((index, linked))
+
+    def _finish_links(self, checks: _NodeChecks) -> None:
+        for index, linked in checks.deferred_links:
+            self._check_links(checks, index, linked)
+
+    def _check_links(self, checks: _NodeChecks, index: int, linked: dict) -> None:
+        node_template = checks.node_template
+        for error in validate_record_links(
+            linked, index, node_template.node, checks.links, self.index, checks.warned
+        ):
+            checks.link_findings.append(_to_finding(error, node_template, self.parsed))
+
+    def _check_duplicate(self, checks: _NodeChecks, index: int, record: dict) -> None:
+        """submitter_id must be unique within a sheet; neither engine call catches this."""
+        key = record.get(PRIMARY_KEY)
+        if key is None:
+            return
+        if key in checks.seen:
+            checks.duplicate_findings.append(
+                self._duplicate_finding(checks, index, key, checks.seen[key])
+            )
+        else:
+            checks.seen[key] = index
+
+    def _finish_duplicates(self, checks: _NodeChecks) -> None:
+        """Nothing left to do: in memory, duplicates are found as records arrive."""
+
+    def _duplicate_finding(self, checks: _NodeChecks, index: int, key, first: int) -> Finding:
+        node_template = checks.node_template
+        node = node_template.node
+        first_cell = self.parsed.coord(node, first, PRIMARY_KEY)
+        where = first_cell.row_label if first_cell else f"row {first + 1}"
+        return Finding(
+            node=node,
+            sheet=node_template.sheet_name,
+            message=(
+                f"Duplicate submitter_id '{key}' — it was already used on {where}. "
+                "Each row needs a unique submitter_id."
+            ),
+            raw_message=f"duplicate submitter_id '{key}'",
+            validator="duplicate",
+            cell=self.parsed.coord(node, index, PRIMARY_KEY),
+            header=PRIMARY_KEY,
+        )
+
+
+class _StagedRecordChecks(_RecordChecks):
+    """:class:`_RecordChecks` that keep identifiers and link references in SQLite.
+
+    Records are still schema-checked as they stream past, but nothing about
+    them is held in memory for later: their identifiers and link references
+    go to a :class:`SqliteStage`, and both link and duplicate-key checks run
+    as queries once every record is in. Only records with a reference that
+    matched nothing are looked at again, to report each failing reference.
+    """
+
+    def __init__(
+        self,
+        bundle,
+        spec: TemplateSpec,
+        parsed: ParsedWorkbook,
+        excluded_set: set,
+        workers: int = 1,
+        directory: Optional[Union[str, Path]] = None,
+    ):
+        super().__init__(bundle, spec, parsed, excluded_set, workers)
+        self.stage = SqliteStage([nt.node for nt in spec.nodes], directory=directory)
+        self.index = self.stage.index
+
+    def close(self) -> None:
+        super().close()
+        self.stage.close()
+
+    def _add_identifiers(self, checks: _NodeChecks, index: int, record: dict) -> None:
+        self.stage.add_identifiers(checks.node_template.node, index, record)
 
-    # 1. Missing required columns -> one sheet-level finding each.
-    _report_missing_required_columns(node_template, parsed, report)
+    def _add_links(self, checks: _NodeChecks, index: int, linked: dict) -> None:
+        self.stage.add_links(checks.node_template.node, index, linked, checks.links)
 
-    # 2. Per-object schema validation.
-    schema = _validation_schema(bundle, node_template, parsed, excluded_set)
-    for error in validate_list_dict(records, {node: schema}):
-        report.findings.append(_to_finding(error, node_template, parsed))
+    def _finish_links(self, checks: _NodeChecks) -> None:
+        for index, linked in self.stage.unresolved(checks.node_template.node, checks.links):
+            self._check_links(checks, index, linked)
 
-    # 3. Cross-node referential integrity (link targets exist).
-    _validate_links(bundle, node_template, spec, parsed, report, excluded_set)
+    def _check_duplicate(self, checks: _NodeChecks, index: int, record: dict) -> None:
+        """Left to :meth:`_finish_duplicates`, which asks the stage."""
 
-    # 4. Duplicate submitter_id within the sheet.
-    _report_duplicate_keys(node_template, parsed, report)
+    def _finish_duplicates(self, checks: _NodeChecks) -> None:
+        for index, key, first in self.stage.duplicates(checks.node_template.node):
+            checks.duplicate_findings.append(self._duplicate_finding(checks, index, key, first))
 
-    report.node_counts[node] = (len(records), len(report.findings) - findings_before)
+
+def _record_checks(
+    staging: str,
+    staging_dir: Optional[Union[str, Path]],
+    workers: int,
+    bundle,
+    spec: TemplateSpec,
+    parsed: ParsedWorkbook,
+    excluded_set: set,
+) -> _RecordChecks:
+    if staging == STAGING_SQLITE:
+        return _StagedRecordChecks(bundle, spec, parsed, excluded_set, workers, staging_dir)
+    return _RecordChecks(bundle, spec, parsed, excluded_set, workers)
+
+
+def _check_staging(staging: str) -> None:
+    if staging not in STAGINGS:
+        raise ValueError(f"Unknown staging '{staging}'; expected one of: {', '.join(STAGINGS)}.")
+
+
+# Each pool process builds a node's validator once, on its first run of records.
+_worker_validators: Dict[str, Draft4Validator] = {}
+
+
+def _schema_errors_in_worker(task: Tuple[str, ColumnarSheet, int]) -> List[dict]:
+    """validate_object's errors for a run of records: ``(schema JSON, sheet, first index)``."""
+    schema_text, sheet, start = task
+    validator = _worker_validators.get(schema_text)
+    if validator is None:
+        validator = _worker_validators[schema_text] = Draft4Validator(json.loads(schema_text))
+    errors = []
+    for offset, record in enumerate(sheet.records()):
+        errors.extend(validate_object(record, start + offset, validator))
+    return errors
 
 
 def _report_missing_required_columns(node_template, parsed, report) -> None:
@@ -240,62 +725,6 @@ def _report_missing_required_columns(node_template, parsed, report) -> None:
             )
 
 
-def _validate_links(bundle, node_template, spec, parsed, report, excluded_set) -> None:
-    node = node_template.node
-    records = parsed.records.get(node, [])
-    if not records:
-        return
-
-    # Only check links whose parent sheet is part of this template.
-    on_path_targets = {nt.node for nt in spec.nodes}
-    links = [
-        link
-        for link in extract_links(bundle.resolved(node))
-        if link["target_type"] in on_path_targets
-    ]
-    if not links:
-        return
-
-    index = build_identifier_index(parsed.records)
-    warned: set = set()
-    for idx, record in enumerate(records):
-        for error in validate_record_links(record, idx, node, links, index, warned):
-            report.findings.append(_to_finding(error, node_template, parsed))
-
-    for _, _name, target in warned:
-        report.warnings.append(
-            f"Node '{node}' links to '{target}', which has no rows to check against."
-        )
-
-
-def _report_duplicate_keys(node_template, parsed, report) -> None:
-    """submitter_id must be unique within a sheet; neither engine call catches this."""
-    node = node_template.node
-    seen: dict = {}
-    for idx, record in enumerate(parsed.records.get(node, [])):
-        key = record.get(PRIMARY_KEY)
-        if key is None:
-            continue
-        if key in seen:
-            report.findings.append(
-                Finding(
-                    node=node,
-                    sheet=node_template.sheet_name,
-                    message=(
-                        f"Duplicate submitter_id '{key}' — it was already used on row "
-                        f"{seen[key]}. Each row needs a unique submitter_id."
-                    ),
-                    raw_message=f"duplicate submitter_id '{key}'",
-                    validator="duplicate",
-                    cell=parsed.coord(node, idx, PRIMARY_KEY),
-                    header=PRIMARY_KEY,
-                )
-            )
-        else:
-            excel_row = parsed.coord(node, idx, PRIMARY_KEY)
-            seen[key] = excel_row.row if excel_row else idx + 1
-
-
 def _to_finding(error: dict, node_template: NodeTemplate, parsed: ParsedWorkbook) -> Finding:
     node = error["node"]
     index = error.get("index")
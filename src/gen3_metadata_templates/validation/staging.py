@@ -0,0 +1,234 @@
+"""Keep what validation needs across records in a SQLite file instead of memory.
+
+Link and duplicate-key checks compare records with each other, so validation
+remembers every record's identifiers and every link reference until the
+sheets involved have been read. In memory that grows with the workbook. A
+:class:`SqliteStage` writes it to a temporary SQLite database as the records
+stream past — a table of identifiers per node, and one of link references —
+and answers both checks with indexed queries once everything has been read,
+so memory stays flat however many rows there are.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from gen3_validator.bulk import IDENTIFIER_KEYS
+
+from gen3_metadata_templates.constants import PRIMARY_KEY
+
+# Rows buffered before they are written in one statement.
+_BATCH_SIZE = 10_000
+_KEYS = ", ".join(IDENTIFIER_KEYS)
+
+
+class SqliteStage:
+    """Records' identifiers and link references, staged in a temporary SQLite file.
+
+    Add records with :meth:`add_identifiers` and :meth:`add_links`; once all
+    are in, :meth:`duplicates` and :meth:`unresolved` run the cross-record
+    checks, and :attr:`index` stands in for the identifier index
+    ``validate_record_links`` looks values up in. Close it (or use it as a
+    context manager) to delete the file.
+
+    :param nodes: the nodes whose records will be added.
+    :param directory: where to put the file; the system temporary directory
+        by default.
+    """
+
+    def __init__(self, nodes: Sequence[str], *, directory: Optional[Union[str, Path]] = None):
+        fd, name = tempfile.mkstemp(prefix="g3mt-", suffix=".sqlite", dir=directory)
+        os.close(fd)
+        self.path = Path(name)
+        self._db: Optional[sqlite3.Connection] = None
+        try:
+            self._db = sqlite3.connect(name)
+            # Scratch data, rebuilt on every run: no journal, no syncing to disk.
+            self._db.execute("PRAGMA journal_mode = OFF")
+            self._db.execute("PRAGMA synchronous = OFF")
+            self._tables = {node: f"node_{i}" for i, node in enumerate(nodes)}
+            for table in self._tables.values():
+                self._db.execute(f"CREATE TABLE {table} (idx INTEGER PRIMARY KEY, {_KEYS})")
+            # Row order is reference order: a record's references come back as given.
+            self._db.execute(f"CREATE TABLE refs (node, idx INTEGER, link, target, {_KEYS})")
+        except BaseException:
+            self.close()
+            raise
+        self._identifiers: Dict[str, List[tuple]] = {node: [] for node in nodes}
+        self._refs: List[tuple] = []
+        self._pending = 0
+        self._indexed = False
+        self.index = _StagedIndex(self)
+
+    def __enter__(self) -> "SqliteStage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        self.path.unlink(missing_ok=True)
+
+    def add_identifiers(self, node: str, index: int, record: dict) -> None:
+        """Stage the identifiers of ``node``'s record number ``index``."""
+        self._identifiers[node].append((index, *(_value(record.get(k)) for k in IDENTIFIER_KEYS)))
+        self._added()
+
+    def add_links(self, node: str, index: int, linked: dict, links: List[dict]) -> None:
+        """Stage a record's link references: ``linked`` maps link names to their values."""
+        for link in links:
+            name = link["name"]
+            for ref in _references(linked.get(name)):
+                keys = tuple(_value(ref.get(k)) for k in IDENTIFIER_KEYS)
+                # A reference with no identifier is left to schema validation.
+                if any(key is not None for key in keys):
+                    self._refs.append((node, index, name, link["target_type"], *keys))
+                    self._added()
+
+    def duplicates(self, node: str) -> Iterator[Tuple[int, Any, int]]:
+        """``(index, submitter_id, index of its first use)`` for each reuse, in record order."""
+        self._finish()
+        # A grouped join rather than a window function, which SQLite only has from 3.25.
+        table = self._tables[node]
+        yield from self._db.execute(
+            f"""
+            SELECT t.idx, t.{PRIMARY_KEY}, f.first FROM {table} AS t
+            JOIN (
+                SELECT {PRIMARY_KEY}, MIN(idx) AS first FROM {table}
+                WHERE {PRIMARY_KEY} IS NOT NULL
+                GROUP BY {PRIMARY_KEY}
+                HAVING COUNT(*) > 1
+            ) AS f ON t.{PRIMARY_KEY} = f.{PRIMARY_KEY}
+            WHERE t.idx != f.first
+            ORDER BY t.idx
+            """
+        )
+
+    def unresolved(self, node: str, links: List[dict]) -> Iterator[Tuple[int, dict]]:
+        """``(index, linked)`` for each record with a reference no target record matches.
+
+        ``linked`` is rebuilt from the staged references, as :meth:`add_links`
+        was given it, so the record's links can be checked (and reported) one
+        by one.
+        """
+        targets = sorted({link["target_type"] for link in links} & set(self._tables))
+        if not targets:
+            return
+        self._finish()
+        missing = " OR ".join(
+            f"(r.target = ? AND {_no_match(self._tables[target])})" for target in targets
+        )
+        rows = self._db.execute(
+            f"""
+            SELECT idx, link, {_KEYS} FROM refs
+            WHERE node = ? AND idx IN (
+                SELECT r.idx FROM refs AS r WHERE r.node = ? AND ({missing})
+            )
+            ORDER BY idx, rowid
+            """,
+            (node, node, *targets),
+        )
+        for index, refs in groupby(rows, key=lambda row: row[0]):
+            linked: Dict[str, List[dict]] = {}
+            for _index, name, *keys in refs:
+                ref = {k: v for k, v in zip(IDENTIFIER_KEYS, keys) if v is not None}
+                linked.setdefault(name, []).append(ref)
+            yield index, linked
+
+    def _added(self) -> None:
+        self._pending += 1
+        if self._pending >= _BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        keys = ", ".join("?" * len(IDENTIFIER_KEYS))
+        with self._db:
+            for node, rows in self._identifiers.items():
+                if rows:
+                    table = self._tables[node]
+                    self._db.executemany(f"INSERT INTO {table} VALUES (?, {keys})", rows)
+                    rows.clear()
+            if self._refs:
+                self._db.executemany(f"INSERT INTO refs VALUES (?, ?, ?, ?, {keys})", self._refs)
+                self._refs.clear()
+        self._pending = 0
+
+    def _finish(self) -> None:
+        """Write out what's buffered and index it, before the first query."""
+        if self._indexed:
+            return
+        self._flush()
+        with self._db:
+            for table in self._tables.values():
+                for key in IDENTIFIER_KEYS:
+                    self._db.execute(f"CREATE INDEX {table}_{key} ON {table} ({key})")
+            self._db.execute("CREATE INDEX refs_record ON refs (node, idx)")
+        self._indexed = True
+
+
+def _no_match(table: str) -> str:
+    """SQL true when reference ``r`` matches no record of ``table`` by any key it has."""
+    return " AND ".join(
+        f"NOT EXISTS (SELECT 1 FROM {table} AS t WHERE t.{key} = r.{key})"
+        for key in IDENTIFIER_KEYS
+    )
+
+
+class _StagedIndex:
+    """``{node: {key: values}}``, as ``validate_record_links`` reads it, answered by queries."""
+
+    def __init__(self, stage: SqliteStage):
+        self._stage = stage
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._stage._tables
+
+    def __getitem__(self, node: str) -> "_StagedKeys":
+        return _StagedKeys(self._stage, self._stage._tables[node])
+
+
+class _StagedKeys:
+    def __init__(self, stage: SqliteStage, table: str):
+        self._stage = stage
+        self._table = table
+
+    def get(self, key: str, default: Any = None) -> "_StagedValues":
+        return _StagedValues(self._stage, self._table, key)
+
+
+class _StagedValues:
+    def __init__(self, stage: SqliteStage, table: str, key: str):
+        self._stage = stage
+        self._table = table
+        self._key = key
+
+    def __contains__(self, value: object) -> bool:
+        self._stage._finish()
+        found = self._stage._db.execute(
+            f"SELECT 1 FROM {self._table} WHERE {self._key} = ? LIMIT 1", (_value(value),)
+        )
+        return found.fetchone() is not None
+
+
+def _references(value: Any) -> Iterator[dict]:
+    """The reference objects in a link value: one, or a list of them."""
+    if isinstance(value, dict):
+        yield value
+    elif isinstance(value, list):
+        yield from (item for item in value if isinstance(item, dict))
+
+
+def _value(value: Any) -> Any:
+    """``value`` as SQLite can store it; a list or object becomes its JSON text."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
@@ -11,31 +11,34 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Union
 
-import openpyxl
 from openpyxl.comments import Comment
 from openpyxl.styles import Font, PatternFill
 
 from gen3_metadata_templates.errors import G3mtError
 from gen3_metadata_templates.validation.report import ValidationReport
+from gen3_metadata_templates.workbook.handle import WorkbookHandle, open_workbook
 
 _BAD_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
 _SUMMARY_SHEET = "Validation Errors"
 
 
 def write_annotated_copy(
-    workbook_path: Union[str, Path],
+    workbook: Union[str, Path, WorkbookHandle],
     report: ValidationReport,
     output_path: Union[str, Path],
 ) -> None:
-    """Write ``workbook_path`` to ``output_path`` with findings marked up.
+    """Write ``workbook`` to ``output_path`` with findings marked up.
+
+    ``workbook`` may be the handle the report was validated from, so the file
+    isn't read from disk again.
 
     :raises G3mtError: if the output path is the same as the input (which would
         destroy the user's original file).
     """
-    if Path(workbook_path).resolve() == Path(output_path).resolve():
-        raise G3mtError("Annotated copy must be written to a different file than the input.")
-
-    wb = openpyxl.load_workbook(workbook_path)
+    with open_workbook(workbook) as handle:
+        if handle.path.resolve() == Path(output_path).resolve():
+            raise G3mtError("Annotated copy must be written to a different file than the input.")
+        wb = handle.editable_workbook()
 
     for finding in report.findings:
         if finding.cell is None or finding.sheet not in wb.sheetnames:
@@ -0,0 +1,152 @@
+"""Serve repeat template requests from a directory of already-written workbooks.
+
+The writer is deterministic: the same spec, row count and g3mt version always
+produce the same bytes. So a generated .xlsx can be stored under a key derived
+from those inputs, and the next identical request becomes a file copy (or a
+hard link) instead of a full rewrite.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import IO, Optional, Union
+
+import xlsxwriter
+
+from gen3_metadata_templates import __version__
+from gen3_metadata_templates.constants import DEFAULT_DATA_ROWS, LAYOUT_GRID, META_FORMAT
+from gen3_metadata_templates.model import TemplateSpec
+from gen3_metadata_templates.workbook.writer import write_template
+
+
+def workbook_cache_key(
+    spec: TemplateSpec,
+    *,
+    data_rows: int = DEFAULT_DATA_ROWS,
+    protect_headers: bool = True,
+    layout: str = LAYOUT_GRID,
+    compact_comments: bool = False,
+) -> str:
+    """The cache key for a ``write_template`` call: a SHA-256 hex digest.
+
+    The g3mt and xlsxwriter versions are part of the key, since either can
+    change the bytes written for an unchanged spec.
+    """
+    parts = {
+        "g3mt": __version__,
+        "xlsxwriter": xlsxwriter.__version__,
+        "meta_format": META_FORMAT,
+        "spec": spec.content_hash,
+        "data_rows": data_rows,
+        "protect_headers": protect_headers,
+        "layout": layout,
+        "compact_comments": compact_comments,
+    }
+    text = json.dumps(parts, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class WorkbookCache:
+    """A directory of generated workbooks, keyed by :func:`workbook_cache_key`.
+
+    Outputs are copied out of the cache by default. With ``link=True`` they are
+    hard-linked instead, which is faster and uses no extra disk, but means the
+    output and the cached file are the same file: only use it when outputs are
+    served read-only (a download endpoint), never when they may be edited in
+    place. Where a hard link isn't possible (another filesystem) it falls back
+    to a copy.
+    """
+
+    def __init__(self, directory: Union[str, Path], *, link: bool = False):
+        self.directory = Path(directory)
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"workbook-{key}.xlsx"
+
+    def write(
+        self,
+        spec: TemplateSpec,
+        output_path: Union[str, Path, IO[bytes]],
+        *,
+        data_rows: int = DEFAULT_DATA_ROWS,
+        protect_headers: bool = True,
+        layout: str = LAYOUT_GRID,
+        compact_comments: bool = False,
+    ) -> bool:
+        """Put the workbook for ``spec`` at ``output_path``; True if it came from the cache.
+
+        ``output_path`` may be a binary file-like object, which is given the
+        cached bytes.
+        """
+        options = {
+            "data_rows": data_rows,
+            "protect_headers": protect_headers,
+            "layout": layout,
+            "compact_comments": compact_comments,
+        }
+        key = workbook_cache_key(spec, **options)
+        cached = self.path_for(key)
+        if cached.is_file():
+            self.hits += 1
+            self._deliver(cached, output_path)
+            return True
+
+        self.misses += 1
+        stored = self._store(spec, cached, options)
+        if stored is None:
+            # Couldn't write into the cache directory: just generate directly.
+            write_template(spec, output_path, **options)
+        else:
+            self._deliver(stored, output_path)
+        return False
+
+    def clear(self) -> None:
+        """Delete every cached workbook in the directory."""
+        for path in self.directory.glob("workbook-*.xlsx"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _store(self, spec: TemplateSpec, cached: Path, options: dict) -> Optional[Path]:
+        """Write the workbook into the cache atomically; None if the directory is unusable."""
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".workbook-", suffix=".xlsx", dir=str(cached.parent))
+            os.close(fd)
+        except OSError:
+            return None
+        try:
+            write_template(spec, tmp, **options)
+            os.replace(tmp, cached)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return cached
+
+    def _deliver(self, cached: Path, output: Union[str, Path, IO[bytes]]) -> None:
+        if hasattr(output, "write"):
+            with open(cached, "rb") as handle:
+                shutil.copyfileobj(handle, output)
+            return
+        output = Path(output)
+        if output.exists() or output.is_symlink():
+            output.unlink()
+        if self.link:
+            try:
+                os.link(cached, output)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(cached, output)
@@ -0,0 +1,191 @@
+"""Parsed node sheets as columns rather than one dict per record.
+
+A list of record dicts repeats every key in every record and keeps each value
+boxed in its own dict slot. A :class:`ColumnarSheet` keeps one sequence per
+mapped column instead — an ``array`` of machine values when every value in the
+column is a plain int, float or bool, a list otherwise — with a byte per record
+saying whether the record has a value there, and the Excel row of each record.
+Checks that look at a whole column (how many blanks, which values repeat) can
+then work on the column directly, and the arrays are what a Parquet or Arrow
+writer takes.
+
+Schema and link checks still want records. :meth:`ColumnarSheet.record`
+builds the dict for one record from the columns, and :meth:`ColumnarSheet.records`
+yields them in order, so only the record being checked exists as a dict; the
+values in it are the column's own objects, not copies.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from gen3_metadata_templates.constants import READ_ENGINE_NATIVE
+from gen3_metadata_templates.model import ColumnSpec, NodeTemplate, TemplateSpec
+from gen3_metadata_templates.workbook.reader import (
+    ParsedWorkbook,
+    SheetCoords,
+    iter_workbook_records,
+)
+
+# Typecode for a column whose every value is exactly this type. A column that
+# mixes in anything else (an integer column holding "n/a", which the validator
+# must still see) stays a list.
+_TYPECODES = {int: "q", float: "d", bool: "b"}
+
+
+@dataclass
+class ColumnData:
+    """One mapped column of a sheet, by record index.
+
+    ``values[i]`` is record ``i``'s value where ``present[i]`` is 1; elsewhere
+    it is a filler (None in a list, 0 in an array).
+    """
+
+    column: ColumnSpec
+    values: Union[array, List[Any]]
+    present: bytearray  # the null mask: 1 where the record has a value
+
+    def value(self, index: int) -> Any:
+        """Record ``index``'s value, or None if it has none."""
+        if not self.present[index]:
+            return None
+        value = self.values[index]
+        if isinstance(self.values, array) and self.values.typecode == "b":
+            return bool(value)
+        return value
+
+    def count(self) -> int:
+        """How many records have a value in this column."""
+        return len(self.present) - self.present.count(0)
+
+
+@dataclass
+class ColumnarSheet:
+    """One node's records, column by column, and where each came from."""
+
+    node: str
+    columns: List[ColumnData]  # the sheet's mapped columns, left to right
+    coords: SheetCoords
+
+    def __len__(self) -> int:
+        return len(self.coords.rows)
+
+    @property
+    def rows(self) -> array:
+        """The Excel row of each record."""
+        return self.coords.rows
+
+    def column(self, prop_name: str) -> Optional[ColumnData]:
+        for data in self.columns:
+            if data.column.prop_name == prop_name:
+                return data
+        return None
+
+    def record(self, index: int) -> dict:
+        """Record ``index`` as :func:`~.reader.read_workbook` gives it."""
+        record = {}
+        for data in self.columns:
+            if data.present[index]:
+                record[data.column.prop_name] = data.value(index)
+        record["type"] = self.node
+        return record
+
+    def records(self) -> Iterator[dict]:
+        """Every record, in sheet order, each built as it is reached."""
+        for index in range(len(self)):
+            yield self.record(index)
+
+
+def read_columns(
+    workbook_path: Union[str, Path],
+    spec: TemplateSpec,
+    *,
+    first_data_row: Optional[int] = None,
+    engine: str = READ_ENGINE_NATIVE,
+    parsed: Optional[ParsedWorkbook] = None,
+) -> Dict[str, ColumnarSheet]:
+    """Read a filled workbook into a :class:`ColumnarSheet` per node, in ``spec`` order.
+
+    The records are :func:`~.reader.read_workbook`'s, streamed into columns
+    one at a time, so the dict-per-record form never exists for the whole
+    workbook. The arguments are as for
+    :func:`~.reader.iter_workbook_records`; warnings and missing columns go
+    on ``parsed``, if given.
+    """
+    if parsed is None:
+        parsed = ParsedWorkbook()
+    builders: Dict[str, _SheetBuilder] = {}
+    records = iter_workbook_records(
+        workbook_path, spec, first_data_row=first_data_row, engine=engine, parsed=parsed
+    )
+    for node, _index, record, coords in records:
+        builder = builders.get(node)
+        if builder is None:
+            builder = builders[node] = _SheetBuilder(spec.node_template(node), coords)
+        builder.add(record)
+
+    sheets = {}
+    for node_template in spec.nodes:
+        node = node_template.node
+        builder = builders.get(node)
+        if builder is None:  # no records, or no sheet at all
+            coords = parsed._coords.get(node) or SheetCoords(node_template.sheet_name)
+            builder = _SheetBuilder(node_template, coords)
+        sheets[node] = builder.finish()
+    return sheets
+
+
+def pack_records(
+    node_template: NodeTemplate, coords: SheetCoords, records: Sequence[dict], start: int
+) -> ColumnarSheet:
+    """``records``, the node's records from number ``start`` on, as a sheet of their own.
+
+    Record ``i`` of the result is record ``start + i`` of ``coords``' sheet:
+    a compact form to send a run of records to another process in.
+    """
+    rows = coords.rows[start : start + len(records)]
+    builder = _SheetBuilder(
+        node_template, SheetCoords(coords.sheet, coords.columns, rows, coords.ref_type)
+    )
+    for record in records:
+        builder.add(record)
+    return builder.finish()
+
+
+class _SheetBuilder:
+    def __init__(self, node_template: NodeTemplate, coords: SheetCoords):
+        self.node = node_template.node
+        self.coords = coords
+        self.columns = [node_template.column_by_prop(prop) for prop in coords.columns]
+        self.values: List[List[Any]] = [[] for _ in self.columns]
+        self.present: List[bytearray] = [bytearray() for _ in self.columns]
+
+    def add(self, record: dict) -> None:
+        for column, values, present in zip(self.columns, self.values, self.present):
+            value = record.get(column.prop_name)
+            values.append(value)
+            present.append(value is not None)
+
+    def finish(self) -> ColumnarSheet:
+        columns = [
+            ColumnData(column, _packed(values, present), present)
+            for column, values, present in zip(self.columns, self.values, self.present)
+        ]
+        return ColumnarSheet(self.node, columns, self.coords)
+
+
+def _packed(values: List[Any], present: bytearray) -> Union[array, List[Any]]:
+    """``values`` as a typed array if every value is the same plain type, else as is."""
+    kinds = {type(value) for value, has in zip(values, present) if has}
+    if len(kinds) != 1:
+        return values
+    typecode = _TYPECODES.get(kinds.pop())
+    if typecode is None:
+        return values
+    try:
+        return array(typecode, (value if has else 0 for value, has in zip(values, present)))
+    except OverflowError:  # an integer beyond 64 bits
+        return values
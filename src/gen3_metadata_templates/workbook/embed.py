@@ -0,0 +1,66 @@
+"""Pack a :class:`TemplateSpec` into worksheet cells, and unpack it again.
+
+The ``_g3mt`` sheet carries the exact spec a workbook was written from, so the
+reader can map headers to properties straight away — before, or while, the
+schema is being resolved. The spec's JSON is zlib-compressed, base64-encoded,
+and split into cell-sized parts; its SHA-256 is stored alongside so a damaged
+or hand-edited copy is detected and ignored rather than trusted.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import zlib
+from typing import Any, List, Mapping, Optional, Tuple
+
+from gen3_metadata_templates.model import TemplateSpec
+
+# Excel caps a cell at 32,767 characters; stay comfortably below it.
+SPEC_PART_LEN = 32000
+
+# Metadata keys. Parts are numbered from 1: spec_1, spec_2, ...
+SPEC_HASH_KEY = "spec_hash"
+SPEC_PARTS_KEY = "spec_parts"
+SPEC_PART_PREFIX = "spec_"
+
+
+def pack_spec(spec: TemplateSpec) -> Tuple[str, List[str]]:
+    """Return ``(sha256_of_json, parts)`` ready to write into cells."""
+    text = spec.to_json().encode("utf-8")
+    digest = hashlib.sha256(text).hexdigest()
+    blob = base64.b64encode(zlib.compress(text, 9)).decode("ascii")
+    parts = [blob[i : i + SPEC_PART_LEN] for i in range(0, len(blob), SPEC_PART_LEN)]
+    return digest, parts
+
+
+def pack_spec_rows(spec: TemplateSpec) -> List[Tuple[str, str]]:
+    """The ``(key, value)`` metadata rows that carry ``spec``."""
+    digest, parts = pack_spec(spec)
+    rows = [(SPEC_HASH_KEY, digest), (SPEC_PARTS_KEY, str(len(parts)))]
+    rows.extend((f"{SPEC_PART_PREFIX}{i}", part) for i, part in enumerate(parts, start=1))
+    return rows
+
+
+def unpack_spec(meta: Optional[Mapping[str, Any]]) -> Optional[TemplateSpec]:
+    """The spec embedded in a workbook's metadata, or None.
+
+    None covers every reason the spec can't be trusted: an older workbook that
+    never carried one, a missing part, corrupt data, a hash mismatch, or a spec
+    format this version doesn't understand. Callers then fall back to building
+    the spec from the schema, exactly as before.
+    """
+    if not meta or not meta.get(SPEC_HASH_KEY):
+        return None
+    try:
+        count = int(str(meta.get(SPEC_PARTS_KEY) or "0"))
+        parts = [meta.get(f"{SPEC_PART_PREFIX}{i}") for i in range(1, count + 1)]
+        if count < 1 or any(not isinstance(p, str) for p in parts):
+            return None
+        text = zlib.decompress(base64.b64decode("".join(parts), validate=True))
+        if hashlib.sha256(text).hexdigest() != str(meta[SPEC_HASH_KEY]):
+            return None
+        return TemplateSpec.from_json(text.decode("utf-8"))
+    except (ValueError, KeyError, TypeError, binascii.Error, zlib.error):
+        return None
@@ -0,0 +1,325 @@
+"""Read Gen3-style TSV, CSV and JSON-lines exports as if they were filled templates.
+
+Not all metadata arrives in a workbook: Gen3 exports one TSV per node, and
+pipelines often produce JSON lines. :class:`ExportFiles` reads those through a
+:class:`TemplateSpec` exactly as a node sheet is read — the same header
+mapping (``<parent>.submitter_id`` link columns, and also the
+``<link>.submitter_id`` form Gen3 exports use), the same ``;`` lists and the
+same coercion — into the same :class:`ParsedWorkbook`, so they validate with
+the same checks.
+
+A value is located by file and line (and, in a delimited file, the column a
+spreadsheet program would show it in) rather than by sheet cell. Files are
+read once per node they hold, a line at a time; standard input (``-``) is
+first copied to a temporary file so it can be read the same way.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from gen3_metadata_templates.constants import (
+    DEFAULT_EXCLUDED_COLUMNS,
+    PRIMARY_KEY,
+    TSV_FIRST_DATA_ROW,
+)
+from gen3_metadata_templates.errors import RecordSourceError
+from gen3_metadata_templates.model import ColumnKind, NodeTemplate, TemplateSpec
+from gen3_metadata_templates.sources import RecordFiles, detect_format, long_csv_rows
+from gen3_metadata_templates.workbook.reader import (
+    LineRef,
+    ParsedWorkbook,
+    SheetCoords,
+    _iter_records,
+    column_coercer,
+)
+
+EXPORT_FORMATS = ("tsv", "csv", "jsonl")
+
+# The path that means standard input.
+STDIN = "-"
+_STDIN_NAME = "<stdin>"
+
+# Columns a Gen3 export carries that no template has: the node's own ``type``
+# and the system properties templates leave out. Skipped without a warning.
+_EXPORT_ONLY_COLUMNS = ("type", *DEFAULT_EXCLUDED_COLUMNS)
+
+
+def is_export(path: Union[str, Path]) -> bool:
+    """Whether ``path`` names a text export (or standard input) rather than a workbook."""
+    if str(path) == STDIN:
+        return True
+    path = Path(path)
+    if path.is_dir():
+        return False
+    try:
+        return detect_format(path) in EXPORT_FORMATS
+    except RecordSourceError:
+        return False
+
+
+@dataclass
+class _ExportFile:
+    path: Path
+    name: str  # as findings show it
+    fmt: str
+
+
+class ExportFiles:
+    """A set of export files, read node by node through a spec.
+
+    ``nodes`` lists every node the files hold, in the order first seen. Each
+    node's records must all be in one file. Use it as a context manager (or
+    call :meth:`close`) so a copy of standard input is removed afterwards.
+
+    :raises RecordSourceError: for a file in another format, unreadable
+        records, or a node split across files.
+    """
+
+    def __init__(self, paths: Sequence[Union[str, Path]], *, stdin: Optional[IO[bytes]] = None):
+        self._spooled: Optional[Path] = None
+        try:
+            self.files = [self._open(Path(p), stdin) for p in paths]
+            found = RecordFiles([f.path for f in self.files])
+            self._file_for: Dict[str, _ExportFile] = {}
+            for export in self.files:
+                nodes = found.nodes_in(export.path)
+                if export.name == _STDIN_NAME and nodes == [export.path.stem]:
+                    raise RecordSourceError(
+                        "Records on standard input need a 'type' column to say what node they are."
+                    )
+                for node in nodes:
+                    other = self._file_for.setdefault(node, export)
+                    if other is not export:
+                        raise RecordSourceError(
+                            f"Node '{node}' has records in both '{other.name}' and "
+                            f"'{export.name}'. Put each node's records in one file."
+                        )
+            self.nodes: List[str] = found.nodes
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "ExportFiles":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._spooled is not None:
+            self._spooled.unlink(missing_ok=True)
+            self._spooled = None
+
+    def _open(self, path: Path, stdin: Optional[IO[bytes]]) -> _ExportFile:
+        if str(path) == STDIN:
+            spooled, fmt = _spool(stdin if stdin is not None else sys.stdin.buffer)
+            self._spooled = spooled
+            return _ExportFile(spooled, _STDIN_NAME, fmt)
+        fmt = detect_format(path)
+        if fmt not in EXPORT_FORMATS:
+            raise RecordSourceError(
+                f"'{path}' is a .{fmt} file; validate reads .tsv, .csv and .jsonl exports."
+            )
+        if not path.is_file():
+            raise RecordSourceError(f"Records file '{path}' does not exist.")
+        return _ExportFile(path, path.name, fmt)
+
+    def file_name(self, node: str) -> Optional[str]:
+        """The name findings give the file holding ``node``'s records, if any does."""
+        export = self._file_for.get(node)
+        return export.name if export is not None else None
+
+    def iter_records(
+        self, spec: TemplateSpec, *, parsed: Optional[ParsedWorkbook] = None
+    ) -> Iterator[Tuple[str, int, dict, SheetCoords]]:
+        """``spec``'s records, as :func:`~.reader.iter_workbook_records` yields a workbook's.
+
+        Nodes the files don't hold have no records.
+        """
+        if parsed is None:
+            parsed = ParsedWorkbook()
+        for node_template in spec.nodes:
+            node = node_template.node
+            export = self._file_for.get(node)
+            if export is None:
+                parsed._coords[node] = SheetCoords(node, ref_type=LineRef)
+                continue
+            if export.fmt == "jsonl":
+                records = _iter_jsonl(export, node_template, parsed)
+            else:
+                records = _iter_delimited(export, node_template, parsed)
+            coords = None
+            for record in records:
+                coords = coords or parsed._coords[node]
+                yield node, len(coords.rows) - 1, record, coords
+
+    def read(self, spec: TemplateSpec) -> ParsedWorkbook:
+        """Every record at once, as :func:`~.reader.read_workbook` returns a workbook's."""
+        parsed = ParsedWorkbook()
+        for node_template in spec.nodes:
+            parsed.records[node_template.node] = []
+        for node, _index, record, _coords in self.iter_records(spec, parsed=parsed):
+            parsed.records[node].append(record)
+        return parsed
+
+
+def _spool(stream: IO[bytes]) -> Tuple[Path, str]:
+    """Copy ``stream`` to a temporary file named for the format its start shows."""
+    head = stream.read(64 * 1024)
+    fmt = _sniff(head)
+    with tempfile.NamedTemporaryFile(suffix=f".{fmt}", delete=False) as spooled:
+        spooled.write(head)
+        shutil.copyfileobj(stream, spooled)
+    return Path(spooled.name), fmt
+
+
+def _sniff(head: bytes) -> str:
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if text.startswith(b"{"):
+        return "jsonl"
+    first_line = text.split(b"\n", 1)[0]
+    return "tsv" if b"\t" in first_line else "csv"
+
+
+def _aliases(node_template: NodeTemplate) -> Dict[str, Optional[str]]:
+    """Header names an export may use for ``node_template``'s columns, or skip quietly."""
+    aliases: Dict[str, Optional[str]] = dict.fromkeys(_EXPORT_ONLY_COLUMNS)
+    for col in node_template.columns:
+        if col.kind is not ColumnKind.LINK:
+            continue
+        # Gen3 exports name a link column after the link, and add its uuid.
+        aliases.setdefault(f"{col.prop_name}.{PRIMARY_KEY}", col.header)
+        aliases.setdefault(f"{col.prop_name}.id", None)
+        aliases.setdefault(f"{col.link_target}.id", None)
+    for col in node_template.columns:
+        aliases.pop(col.header, None)
+    return aliases
+
+
+def _iter_delimited(
+    export: _ExportFile, node_template: NodeTemplate, parsed: ParsedWorkbook
+) -> Iterator[dict]:
+    with open(export.path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.reader(handle, delimiter="\t" if export.fmt == "tsv" else ",")
+        rows = _of_node(_numbered(reader), node_template.node)
+        yield from _iter_records(
+            rows,
+            node_template,
+            export.name,
+            parsed,
+            TSV_FIRST_DATA_ROW,
+            aliases=_aliases(node_template),
+            ref_type=LineRef,
+        )
+
+
+def _numbered(reader) -> Iterator[Tuple[int, List[str]]]:
+    """``(line number, row)``, counting a quoted value's line breaks as lines."""
+    line = 1
+    for row in long_csv_rows(reader):
+        yield line, row
+        line = reader.line_num + 1
+
+
+def _of_node(rows: Iterator[Tuple[int, List[str]]], node: str) -> Iterator[Tuple[int, List[str]]]:
+    """The header, then only the rows whose ``type`` is ``node`` (all, without the column)."""
+    first = next(rows, None)
+    if first is None:
+        return
+    yield first
+    header = [value.strip() for value in first[1]]
+    if "type" not in header:
+        yield from rows
+        return
+    type_idx = header.index("type")
+    for line, row in rows:
+        if type_idx < len(row) and row[type_idx].strip() == node:
+            yield line, row
+
+
+def _iter_jsonl(
+    export: _ExportFile, node_template: NodeTemplate, parsed: ParsedWorkbook
+) -> Iterator[dict]:
+    """Records of one node from a JSON-lines file.
+
+    Values keep their JSON types. A link may also be given as a bare
+    submitter_id, or under a flat ``<parent>.submitter_id`` key; both are
+    folded into the reference shape, and flat keys (like any header) have
+    their values read as cells are.
+    """
+    node = node_template.node
+    coords = parsed._coords[node] = SheetCoords(
+        export.name,
+        dict.fromkeys((c.prop_name for c in node_template.columns), ""),
+        ref_type=LineRef,
+    )
+    keys = _json_keys(node_template)
+    quiet = _aliases(node_template)
+    warned = set()
+    with open(export.path, encoding="utf-8-sig") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError as exc:
+                raise RecordSourceError(
+                    f"{export.name}, line {line_no}: not valid JSON ({exc})."
+                ) from None
+            if not isinstance(obj, dict) or obj.get("type") != node:
+                continue
+            record: dict = {}
+            for key, value in obj.items():
+                target = keys.get(key)
+                if target is None:
+                    if key not in quiet and key not in warned:
+                        warned.add(key)
+                        parsed.warnings.append(
+                            f"Key '{key}' in '{export.name}' is not in the schema for "
+                            f"'{node}' — ignored."
+                        )
+                    continue
+                prop_name, read = target
+                if value is not None and read is not None:
+                    value = read(value)
+                if value is None or value == "" or value == []:
+                    continue
+                record[prop_name] = value
+            record["type"] = node
+            coords.rows.append(line_no)
+            yield record
+
+
+def _json_keys(
+    node_template: NodeTemplate,
+) -> Dict[str, Tuple[str, Optional[Callable[[Any], Any]]]]:
+    """``{key: (prop_name, how to read its value or None)}`` for a node's JSON records."""
+    keys: Dict[str, Tuple[str, Optional[Callable[[Any], Any]]]] = {}
+    for col in node_template.columns:
+        coerce = column_coercer(col)
+        if col.kind is ColumnKind.LINK:
+            keys[col.prop_name] = (col.prop_name, _bare_link(coerce))
+        else:
+            keys[col.prop_name] = (col.prop_name, None)
+    for col in node_template.columns:
+        keys.setdefault(col.header, (col.prop_name, column_coercer(col)))
+    for alias, header in _aliases(node_template).items():
+        col = node_template.column_by_header(header) if header else None
+        if col is not None:
+            keys.setdefault(alias, (col.prop_name, column_coercer(col)))
+    return keys
+
+
+def _bare_link(coerce: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def read(value: Any) -> Any:
+        return coerce(value) if isinstance(value, str) else value
+
+    return read
@@ -0,0 +1,344 @@
+"""One open workbook, shared by every stage of a validation run.
+
+Validating reads a workbook several times over: the ``_g3mt`` metadata first,
+then the node sheets (a second time if the schema has changed since the
+template was made), and with ``--annotate`` once more to write the marked-up
+copy. Opened separately, every stage read the file from disk again and parsed
+its workbook part, shared strings and styles again. A :class:`WorkbookHandle`
+reads the file once and keeps those parsed parts, so each later stage only
+decompresses the sheets it actually needs.
+
+``read_meta`` and ``read_workbook`` are one-shot wrappers around a handle.
+"""
+
+from __future__ import annotations
+
+import io
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import openpyxl
+
+from gen3_metadata_templates.constants import (
+    META_SHEET,
+    PARALLEL_READ_MIN_BYTES,
+    READ_ENGINE_NATIVE,
+    READ_ENGINES,
+    TSV_FIRST_DATA_ROW,
+)
+from gen3_metadata_templates.errors import WorkbookFormatError
+from gen3_metadata_templates.model import NodeTemplate, TemplateSpec
+from gen3_metadata_templates.workbook import tsv
+from gen3_metadata_templates.workbook.native import NativeWorkbook, Unsupported
+from gen3_metadata_templates.workbook.reader import (
+    ParsedWorkbook,
+    SheetCoords,
+    _iter_node_sheet,
+    _iter_records,
+    _meta_from_rows,
+    _read_node_sheet,
+    _sheet_missing,
+    data_start_row,
+)
+
+_UNREAD = object()
+
+
+class WorkbookHandle:
+    """A filled workbook (or TSV bundle), opened once for everything that reads it.
+
+    The metadata is read on first use and kept. Node sheets are parsed by the
+    native parser, or, once a workbook has turned out to need it, by openpyxl
+    (see ``engine`` on :func:`~gen3_metadata_templates.workbook.reader.read_workbook`).
+    Use it as a context manager, or call :meth:`close`.
+
+    When the node sheets hold at least ``PARALLEL_READ_MIN_BYTES`` of XML, the
+    native parser can read them on a process pool of up to ``workers``
+    processes, one sheet per task, each worker opening the file itself; the
+    results are merged in ``spec.nodes`` order, so they are the same as a
+    serial read. ``workers=1``, the default, always reads in this process.
+
+    :raises WorkbookFormatError: if the file isn't an .xlsx workbook at all.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        engine: str = READ_ENGINE_NATIVE,
+        workers: int = 1,
+    ):
+        if engine not in READ_ENGINES:
+            raise ValueError(
+                f"Unknown read engine '{engine}'; expected one of: {', '.join(READ_ENGINES)}."
+            )
+        self.path = Path(path)
+        self.engine = engine
+        self.workers = workers
+        self.is_bundle = tsv.is_tsv_bundle(self.path)
+        self._data = b"" if self.is_bundle else self.path.read_bytes()
+        if not self.is_bundle and not zipfile.is_zipfile(io.BytesIO(self._data)):
+            raise WorkbookFormatError(f"'{self.path}' is not an .xlsx workbook.")
+        self._native: Optional[NativeWorkbook] = None
+        self._needs_openpyxl = engine != READ_ENGINE_NATIVE
+        self._streamed = None  # openpyxl's read-only workbook, once needed
+        self._meta = _UNREAD
+
+    def __enter__(self) -> "WorkbookHandle":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._native is not None:
+            self._native.close()
+            self._native = None
+        if self._streamed is not None:
+            self._streamed.close()
+            self._streamed = None
+
+    def meta(self) -> Optional[dict]:
+        """The workbook's metadata, as :func:`~.reader.read_meta` returns it."""
+        if self._meta is _UNREAD:
+            self._meta = self._read_meta()
+        return self._meta
+
+    def read(self, spec: TemplateSpec, *, first_data_row: Optional[int] = None) -> ParsedWorkbook:
+        """The records on ``spec``'s node sheets, as :func:`~.reader.read_workbook` returns them."""
+        if self.is_bundle:
+            return tsv.read_tsv_bundle(
+                self.path, spec, first_data_row=first_data_row or TSV_FIRST_DATA_ROW
+            )
+        first_data_row = first_data_row or data_start_row(self.meta())
+        native = self._native_workbook()
+        if native is not None:
+            try:
+                workers = self._pool_size(native, spec)
+                if workers > 1:
+                    return _read_native_parallel(self.path, native, spec, first_data_row, workers)
+                return _read_native(native, spec, first_data_row)
+            except Unsupported:
+                self._give_up_native()
+        return _read_streamed(self._streamed_workbook(), spec, first_data_row)
+
+    def iter_records(
+        self,
+        spec: TemplateSpec,
+        *,
+        first_data_row: Optional[int] = None,
+        parsed: Optional[ParsedWorkbook] = None,
+    ) -> Iterator[Tuple[str, int, dict, SheetCoords]]:
+        """``spec``'s records one at a time, as :func:`~.reader.iter_workbook_records` yields them."""
+        if parsed is None:
+            parsed = ParsedWorkbook()
+        if self.is_bundle:
+            records = tsv.iter_tsv_bundle(
+                self.path, spec, parsed, first_data_row=first_data_row or TSV_FIRST_DATA_ROW
+            )
+        else:
+            first_data_row = first_data_row or data_start_row(self.meta())
+            records = self._iter_sheets(spec, parsed, first_data_row)
+        for node, record in records:
+            coords = parsed._coords[node]
+            yield node, len(coords.rows) - 1, record, coords
+
+    def _iter_sheets(
+        self, spec: TemplateSpec, parsed: ParsedWorkbook, first_data_row: int
+    ) -> Iterator[Tuple[str, dict]]:
+        for node_template in spec.nodes:
+            node = node_template.node
+            for record in self._iter_sheet(node_template, parsed, first_data_row):
+                yield node, record
+
+    def _iter_sheet(
+        self, node_template: NodeTemplate, parsed: ParsedWorkbook, first_data_row: int
+    ) -> Iterator[dict]:
+        native = self._native_workbook()
+        if native is not None:
+            yielded = 0
+            try:
+                for record in _iter_native_sheet(native, node_template, parsed, first_data_row):
+                    yield record
+                    yielded += 1
+                return
+            except Unsupported:
+                self._give_up_native()
+            if node_template.node in parsed._coords:
+                # The header (and maybe some records) already went out: pick
+                # up from the first record the native parser didn't yield.
+                yield from _resume_streamed(
+                    self._streamed_workbook(), node_template, parsed, first_data_row, yielded
+                )
+                return
+        yield from _iter_node_sheet(
+            self._streamed_workbook(), node_template, parsed, first_data_row
+        )
+
+    def editable_workbook(self) -> openpyxl.Workbook:
+        """A fully loaded, editable openpyxl copy of the workbook, from the bytes already read."""
+        if self.is_bundle:
+            raise WorkbookFormatError(f"'{self.path}' is a TSV bundle, not an .xlsx workbook.")
+        return openpyxl.load_workbook(io.BytesIO(self._data))
+
+    def _read_meta(self) -> Optional[dict]:
+        if self.is_bundle:
+            return tsv.read_bundle_meta(self.path)
+        native = self._native_workbook()
+        if native is not None:
+            if META_SHEET not in native.sheetnames:
+                return None
+            try:
+                return _meta_from_rows(values for _, values in native.rows(META_SHEET))
+            except Unsupported:
+                self._give_up_native()
+        wb = self._streamed_workbook()
+        if META_SHEET not in wb.sheetnames:
+            return None
+        return _meta_from_rows(wb[META_SHEET].iter_rows(values_only=True))
+
+    def _pool_size(self, native: NativeWorkbook, spec: TemplateSpec) -> int:
+        """How many processes to read ``spec``'s sheets with; 1 means here, serially."""
+        if self.workers < 2:
+            return 1
+        sizes = [
+            native.sheet_size(n.sheet_name) for n in spec.nodes if n.sheet_name in native.sheetnames
+        ]
+        if len(sizes) < 2 or sum(sizes) < PARALLEL_READ_MIN_BYTES:
+            return 1
+        return min(self.workers, len(sizes))
+
+    def _native_workbook(self) -> Optional[NativeWorkbook]:
+        if self._native is None and not self._needs_openpyxl:
+            try:
+                self._native = NativeWorkbook(io.BytesIO(self._data))
+            except Unsupported:
+                self._needs_openpyxl = True
+        return self._native
+
+    def _give_up_native(self) -> None:
+        self._needs_openpyxl = True
+        if self._native is not None:
+            self._native.close()
+            self._native = None
+
+    def _streamed_workbook(self):
+        if self._streamed is None:
+            # Read-only: only the sheets asked for are parsed, a row at a
+            # time, and no cell objects or styles are built.
+            self._streamed = openpyxl.load_workbook(
+                io.BytesIO(self._data), data_only=True, read_only=True
+            )
+        return self._streamed
+
+
+@contextmanager
+def open_workbook(
+    workbook: Union[str, Path, WorkbookHandle],
+    *,
+    engine: str = READ_ENGINE_NATIVE,
+    workers: int = 1,
+) -> Iterator[WorkbookHandle]:
+    """A handle on ``workbook`` for the ``with`` block; a handle passed in is left open."""
+    if isinstance(workbook, WorkbookHandle):
+        yield workbook
+        return
+    with WorkbookHandle(workbook, engine=engine, workers=workers) as handle:
+        yield handle
+
+
+def _read_native(wb: NativeWorkbook, spec: TemplateSpec, first_data_row: int) -> ParsedWorkbook:
+    parsed = ParsedWorkbook()
+    for node_template in spec.nodes:
+        _read_native_sheet(wb, node_template, parsed, first_data_row)
+    return parsed
+
+
+def _read_native_sheet(
+    wb: NativeWorkbook, node_template: NodeTemplate, parsed: ParsedWorkbook, first_data_row: int
+) -> None:
+    records = list(_iter_native_sheet(wb, node_template, parsed, first_data_row))
+    parsed.records[node_template.node] = records
+
+
+def _read_native_parallel(
+    path: Path, wb: NativeWorkbook, spec: TemplateSpec, first_data_row: int, workers: int
+) -> ParsedWorkbook:
+    """Read each node sheet on a process pool, merging in ``spec.nodes`` order.
+
+    The biggest sheets are handed out first so one of them isn't left running
+    alone at the end.
+    """
+    present = [n for n in spec.nodes if n.sheet_name in wb.sheetnames]
+    present.sort(key=lambda n: wb.sheet_size(n.sheet_name), reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {
+            n.node: pool.submit(_read_sheet_in_worker, (str(path), n, first_data_row))
+            for n in present
+        }
+        parsed = ParsedWorkbook()
+        for node_template in spec.nodes:
+            if node_template.node not in pending:
+                _sheet_missing(node_template, parsed)
+                continue
+            part = pending[node_template.node].result()
+            parsed.records.update(part.records)
+            parsed._coords.update(part._coords)
+            parsed.warnings.extend(part.warnings)
+            parsed.missing_columns.update(part.missing_columns)
+    return parsed
+
+
+# Each pool process opens the workbook once, on its first task.
+_worker_workbooks: Dict[str, NativeWorkbook] = {}
+
+
+def _read_sheet_in_worker(args: tuple) -> ParsedWorkbook:
+    """Parse one node sheet. Module level so a process pool can run it."""
+    path, node_template, first_data_row = args
+    wb = _worker_workbooks.get(path)
+    if wb is None:
+        wb = _worker_workbooks[path] = NativeWorkbook(path)
+    parsed = ParsedWorkbook()
+    _read_native_sheet(wb, node_template, parsed, first_data_row)
+    return parsed
+
+
+def _iter_native_sheet(
+    wb: NativeWorkbook, node_template: NodeTemplate, parsed: ParsedWorkbook, first_data_row: int
+) -> Iterator[dict]:
+    sheet_name = node_template.sheet_name
+    if sheet_name not in wb.sheetnames:
+        _sheet_missing(node_template, parsed)
+        return
+    rows = wb.rows(sheet_name)
+    yield from _iter_records(rows, node_template, sheet_name, parsed, first_data_row)
+
+
+def _resume_streamed(
+    wb, node_template: NodeTemplate, parsed: ParsedWorkbook, first_data_row: int, skip: int
+) -> Iterator[dict]:
+    """Re-read a sheet with openpyxl, yielding only the records after the first ``skip``.
+
+    Both engines read the cells the native parser got through identically, so
+    the first ``skip`` records are the ones already yielded. The header was
+    mapped then too; this read's warnings are dropped, and its rows extend the
+    coordinates already handed out.
+    """
+    node = node_template.node
+    coords = parsed._coords[node]
+    scratch = ParsedWorkbook()
+    for index, record in enumerate(_iter_node_sheet(wb, node_template, scratch, first_data_row)):
+        if index >= skip:
+            coords.rows.append(scratch._coords[node].rows[index])
+            yield record
+
+
+def _read_streamed(wb, spec: TemplateSpec, first_data_row: int) -> ParsedWorkbook:
+    parsed = ParsedWorkbook()
+    for node_template in spec.nodes:
+        _read_node_sheet(wb, node_template, parsed, first_data_row)
+    return parsed
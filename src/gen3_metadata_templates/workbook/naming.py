@@ -45,6 +45,16 @@ def named_range(node: str) -> str:
     return f"ids_{safe}"
 
 
+def table_name(node: str) -> str:
+    """Name of the Excel Table holding a node's rows in the table layout.
+
+    Table names share the workbook's defined-name namespace, so they get their
+    own prefix to stay clear of the ``ids_``/``enum_`` names.
+    """
+    safe = re.sub(r"\W", "_", node)
+    return f"tbl_{safe}"
+
+
 def enum_range(node: str, prop: str) -> str:
     """Defined-name for a long enum's backing list on the hidden lists sheet."""
     safe = re.sub(r"\W", "_", f"{node}_{prop}")
@@ -0,0 +1,339 @@
+"""Read node sheets straight from the xlsx XML, without openpyxl.
+
+An .xlsx is a zip of XML parts. Reading records only needs three of them per
+workbook — the sheet list, the shared strings and the cell styles (to know
+which numbers are dates) — plus each node sheet's ``<sheetData>``. This module
+opens the zip itself, builds the shared-string table once, and iterparses each
+node sheet into plain ``(row number, [values by column])`` pairs, which the
+reader turns into records exactly as it does for openpyxl's rows. Skipping the
+per-cell objects openpyxl builds even in read-only mode makes large sheets
+several times faster to read.
+
+Values come out as openpyxl's ``data_only`` mode would give them. Anything
+this parser doesn't handle the same way — rich text in a node sheet cell, a
+formula with no cached value, a part that isn't where it should be — raises
+:class:`Unsupported`, and :func:`read_workbook` then reads the whole workbook
+with openpyxl instead.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import re
+import string
+import xml.etree.ElementTree as ET
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel, from_ISO8601
+
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_SHEET_DATA = _MAIN + "sheetData"
+_ROW = _MAIN + "row"
+_VALUE = _MAIN + "v"
+_FORMULA = _MAIN + "f"
+_INLINE = _MAIN + "is"
+_TEXT = _MAIN + "t"
+_RUN = _MAIN + "r"
+_SHARED_ITEM = _MAIN + "si"
+
+_DIGITS = string.digits
+
+# Stands in for a shared string with formatting runs; reading one from a node
+# sheet means falling back to openpyxl.
+_RICH = object()
+
+# A row whose cells are all empty, e.g. the formatted-but-blank rows a
+# provisioned sheet gains when Excel or openpyxl saves it: each cell is a
+# self-closed <c .../> (a value, formula or inline string would be a child).
+# No cell attribute holds a "/", which keeps the match from backtracking.
+_BLANK_ROW = re.compile(rb"<row\b([^>]*)>(?:\s*<c\b[^>/]*/>)*\s*</row>")
+_ROW_TAG = re.compile(rb"<row\b([^>/]*)")
+_ROW_NUMBER = re.compile(rb'\sr="')
+_ROW_START = b"<row"
+
+
+class Unsupported(Exception):
+    """The workbook needs openpyxl: something here isn't handled natively."""
+
+
+class NativeWorkbook:
+    """An open .xlsx, with what every sheet read needs parsed up front.
+
+    ``sheetnames`` lists the worksheets in workbook order; :meth:`rows` streams
+    one of them.
+    """
+
+    def __init__(self, path: Union[str, Path, IO[bytes]]):
+        try:
+            self._zip = zipfile.ZipFile(path)
+        except (OSError, zipfile.BadZipFile) as exc:
+            raise Unsupported(f"not a zip archive ({exc})") from None
+        try:
+            self._load()
+        except (KeyError, ValueError, ET.ParseError) as exc:
+            self.close()
+            raise Unsupported(f"unexpected workbook structure ({exc!r})") from None
+        except BaseException:
+            self.close()
+            raise
+
+    def _load(self) -> None:
+        workbook = ET.fromstring(self._zip.read("xl/workbook.xml"))
+        if workbook.tag != _MAIN + "workbook":
+            raise Unsupported(f"unrecognised workbook namespace in {workbook.tag}")
+        targets = self._relationship_targets("xl/workbook.xml")
+
+        self._sheets: Dict[str, str] = {}
+        for sheet in workbook.iter(_MAIN + "sheet"):
+            self._sheets[sheet.get("name", "")] = targets[sheet.get(_REL + "id", "")][0]
+
+        properties = workbook.find(_MAIN + "workbookPr")
+        date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+        self._epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+
+        parts = {kind.rsplit("/", 1)[-1]: member for member, kind in targets.values()}
+        self._shared = self._shared_strings(parts.get("sharedStrings"))
+        self._date_styles, self._timedelta_styles = self._number_styles(parts.get("styles"))
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return list(self._sheets)
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def sheet_size(self, sheet_name: str) -> int:
+        """The uncompressed size of a sheet's XML, in bytes; 0 if its part is missing."""
+        info = self._zip.NameToInfo.get(self._sheets[sheet_name])
+        return info.file_size if info is not None else 0
+
+    def _relationship_targets(self, part: str) -> Dict[str, Tuple[str, str]]:
+        """``{relationship id: (zip member, relationship type)}`` for a part."""
+        folder, name = posixpath.split(part)
+        rels = ET.fromstring(self._zip.read(posixpath.join(folder, "_rels", f"{name}.rels")))
+        targets = {}
+        for rel in rels.iter(_PKG_REL + "Relationship"):
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                member = target.lstrip("/")
+            else:
+                member = posixpath.normpath(posixpath.join(folder, target))
+            targets[rel.get("Id", "")] = (member, rel.get("Type", ""))
+        return targets
+
+    def _shared_strings(self, member: Optional[str]) -> List[Any]:
+        """The shared-string table, as openpyxl reads it; rich text becomes ``_RICH``."""
+        strings: List[Any] = []
+        if member is None or member not in self._zip.NameToInfo:
+            return strings
+        with self._zip.open(member) as handle:
+            for _, item in ET.iterparse(handle):
+                if item.tag != _SHARED_ITEM:
+                    continue
+                if item.find(_RUN) is not None:
+                    strings.append(_RICH)
+                else:
+                    text = item.findtext(_TEXT) or ""
+                    strings.append(text.replace("x005F_", ""))
+                item.clear()
+        return strings
+
+    def _number_styles(self, member: Optional[str]) -> Tuple[Set[str], Set[str]]:
+        """The ``s`` attribute values whose number format shows a date (or a duration)."""
+        if member is None or member not in self._zip.NameToInfo:
+            return set(), set()
+        stylesheet = Stylesheet.from_tree(ET.fromstring(self._zip.read(member)))
+        return (
+            {str(i) for i in stylesheet.date_formats},
+            {str(i) for i in stylesheet.timedelta_formats},
+        )
+
+    def rows(self, sheet_name: str) -> Iterator[Tuple[int, List[Any]]]:
+        """``(row number, values)`` for each row of a sheet that has any cells.
+
+        ``values`` is indexed by 0-based column and ends at the row's last
+        non-empty cell; gaps are None. Rows come in file order, which Excel
+        keeps ascending.
+
+        :raises Unsupported: on a cell this parser can't read as openpyxl would.
+        """
+        try:
+            handle = self._zip.open(self._sheets[sheet_name])
+        except KeyError as exc:
+            raise Unsupported(f"sheet '{sheet_name}' has no part ({exc})") from None
+        with handle:
+            try:
+                yield from self._parse_rows(_BlankRowsCollapsed(handle))
+            except (ValueError, IndexError, OverflowError, ET.ParseError) as exc:
+                raise Unsupported(f"sheet '{sheet_name}': {exc!r}") from None
+
+    def _parse_rows(self, handle: IO[bytes]) -> Iterator[Tuple[int, List[Any]]]:
+        shared = self._shared
+        date_styles = self._date_styles
+        columns: Dict[str, int] = {}
+        sheet_data = None
+        row_idx = 0
+        for event, element in ET.iterparse(handle, events=("start", "end")):
+            if event == "start":
+                if element.tag == _SHEET_DATA:
+                    sheet_data = element
+                continue
+            if element.tag != _ROW:
+                continue
+
+            number = element.get("r")
+            row_idx = int(number) if number else row_idx + 1
+            values: List[Any] = []
+            col = -1
+            for cell in element:
+                ref = cell.get("r")
+                if ref is None:
+                    col += 1
+                else:
+                    letters = ref.rstrip(_DIGITS)
+                    col = columns.get(letters, -1)
+                    if col < 0:
+                        col = columns[letters] = column_index_from_string(letters) - 1
+
+                kind = cell.get("t")
+                if kind == "inlineStr":
+                    value = _inline_text(cell)
+                else:
+                    text = cell.findtext(_VALUE)
+                    if not text:
+                        if cell.find(_FORMULA) is not None:
+                            raise Unsupported(f"formula without a cached value in {ref}")
+                        continue
+                    if kind is None or kind == "n":
+                        if "." in text or "E" in text or "e" in text:
+                            value = float(text)
+                        else:
+                            value = int(text)
+                        style = cell.get("s")
+                        if style in date_styles:
+                            value = self._date(value, style, ref)
+                    elif kind == "s":
+                        value = shared[int(text)]
+                        if value is _RICH:
+                            raise Unsupported(f"rich text in {ref}")
+                    elif kind == "str" or kind == "e":
+                        value = text
+                    elif kind == "b":
+                        value = bool(int(text))
+                    elif kind == "d":
+                        value = from_ISO8601(text)
+                    else:
+                        raise Unsupported(f"unknown cell type '{kind}' in {ref}")
+                if value is None:
+                    continue
+                if col >= len(values):
+                    values.extend([None] * (col + 1 - len(values)))
+                values[col] = value
+
+            if sheet_data is not None:
+                sheet_data.clear()  # drops the finished rows, keeping memory flat
+            if values:
+                yield row_idx, values
+
+    def _date(self, value: Any, style: str, ref: Optional[str]) -> Any:
+        try:
+            return from_excel(value, self._epoch, timedelta=style in self._timedelta_styles)
+        except (OverflowError, ValueError):
+            # openpyxl turns these into "#VALUE!" with a warning; let it.
+            raise Unsupported(f"date serial out of range in {ref}") from None
+
+
+class _BlankRowsCollapsed:
+    """A sheet part, read with its blank rows' cells left out.
+
+    Parsing is nearly all of a sheet read's cost, so thousands of provisioned
+    rows of empty cells would cost as much as thousands of records. Their
+    cells yield nothing, so they go before the parser sees them; each blank
+    row is kept as an empty ``<row .../>``, so rows numbered by position
+    still count it. The trailing run of blank rows, when each carries its
+    number (as Excel and openpyxl write them), is kept as just its last row.
+    Rows this doesn't recognise, such as ones written with a namespace
+    prefix, are parsed as they are.
+    """
+
+    def __init__(self, handle: IO[bytes], chunk_size: int = 1 << 18):
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._pending = b""
+        self._ready = b""
+        self._offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        while self._offset >= len(self._ready) and self._fill():
+            pass
+        start = self._offset
+        end = len(self._ready) if size < 0 else min(start + size, len(self._ready))
+        self._offset = end
+        return self._ready[start:end]
+
+    def _fill(self) -> bool:
+        """Collapse the next stretch of whole rows into ``_ready``; False at the end."""
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._ready, self._pending, self._offset = self._collapsed(self._pending), b"", 0
+            return False
+        self._pending += chunk
+        # A blank row can't reach past the start of the row after it, so
+        # everything before the last row start can be collapsed now.
+        cut = self._pending.rfind(_ROW_START)
+        if cut < 0:
+            cut = max(len(self._pending) - len(_ROW_START) + 1, 0)
+        if cut > 0:
+            self._ready, self._offset = self._collapsed(self._pending[:cut]), 0
+            self._pending = self._pending[cut:]
+        return True
+
+    @staticmethod
+    def _collapsed(data: bytes) -> bytes:
+        if b"/>" not in data:
+            return data  # no empty cell in it: nothing to take out
+        start = data.find(_ROW_START)
+        end = data.find(b"</sheetData")
+        if end < 0:
+            end = len(data)
+        if not 0 <= start < end or data.find(b"/>", start, end) < 0:
+            return data
+        rows = data[start:end]
+        # Past the last cell with anything in it, every row is blank: the
+        # trailing run of provisioned rows is found without matching each one.
+        last = max(rows.rfind(b"</v>"), rows.rfind(b"</is>"), rows.rfind(b"<f"))
+        blank_from = 0 if last < 0 else rows.find(_ROW_START, last)
+        if blank_from < 0:
+            blank_from = len(rows)
+        return b"".join(
+            (
+                data[:start],
+                _BLANK_ROW.sub(rb"<row\1/>", rows[:blank_from]),
+                _blank_run(rows[blank_from:]),
+                data[end:],
+            )
+        )
+
+
+def _blank_run(rows: bytes) -> bytes:
+    """A run of blank rows, as its last row alone if every row says its number."""
+    tags = _ROW_TAG.findall(rows)
+    if tags and all(_ROW_NUMBER.search(attrs) for attrs in tags):
+        return b"<row%s/>" % tags[-1]
+    return _BLANK_ROW.sub(rb"<row\1/>", rows)
+
+
+def _inline_text(cell: ET.Element) -> Optional[str]:
+    inline = cell.find(_INLINE)
+    if inline is None:
+        return None
+    if inline.find(_RUN) is not None:
+        raise Unsupported(f"rich inline string in {cell.get('r')}")
+    return inline.findtext(_TEXT) or ""
@@ -2,9 +2,9 @@
 value came from.
 
 The critical output is the coordinate map: for each (node, record index,
-property) the reader records the exact cell (sheet + A1 reference). That is what
-lets validation translate an engine error like "'ten' is not of type 'integer'"
-into "Sheet subject, cell D5". Values are coerced toward their schema types only
+property) the reader can give the exact cell (sheet + A1 reference). That is
+what lets validation translate an engine error like "'ten' is not of type
+'integer'" into "Sheet subject, cell D5". Values are coerced toward their schema types only
 where unambiguous; anything that can't be coerced is passed through untouched so
 the validator reports it rather than the reader masking it.
 """
@@ -12,19 +12,34 @@ the validator reports it rather than the reader masking it.
 from __future__ import annotations
 
 import datetime as _dt
+from array import array
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import openpyxl
 
 from gen3_metadata_templates.constants import (
     FIRST_DATA_ROW,
-    HINT_ROW,
+    HEADER_ROW,
     LIST_SPLIT_CHAR,
-    META_SHEET,
+    READ_ENGINE_NATIVE,
 )
 from gen3_metadata_templates.model import ColumnKind, ColumnSpec, NodeTemplate, TemplateSpec
+from gen3_metadata_templates.workbook.embed import unpack_spec
 
 
 @dataclass(frozen=True)
@@ -39,6 +54,64 @@ class CellRef:
     def a1(self) -> str:
         return f"{self.column_letter}{self.row}"
 
+    @property
+    def label(self) -> str:
+        """The cell as a report shows it, without the sheet."""
+        return self.a1
+
+    @property
+    def row_label(self) -> str:
+        return f"row {self.row}"
+
+    @property
+    def location(self) -> str:
+        return f"{self.sheet}!{self.a1}"
+
+
+@dataclass(frozen=True)
+class LineRef(CellRef):
+    """A value's place in a text export: ``row`` is its line in the file ``sheet``.
+
+    ``column_letter`` is the column a spreadsheet program would show it in,
+    or empty for a JSON-lines record, which is all on one line.
+    """
+
+    @property
+    def label(self) -> str:
+        if self.column_letter:
+            return f"line {self.row}, column {self.column_letter}"
+        return f"line {self.row}"
+
+    @property
+    def row_label(self) -> str:
+        return f"line {self.row}"
+
+    @property
+    def location(self) -> str:
+        return f"{self.sheet}, {self.label}"
+
+
+@dataclass
+class SheetCoords:
+    """Where one node's records came from, compactly.
+
+    A record's cells all sit on one row, and every row of a sheet shares one
+    header map, so this keeps just the sheet name, the column letter of each
+    mapped property, and the Excel row of each record. :meth:`cell` builds the
+    :class:`CellRef` only when a finding actually needs it.
+    """
+
+    sheet: str
+    columns: Dict[str, str] = field(default_factory=dict)  # prop_name -> column letter
+    rows: array = field(default_factory=lambda: array("I"))  # record index -> Excel row
+    ref_type: Type[CellRef] = CellRef  # LineRef for a text export
+
+    def cell(self, index: int, prop: str) -> Optional[CellRef]:
+        letter = self.columns.get(prop)
+        if letter is None or not 0 <= index < len(self.rows):
+            return None
+        return self.ref_type(self.sheet, self.rows[index], letter)
+
 
 @dataclass
 class ParsedWorkbook:
@@ -46,17 +119,21 @@ class ParsedWorkbook:
 
     records: Dict[str, List[dict]] = field(default_factory=dict)
     warnings: List[str] = field(default_factory=list)
-    # node -> list (per record) of {prop_name: CellRef}
-    _coords: Dict[str, List[Dict[str, CellRef]]] = field(default_factory=dict)
+    # node -> where each of its records came from
+    _coords: Dict[str, SheetCoords] = field(default_factory=dict)
     # node -> {prop_name: header} for columns that were expected but missing
     missing_columns: Dict[str, List[str]] = field(default_factory=dict)
 
     def coord(self, node: str, index: int, prop: str) -> Optional[CellRef]:
-        """The cell a value came from, or None if it can't be located."""
+        """The cell a value came from, or None if it can't be located.
+
+        Blank cells of a record can be located too, so "required but empty"
+        can still point at the exact cell.
+        """
         node_coords = self._coords.get(node)
-        if node_coords is None or index >= len(node_coords):
+        if node_coords is None:
             return None
-        return node_coords[index].get(prop)
+        return node_coords.cell(index, prop)
 
 
 def _col_letter(index_zero_based: int) -> str:
@@ -69,59 +146,73 @@ def coerce_cell(value: Any, col: ColumnSpec) -> Any:
     Coercion is deliberately conservative: it fixes the mismatches Excel
     introduces (numbers arriving as floats, dates as datetimes) but never forces
     a value that doesn't fit — a non-numeric string in an integer column is
-    returned unchanged so the validator flags it.
+    returned unchanged so the validator flags it. Text is stripped, and blank
+    text reads as None.
     """
-    if value is None:
-        return None
-    if isinstance(value, str):
-        value = value.strip()
-        if value == "":
-            return None
+    return column_coercer(col)(value)
 
-    if col.kind is ColumnKind.LINK:
-        return _fold_link(value, col)
 
-    if col.is_multi:  # array-valued property
-        return _split_list(value, col)
+def column_coercer(col: ColumnSpec) -> Callable[[Any], Any]:
+    """The function :func:`coerce_cell` applies for ``col``, to call on each of its cells.
 
-    return _coerce_scalar(value, col.data_type)
+    The column's kind and type decide which one; looking that up once per
+    sheet rather than once per cell is what the reader does.
+    """
+    if col.kind is ColumnKind.LINK:
+        return _fold_links if col.is_multi else _fold_link
+    if col.is_multi:  # array-valued property
+        return _split_list
+    return _SCALAR_COERCERS.get(col.data_type, _to_text)
 
 
-def _coerce_scalar(value: Any, data_type: str) -> Any:
-    if data_type == "integer":
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, float) and value.is_integer():
+def _to_integer(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
             return int(value)
-        if isinstance(value, str):
-            try:
-                return int(value)
-            except ValueError:
-                return value
-        return value
+        except ValueError:
+            return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
 
-    if data_type == "number":
-        if isinstance(value, str):
-            try:
-                return float(value)
-            except ValueError:
-                return value
-        return value
 
-    if data_type == "boolean":
-        if isinstance(value, bool):
+def _to_number(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
             return value
-        if isinstance(value, (int, float)) and value in (0, 1):
-            return bool(value)
-        if isinstance(value, str):
-            lowered = value.lower()
-            if lowered in ("true", "yes"):
-                return True
-            if lowered in ("false", "no"):
-                return False
+    return value
+
+
+def _to_boolean(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        lowered = value.lower()
+        if lowered in ("true", "yes"):
+            return True
+        if lowered in ("false", "no"):
+            return False
         return value
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    return value
+
 
-    # string / enum: normalise numbers and dates to clean text.
+def _to_text(value: Any) -> Any:
+    """String and enum columns: normalise numbers and dates to clean text."""
+    if isinstance(value, str):
+        return value.strip() or None
     if isinstance(value, bool):
         return value
     if isinstance(value, (int, float)):
@@ -131,138 +222,300 @@ def _coerce_scalar(value: Any, data_type: str) -> Any:
     return value
 
 
-def _split_list(value: Any, col: ColumnSpec) -> Any:
-    """Split a ';'-separated cell into a list, coercing each item."""
+_SCALAR_COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "integer": _to_integer,
+    "number": _to_number,
+    "boolean": _to_boolean,
+}
+
+
+def _split_list(value: Any) -> Any:
+    """Split a ';'-separated cell into a list of text items."""
     if not isinstance(value, str):
-        return _coerce_scalar(value, "string")
-    parts = [p.strip() for p in value.split(LIST_SPLIT_CHAR) if p.strip()]
-    item_type = "string"  # array item type; enums/strings both read as text here
-    return [_coerce_scalar(p, item_type) for p in parts]
+        return _to_text(value)
+    if not value.strip():
+        return None
+    return [p for p in (part.strip() for part in value.split(LIST_SPLIT_CHAR)) if p]
 
 
-def _fold_link(value: Any, col: ColumnSpec) -> Any:
-    """Turn a foreign-key cell into the reference shape gen3_validator expects.
+def _link_text(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return value.strip() or None
+    if value is None:
+        return None
+    return str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
 
-    A single parent becomes ``{"submitter_id": "id"}``; a to-many link with a
-    ';'-separated cell becomes a list of such dicts.
+
+def _fold_link(value: Any) -> Any:
+    """Turn a foreign-key cell into the reference shape gen3_validator expects:
+    ``{"submitter_id": "id"}``.
     """
-    text = str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
-    if col.is_multi:
-        parts = [p.strip() for p in text.split(LIST_SPLIT_CHAR) if p.strip()]
-        return [{"submitter_id": p} for p in parts]
-    return {"submitter_id": text}
+    text = _link_text(value)
+    return None if text is None else {"submitter_id": text}
+
+
+def _fold_links(value: Any) -> Any:
+    """A to-many link: a ';'-separated cell becomes a list of ``{"submitter_id": ...}``."""
+    text = _link_text(value)
+    if text is None:
+        return None
+    parts = [p for p in (part.strip() for part in text.split(LIST_SPLIT_CHAR)) if p]
+    return [{"submitter_id": p} for p in parts]
 
 
 def read_meta(workbook_path: Union[str, Path]) -> Optional[dict]:
     """Read the hidden ``_g3mt`` metadata sheet, if present.
 
     Returns a dict with ``schema_file``/``target_node``/``path`` and a
-    ``node_sheets`` map, or None if the workbook has no metadata sheet.
+    ``node_sheets`` map, or None if the workbook has no metadata sheet. For a
+    TSV bundle, the same is read from its ``_g3mt.json``.
+    """
+    from gen3_metadata_templates.workbook.handle import WorkbookHandle
+
+    with WorkbookHandle(workbook_path) as wb:
+        return wb.meta()
+
+
+def _meta_from_rows(rows: Iterable[Sequence[Any]]) -> dict:
+    """The metadata dict from the ``_g3mt`` sheet's rows of (key, value)."""
+    meta: Dict[str, Any] = {}
+    node_sheets: Dict[str, str] = {}
+    in_map = False
+    for row in rows:
+        key, value = (*row, None, None)[:2]
+        if key is None:
+            continue
+        if key == "node" and value == "sheet":
+            in_map = True
+            continue
+        if in_map:
+            node_sheets[str(key)] = str(value)
+        else:
+            meta[str(key)] = value
+    meta["node_sheets"] = node_sheets
+    return meta
+
+
+def data_start_row(meta: Optional[dict]) -> int:
+    """The first data row recorded in a workbook's metadata.
+
+    Workbooks written before layouts were recorded all use the grid layout.
     """
-    wb = openpyxl.load_workbook(workbook_path, data_only=True, read_only=True)
-    try:
-        if META_SHEET not in wb.sheetnames:
-            return None
-        ws = wb[META_SHEET]
-        meta: Dict[str, Any] = {}
-        node_sheets: Dict[str, str] = {}
-        in_map = False
-        for row in ws.iter_rows(values_only=True):
-            key, value = (row + (None, None))[:2]
-            if key is None:
-                continue
-            if key == "node" and value == "sheet":
-                in_map = True
-                continue
-            if in_map:
-                node_sheets[str(key)] = str(value)
-            else:
-                meta[str(key)] = value
-        meta["node_sheets"] = node_sheets
-        return meta
-    finally:
-        wb.close()
-
-
-def read_workbook(workbook_path: Union[str, Path], spec: TemplateSpec) -> ParsedWorkbook:
-    """Parse a filled workbook into per-node records using ``spec`` as the map."""
-    wb = openpyxl.load_workbook(workbook_path, data_only=True)
-    parsed = ParsedWorkbook()
     try:
-        for node_template in spec.nodes:
-            _read_node_sheet(wb, node_template, parsed)
-    finally:
-        wb.close()
-    return parsed
+        return int(str((meta or {}).get("first_data_row") or FIRST_DATA_ROW))
+    except ValueError:
+        return FIRST_DATA_ROW
 
 
-def _read_node_sheet(wb, node_template: NodeTemplate, parsed: ParsedWorkbook) -> None:
-    node = node_template.node
+def read_embedded_spec(workbook_path: Union[str, Path]) -> Optional[TemplateSpec]:
+    """The spec the workbook was written from, if it carries a trustworthy one.
+
+    Needs no schema, so a workbook's records can be read with
+    ``read_workbook(path, read_embedded_spec(path))`` before the schema has even
+    been loaded. Returns None for workbooks made before specs were embedded, or
+    whose embedded copy fails its hash check.
+    """
+    return unpack_spec(read_meta(workbook_path))
+
+
+def read_workbook(
+    workbook_path: Union[str, Path],
+    spec: TemplateSpec,
+    *,
+    first_data_row: Optional[int] = None,
+    engine: str = READ_ENGINE_NATIVE,
+    workers: int = 1,
+) -> ParsedWorkbook:
+    """Parse a filled workbook into per-node records using ``spec`` as the map.
+
+    ``workbook_path`` may also be a TSV bundle (see
+    :mod:`gen3_metadata_templates.workbook.tsv`). To read the metadata and the
+    records from one open, use a
+    :class:`~gen3_metadata_templates.workbook.handle.WorkbookHandle`.
+
+    :param first_data_row: the 1-indexed row records start on. Defaults to
+        the one the workbook's metadata records (see :func:`data_start_row`),
+        which is where its layout (or a TSV bundle) puts them.
+    :param engine: ``"native"`` (the default) parses the sheet XML directly
+        (see :mod:`gen3_metadata_templates.workbook.native`), falling back to
+        openpyxl for any workbook it can't read identically; ``"openpyxl"``
+        always uses openpyxl. Both give the same records.
+    :param workers: processes the native parser may spread a large workbook's
+        node sheets over; the default, ``1``, reads serially. Workbooks with
+        little sheet XML are always read serially.
+    """
+    from gen3_metadata_templates.workbook.handle import WorkbookHandle
+
+    with WorkbookHandle(workbook_path, engine=engine, workers=workers) as wb:
+        return wb.read(spec, first_data_row=first_data_row)
+
+
+def iter_workbook_records(
+    workbook_path: Union[str, Path],
+    spec: TemplateSpec,
+    *,
+    first_data_row: Optional[int] = None,
+    engine: str = READ_ENGINE_NATIVE,
+    parsed: Optional[ParsedWorkbook] = None,
+) -> Iterator[Tuple[str, int, dict, SheetCoords]]:
+    """Yield a filled workbook's records one at a time, in sheet order.
+
+    Each item is ``(node, index, record, coords)``: ``index`` counts the node's
+    records from 0, as :func:`read_workbook`'s lists would, and ``coords`` is
+    the node's :class:`SheetCoords`, so ``coords.cell(index, prop)`` locates a
+    value. The records are the ones :func:`read_workbook` returns, but only the
+    current one is kept; what the reader learns about each sheet (warnings,
+    missing columns, coordinates) goes on ``parsed``, if given, as the sheet
+    is reached. Its ``records`` stay empty.
+
+    The arguments are as for :func:`read_workbook`; sheets are always read
+    in this process.
+    """
+    from gen3_metadata_templates.workbook.handle import WorkbookHandle
+
+    with WorkbookHandle(workbook_path, engine=engine) as wb:
+        yield from wb.iter_records(spec, first_data_row=first_data_row, parsed=parsed)
+
+
+def _read_node_sheet(
+    wb, node_template: NodeTemplate, parsed: ParsedWorkbook, first_data_row: int
+) -> None:
+    records = list(_iter_node_sheet(wb, node_template, parsed, first_data_row))
+    parsed.records[node_template.node] = records
+
+
+def _iter_node_sheet(
+    wb, node_template: NodeTemplate, parsed: ParsedWorkbook, first_data_row: int
+) -> Iterator[dict]:
+    """Stream the records of one node sheet of an openpyxl workbook."""
     sheet_name = node_template.sheet_name
     if sheet_name not in wb.sheetnames:
-        parsed.warnings.append(
-            f"Sheet '{sheet_name}' (node '{node}') is missing — its records were skipped."
-        )
-        parsed.records[node] = []
-        parsed._coords[node] = []
+        _sheet_missing(node_template, parsed)
         return
 
     ws = wb[sheet_name]
+    # Don't trust the sheet's recorded dimensions: some programs write them
+    # wrong, and read-only mode would then cut rows or columns off.
+    ws.reset_dimensions()
+    rows = enumerate(ws.iter_rows(min_row=HEADER_ROW, values_only=True), start=HEADER_ROW)
+    yield from _iter_records(rows, node_template, sheet_name, parsed, first_data_row)
+
+
+def _sheet_missing(node_template: NodeTemplate, parsed: ParsedWorkbook) -> None:
+    parsed.warnings.append(
+        f"Sheet '{node_template.sheet_name}' (node '{node_template.node}') is missing — "
+        f"its records were skipped."
+    )
+    parsed.records[node_template.node] = []
+    parsed._coords[node_template.node] = SheetCoords(node_template.sheet_name)
+
+
+def _iter_records(
+    rows: Iterable[Tuple[int, Sequence[Any]]],
+    node_template: NodeTemplate,
+    sheet_name: str,
+    parsed: ParsedWorkbook,
+    first_data_row: int,
+    *,
+    aliases: Optional[Mapping[str, Optional[str]]] = None,
+    ref_type: Type[CellRef] = CellRef,
+) -> Iterator[dict]:
+    """Map the header, then yield each record of a node sheet's ``(row number, values)``.
+
+    Rows may skip numbers (blank rows left out) and may stop short of the last
+    mapped column. Without a row on ``HEADER_ROW``, no column is recognised.
+    The header's warnings and missing columns, and the sheet's
+    :class:`SheetCoords`, go on ``parsed`` before the first record is yielded;
+    each record's row is added to those coordinates just before it is.
+
+    :param aliases: other names a header may go by, as ``{header: spec
+        header}``; an alias to None is a header to skip without a warning.
+    :param ref_type: what the sheet's coordinates locate values with.
+    """
+    node = node_template.node
+    rows = iter(rows)
+    first = next(rows, None)
+    header: Sequence[Any] = ()
+    if first is not None and first[0] == HEADER_ROW:
+        header = first[1]
+    columns = _map_headers(header, node_template, sheet_name, parsed, aliases)
+    width = columns[-1][0] + 1 if columns else 0
+    coords = parsed._coords[node] = SheetCoords(
+        sheet_name,
+        {spec_col.prop_name: letter for _, spec_col, letter in columns},
+        ref_type=ref_type,
+    )
+
+    readers = [
+        (col_idx, spec_col.prop_name, column_coercer(spec_col)) for col_idx, spec_col, _ in columns
+    ]
+    record_rows = coords.rows
+    for row_idx, values in rows:
+        if row_idx < first_data_row:
+            continue
+        if len(values) < width:
+            values = [*values, *([None] * (width - len(values)))]
+        record = _read_row(values, readers)
+        if record is None:
+            continue
+        record["type"] = node
+        record_rows.append(row_idx)
+        yield record
 
-    # Map header text -> (column index, ColumnSpec) from row 1.
-    header_to_col: Dict[int, ColumnSpec] = {}
+
+def _map_headers(
+    headers: Sequence[Any],
+    node_template: NodeTemplate,
+    sheet_name: str,
+    parsed: ParsedWorkbook,
+    aliases: Optional[Mapping[str, Optional[str]]] = None,
+) -> List[Tuple[int, ColumnSpec, str]]:
+    """The ``(column index, ColumnSpec, column letter)`` of each recognised header.
+
+    Headers not in the spec are warned about, and spec columns with no header
+    are recorded in ``parsed.missing_columns``.
+    """
+    columns: List[Tuple[int, ColumnSpec, str]] = []
     seen_headers = set()
-    for col_idx in range(ws.max_column):
-        header = ws.cell(HINT_ROW - 1, col_idx + 1).value  # HEADER_ROW == 1
+    for col_idx, header in enumerate(headers):
         if header is None:
             continue
         header = str(header).strip()
+        if aliases and header in aliases:
+            header = aliases[header]
+        if not header:
+            continue
         spec_col = node_template.column_by_header(header)
         if spec_col is None:
             parsed.warnings.append(
                 f"Column '{header}' on sheet '{sheet_name}' is not in the schema — ignored."
             )
             continue
-        header_to_col[col_idx] = spec_col
+        columns.append((col_idx, spec_col, _col_letter(col_idx)))
         seen_headers.add(header)
 
     missing = [c.prop_name for c in node_template.columns if c.header not in seen_headers]
     if missing:
-        parsed.missing_columns[node] = missing
+        parsed.missing_columns[node_template.node] = missing
+    return columns
 
-    records: List[dict] = []
-    coords: List[Dict[str, CellRef]] = []
-    for row_idx in range(FIRST_DATA_ROW, ws.max_row + 1):
-        record, row_coords = _read_row(ws, row_idx, header_to_col, sheet_name)
-        if record is None:
-            continue
-        record["type"] = node
-        records.append(record)
-        coords.append(row_coords)
 
-    parsed.records[node] = records
-    parsed._coords[node] = coords
+def _read_row(
+    values: Sequence[Any], readers: List[Tuple[int, str, Callable[[Any], Any]]]
+) -> Optional[dict]:
+    """Read one data row into a record, or None if it's blank.
 
-
-def _read_row(ws, row_idx: int, header_to_col: Dict[int, ColumnSpec], sheet_name: str):
-    """Read one data row; return (record, coord_map) or (None, {}) if blank."""
+    ``readers`` holds ``(column index, prop_name, coercer)`` for each mapped
+    column; ``values`` holds the row's raw values by 0-indexed column, at
+    least as far as the last of them.
+    """
     record: dict = {}
-    row_coords: Dict[str, CellRef] = {}
-    any_value = False
-
-    for col_idx, spec_col in header_to_col.items():
-        raw = ws.cell(row_idx, col_idx + 1).value
-        ref = CellRef(sheet_name, row_idx, _col_letter(col_idx))
-        # Record the coordinate even for blanks so "required but empty" errors
-        # can still point at the exact cell.
-        row_coords[spec_col.prop_name] = ref
-
-        coerced = coerce_cell(raw, spec_col)
+    for col_idx, prop_name, coerce in readers:
+        raw = values[col_idx]
+        if raw is None or raw == "":
+            continue
+        coerced = coerce(raw)
         if coerced is None or coerced == []:
             continue
-        any_value = True
-        record[spec_col.prop_name] = coerced
-
-    if not any_value:
-        return None, {}
-    return record, row_coords
+        record[prop_name] = coerced
+    return record or None
@@ -0,0 +1,186 @@
+"""Write and read the TSV bundle: a template as one tab-separated file per node.
+
+Pipelines that produce metadata programmatically don't need dropdowns or
+comments, and Excel is slow to write and to parse at scale. The bundle carries
+the same template as plain text: ``<node>.tsv`` for every node, in
+``spec.node_order``, each with the workbook's column headers on line 1 and
+records from line 2, plus ``_g3mt.json`` holding exactly what the ``_g3mt``
+sheet holds (including the embedded spec). It is written as a ``.zip``, or as
+a directory for any other output path. ``read_meta``/``read_workbook`` and
+therefore ``validate`` accept either form in place of a workbook.
+
+A value is located by file, line and column letter — the cell a spreadsheet
+program shows when it opens the file — so findings point at it the same way.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterator, Optional, Tuple, Union
+
+from gen3_metadata_templates.constants import (
+    BUNDLE_META_FILE,
+    LAYOUT_TSV,
+    TSV_FIRST_DATA_ROW,
+)
+from gen3_metadata_templates.errors import WorkbookFormatError
+from gen3_metadata_templates.model import NodeTemplate, TemplateSpec
+from gen3_metadata_templates.sources import long_csv_rows
+from gen3_metadata_templates.workbook.reader import (
+    ParsedWorkbook,
+    SheetCoords,
+    _iter_records,
+)
+from gen3_metadata_templates.workbook.writer import metadata_rows
+
+# Fixed zip member date, as for workbooks, so bundles are deterministic.
+_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+def node_filename(node: str) -> str:
+    return f"{node}.tsv"
+
+
+def is_tsv_bundle(path: Union[str, Path]) -> bool:
+    """Whether ``path`` is a TSV bundle (a .zip, or a directory) rather than a workbook."""
+    path = Path(path)
+    return path.suffix.lower() == ".zip" or path.is_dir()
+
+
+def write_tsv_bundle(spec: TemplateSpec, output_path: Union[str, Path]) -> Path:
+    """Write ``spec`` as a TSV bundle: a .zip if the path ends in ``.zip``, else a directory.
+
+    Each node file holds just its header line. Returns the path written.
+    """
+    output_path = Path(output_path)
+    files = [(node_filename(nt.node), _header_line(nt)) for nt in spec.nodes]
+    files.append((BUNDLE_META_FILE, _meta_json(spec)))
+
+    if output_path.suffix.lower() == ".zip":
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, text in files:
+                info = zipfile.ZipInfo(name, date_time=_ZIP_DATE)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, text)
+    else:
+        output_path.mkdir(parents=True, exist_ok=True)
+        for name, text in files:
+            (output_path / name).write_text(text, encoding="utf-8", newline="")
+    return output_path
+
+
+def _header_line(node_template: NodeTemplate) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter="\t", lineterminator="\n").writerow(
+        col.header for col in node_template.columns
+    )
+    return buffer.getvalue()
+
+
+def _meta_json(spec: TemplateSpec) -> str:
+    meta: Dict[str, object] = dict(
+        metadata_rows(spec, data_rows=0, layout=LAYOUT_TSV, first_data_row=TSV_FIRST_DATA_ROW)
+    )
+    meta["node_files"] = {nt.node: node_filename(nt.node) for nt in spec.nodes}
+    return json.dumps(meta, indent=2) + "\n"
+
+
+@contextmanager
+def _opened(path: Path) -> Iterator:
+    """Yield ``open(name)``, returning a text stream for a bundle member or None."""
+    if path.is_dir():
+
+        def open_dir(name: str) -> Optional[IO[str]]:
+            member = path / name
+            if not member.is_file():
+                return None
+            return open(member, newline="", encoding="utf-8-sig")
+
+        yield open_dir
+        return
+
+    try:
+        zf = zipfile.ZipFile(path)
+    except (OSError, zipfile.BadZipFile) as exc:
+        raise WorkbookFormatError(f"'{path}' is not a readable TSV bundle ({exc}).") from None
+    names = set(zf.namelist())
+
+    def open_zip(name: str) -> Optional[IO[str]]:
+        if name not in names:
+            return None
+        return io.TextIOWrapper(zf.open(name), encoding="utf-8-sig", newline="")
+
+    try:
+        yield open_zip
+    finally:
+        zf.close()
+
+
+def read_bundle_meta(path: Union[str, Path]) -> Optional[dict]:
+    """The bundle's ``_g3mt.json``, shaped like :func:`read_meta`'s result; None if absent."""
+    with _opened(Path(path)) as open_member:
+        handle = open_member(BUNDLE_META_FILE)
+        if handle is None:
+            return None
+        with handle:
+            try:
+                raw = json.load(handle)
+            except ValueError as exc:
+                raise WorkbookFormatError(
+                    f"{BUNDLE_META_FILE} in '{path}' is not valid JSON ({exc})."
+                ) from None
+    if not isinstance(raw, dict):
+        return None
+    node_files = raw.pop("node_files", None) or {}
+    meta = {str(k): v for k, v in raw.items()}
+    meta["node_sheets"] = {str(k): str(v) for k, v in node_files.items()}
+    return meta
+
+
+def read_tsv_bundle(
+    path: Union[str, Path],
+    spec: TemplateSpec,
+    *,
+    first_data_row: int = TSV_FIRST_DATA_ROW,
+) -> ParsedWorkbook:
+    """Parse a filled TSV bundle into per-node records using ``spec`` as the map."""
+    parsed = ParsedWorkbook()
+    for node_template in spec.nodes:
+        parsed.records[node_template.node] = []
+    for node, record in iter_tsv_bundle(path, spec, parsed, first_data_row=first_data_row):
+        parsed.records[node].append(record)
+    return parsed
+
+
+def iter_tsv_bundle(
+    path: Union[str, Path],
+    spec: TemplateSpec,
+    parsed: ParsedWorkbook,
+    *,
+    first_data_row: int = TSV_FIRST_DATA_ROW,
+) -> Iterator[Tuple[str, dict]]:
+    """Yield ``(node, record)`` from a filled TSV bundle, a line at a time.
+
+    Each file's warnings, missing columns and coordinates go on ``parsed`` as
+    the file is reached.
+    """
+    with _opened(Path(path)) as open_member:
+        for node_template in spec.nodes:
+            node = node_template.node
+            name = node_filename(node)
+            handle = open_member(name)
+            if handle is None:
+                parsed.warnings.append(
+                    f"File '{name}' (node '{node}') is missing — its records were skipped."
+                )
+                parsed._coords[node] = SheetCoords(name)
+                continue
+            with handle:
+                rows = enumerate(long_csv_rows(csv.reader(handle, delimiter="\t")), start=1)
+                for record in _iter_records(rows, node_template, name, parsed, first_data_row):
+                    yield node, record
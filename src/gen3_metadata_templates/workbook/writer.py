@@ -3,70 +3,271 @@
 Each node becomes a sheet with styled headers, a locked hint row, description
 comments, enum dropdowns, and cross-sheet dropdowns for parent links. Two guide
 sheets (Instructions, Dictionary) and two hidden sheets (metadata, enum backing
-lists) round out the workbook. The writer is the only place that knows the
-xlsxwriter API; everything it needs comes from the ColumnSpec model.
+lists) round out the workbook. In the table layout each node sheet is instead
+an Excel Table that grows as rows are added, with the hints in the comments.
+Compact templates drop the header comments for short input messages on the
+data cells, leaving the full text to the Dictionary sheet.
+The writer is the only place that knows the xlsxwriter API; everything it
+needs comes from the ColumnSpec model.
 """
 
 from __future__ import annotations
 
+import io
 import json
+import math
+import os
+import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 import xlsxwriter
 
 from gen3_metadata_templates import __version__
 from gen3_metadata_templates.constants import (
     DEFAULT_DATA_ROWS,
+    DEFAULT_TABLE_ROWS,
     DICTIONARY_SHEET,
+    EXCEL_MAX_ROWS,
+    FIRST_DATA_ROW,
     INSTRUCTIONS_SHEET,
+    LAYOUT_GRID,
+    LAYOUT_TABLE,
+    LAYOUTS,
     LIST_SPLIT_CHAR,
     LISTS_SHEET,
     MAX_INLINE_LIST_LEN,
+    MAX_INPUT_MESSAGE_LEN,
+    MAX_INPUT_TITLE_LEN,
     META_FORMAT,
     META_SHEET,
+    PRIMARY_KEY,
+    TABLE_FIRST_DATA_ROW,
 )
+from gen3_metadata_templates.errors import G3mtError
 from gen3_metadata_templates.model import ColumnKind, ColumnSpec, NodeTemplate, TemplateSpec
-from gen3_metadata_templates.workbook.naming import enum_range, named_range
+from gen3_metadata_templates.workbook.embed import pack_spec_rows
+from gen3_metadata_templates.workbook.naming import enum_range, named_range, table_name
+
+if TYPE_CHECKING:
+    from gen3_metadata_templates.workbook.cache import WorkbookCache
+
+# Stamped as the workbook's created/modified date instead of "now", so the same
+# spec always produces the same bytes. In memory mode xlsxwriter dates every
+# zip member 1/1/1980; this is the matching document-level date.
+FIXED_CREATED = datetime(1980, 1, 1, tzinfo=timezone.utc)
 
 
 def write_template(
     spec: TemplateSpec,
-    output_path: Union[str, Path],
+    output_path: Union[str, Path, IO[bytes]],
     *,
-    data_rows: int = DEFAULT_DATA_ROWS,
+    data_rows: Optional[int] = None,
     protect_headers: bool = True,
+    layout: str = LAYOUT_GRID,
+    compact_comments: bool = False,
+    cache: Optional["WorkbookCache"] = None,
 ) -> None:
     """Write ``spec`` to an .xlsx workbook at ``output_path``.
 
+    ``output_path`` may also be a binary file-like object (a ``BytesIO``, a
+    response stream). Either way the workbook is built in memory, with no
+    temporary files. The output is deterministic: the same spec and options
+    always give the same bytes, whatever they are written to.
+
     :param data_rows: number of blank, unlocked rows provisioned per node sheet.
-    :param protect_headers: lock the header and hint rows so they can't be edited.
+        Defaults to ``DEFAULT_DATA_ROWS`` for the grid layout and
+        ``DEFAULT_TABLE_ROWS`` for the table layout.
+    :param protect_headers: lock the header and hint rows so they can't be
+        edited. Ignored for the table layout, whose sheets must stay
+        unprotected for the table to grow.
+    :param layout: ``"grid"`` (a fixed block of rows under a hint row) or
+        ``"table"`` (an Excel Table per sheet that extends as rows are added).
+    :param compact_comments: instead of a comment on every header cell, give
+        each column's data cells a short input message (shown when a cell is
+        selected) and leave the full descriptions and allowed values to the
+        Dictionary sheet. Much smaller, and faster to open, for wide templates.
+    :param cache: a :class:`~gen3_metadata_templates.workbook.cache.WorkbookCache`;
+        an identical earlier request is then copied from it instead of rewritten.
+    :raises ValueError: for an unknown ``layout``.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'; expected one of: {', '.join(LAYOUTS)}.")
+    data_rows = default_data_rows(layout) if data_rows is None else data_rows
+    if cache is not None:
+        cache.write(
+            spec,
+            output_path,
+            data_rows=data_rows,
+            protect_headers=protect_headers,
+            layout=layout,
+            compact_comments=compact_comments,
+        )
+        return
+
+    # Always assembled in memory: xlsxwriter otherwise stages every part in a
+    # temporary file, and its two modes stamp the zip members differently, so
+    # this also keeps file and stream output byte-identical.
+    target = output_path if hasattr(output_path, "write") else str(output_path)
+    workbook = xlsxwriter.Workbook(target, {"strings_to_numbers": False, "in_memory": True})
+    _write_workbook(workbook, spec, data_rows, protect_headers, layout, compact_comments)
+
+
+def fill_template(
+    spec: TemplateSpec,
+    output_path: Union[str, Path, IO[bytes]],
+    records: Mapping[str, Iterable[Mapping[str, Any]]],
+    *,
+    data_rows: Optional[int] = None,
+    protect_headers: bool = True,
+    compact_comments: bool = False,
+) -> Dict[str, int]:
+    """Write ``spec`` as a template already holding ``records``.
+
+    ``records`` maps a node to its records, in the shape the reader produces
+    (``{prop_name: value}``; a link as ``{"submitter_id": ...}`` or a list of
+    them). Keys may also be the column header or a Gen3-style
+    ``<link>.submitter_id``, so rows from a TSV export fit as they are. Links
+    and lists are written back as ``;``-joined text, so reading the workbook
+    gives the records back.
+
+    Rows are streamed straight to disk (xlsxwriter's ``constant_memory``
+    mode), one node sheet at a time in row order, so memory stays flat however
+    many rows there are; each node's iterable is consumed exactly once. Only
+    the grid layout can be filled — Excel Tables need the whole sheet in memory.
+
+    :param data_rows: blank rows provisioned after the filled ones
+        (default ``DEFAULT_DATA_ROWS``).
+    :param compact_comments: as for :func:`write_template`.
+    :returns: the number of rows written per node.
+    :raises G3mtError: if a sheet would exceed Excel's row limit. Nothing is
+        written to ``output_path`` then: a file is only put in place once the
+        whole workbook has been written.
+    """
+    data_rows = DEFAULT_DATA_ROWS if data_rows is None else data_rows
+    options = {"strings_to_numbers": False, "constant_memory": True}
+    if hasattr(output_path, "write"):
+        # xlsxwriter writes to a stream only when the workbook is closed.
+        workbook = xlsxwriter.Workbook(output_path, options)
+        return _write_workbook(
+            workbook, spec, data_rows, protect_headers, LAYOUT_GRID, compact_comments, records
+        )
+
+    # The records are only counted as they're written, so the workbook goes to
+    # a temporary file beside the output and is renamed into place on success.
+    output_path = Path(output_path)
+    fd, tmp = tempfile.mkstemp(prefix=".g3mt-", suffix=".xlsx", dir=str(output_path.parent))
+    os.close(fd)
+    try:
+        workbook = xlsxwriter.Workbook(tmp, options)
+        filled = _write_workbook(
+            workbook, spec, data_rows, protect_headers, LAYOUT_GRID, compact_comments, records
+        )
+        os.replace(tmp, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return filled
+
+
+def _write_workbook(
+    workbook,
+    spec: TemplateSpec,
+    data_rows: int,
+    protect_headers: bool,
+    layout: str,
+    compact_comments: bool,
+    records: Optional[Mapping[str, Iterable[Mapping[str, Any]]]] = None,
+) -> Dict[str, int]:
+    """Write every sheet, in order, and close the workbook. Returns rows filled per node.
+
+    Every sheet is written strictly top to bottom, which ``constant_memory``
+    mode (used when filling) requires.
     """
-    workbook = xlsxwriter.Workbook(str(output_path), {"strings_to_numbers": False})
+    _set_properties(workbook, spec)
     fmts = _build_formats(workbook)
 
-    _write_instructions(workbook, spec, fmts)
+    _write_instructions(workbook, spec, fmts, layout, compact_comments)
 
     lists_sheet = workbook.add_worksheet(LISTS_SHEET)
     lists_sheet.hide()
-    lists_state = {"col": 0}  # next free column on the lists sheet
+    # The distinct long enums, in column order, the defined name already given
+    # to each, and every name used so far. Written out once all sheets are done.
+    lists_state = {"columns": [], "by_values": {}, "names": set()}
 
+    filled: Dict[str, int] = {}
     for node_template in spec.nodes:
-        _write_node_sheet(
+        rows = records.get(node_template.node) if records is not None else None
+        filled[node_template.node] = _write_node_sheet(
             workbook,
             node_template,
             spec,
             fmts,
             data_rows,
             protect_headers,
-            lists_sheet,
+            layout,
+            compact_comments,
             lists_state,
+            rows,
         )
 
+    _write_enum_lists(lists_sheet, lists_state)
     _write_dictionary(workbook, spec, fmts)
-    _write_meta(workbook, spec, fmts, data_rows)
+    _write_meta(workbook, spec, fmts, data_rows, layout)
 
     workbook.close()
+    return filled
+
+
+def template_bytes(
+    spec: TemplateSpec,
+    *,
+    data_rows: Optional[int] = None,
+    protect_headers: bool = True,
+    layout: str = LAYOUT_GRID,
+    compact_comments: bool = False,
+    cache: Optional["WorkbookCache"] = None,
+) -> bytes:
+    """The .xlsx for ``spec`` as bytes, built in memory — for serving over HTTP.
+
+    Takes the same options as :func:`write_template`.
+    """
+    buffer = io.BytesIO()
+    write_template(
+        spec,
+        buffer,
+        data_rows=data_rows,
+        protect_headers=protect_headers,
+        layout=layout,
+        compact_comments=compact_comments,
+        cache=cache,
+    )
+    return buffer.getvalue()
+
+
+def default_data_rows(layout: str) -> int:
+    """How many data rows a sheet gets when the caller doesn't say."""
+    return DEFAULT_TABLE_ROWS if layout == LAYOUT_TABLE else DEFAULT_DATA_ROWS
+
+
+def first_data_row_for(layout: str) -> int:
+    """The 1-indexed row where data starts on a node sheet in ``layout``."""
+    return TABLE_FIRST_DATA_ROW if layout == LAYOUT_TABLE else FIRST_DATA_ROW
+
+
+def _set_properties(workbook, spec: TemplateSpec) -> None:
+    """Fixed document properties: nothing that depends on when or where we ran."""
+    workbook.set_properties(
+        {
+            "title": f"{spec.category or spec.target_node} metadata template",
+            "comments": f"Generated by gen3-metadata-templates {__version__}",
+            "created": FIXED_CREATED,
+        }
+    )
 
 
 def _build_formats(workbook) -> dict:
@@ -161,6 +362,30 @@ def _comment_text(col: ColumnSpec, spec: TemplateSpec) -> str:
     return "\n".join(lines)
 
 
+def _input_note(col: ColumnSpec, spec: TemplateSpec, layout: str) -> Tuple[str, str]:
+    """The (title, message) input message a compact template shows for a column.
+
+    Excel caps these at 32 and 255 characters, so the description is cut to
+    fit and the message points to the Dictionary sheet for the rest.
+    """
+    head = [_hint_text(col)] if layout == LAYOUT_TABLE else []
+    tail = []
+    if col.kind is ColumnKind.LINK:
+        tail.append(
+            f"Enter a submitter_id from the '{_sheet_for_node(spec, col.link_target)}' sheet."
+        )
+    tail.append(f"More on the '{DICTIONARY_SHEET}' sheet.")
+    description = col.description or ""
+    room = MAX_INPUT_MESSAGE_LEN - len("\n".join(head + tail)) - 1
+    if len(description) > room:
+        description = description[: max(room - 1, 0)].rstrip() + "…"
+    lines = head + ([description] if description else []) + tail
+    title = col.header
+    if len(title) > MAX_INPUT_TITLE_LEN:
+        title = title[: MAX_INPUT_TITLE_LEN - 1] + "…"
+    return title, "\n".join(lines)
+
+
 def _sheet_for_node(spec: TemplateSpec, node: Optional[str]) -> str:
     nt = spec.node_template(node) if node else None
     return nt.sheet_name if nt else (node or "")
@@ -173,26 +398,48 @@ def _write_node_sheet(
     fmts: dict,
     data_rows: int,
     protect_headers: bool,
-    lists_sheet,
+    layout: str,
+    compact_comments: bool,
     lists_state: dict,
-) -> None:
+    records: Optional[Iterable[Mapping[str, Any]]] = None,
+) -> int:
+    """Write one node sheet, with ``records`` in its first data rows; returns how many."""
     sheet = workbook.add_worksheet(node_template.sheet_name)
-    first_data_row = 2  # 0-indexed row 2 == Excel row 3
-    last_data_row = first_data_row + data_rows - 1
+    table = layout == LAYOUT_TABLE
+    first_data_row = first_data_row_for(layout) - 1  # 0-indexed
 
+    data_fmts = []
     for col_idx, col in enumerate(node_template.columns):
-        header_fmt = fmts["header_required"] if col.required else fmts["header_optional"]
-        sheet.write(0, col_idx, col.header, header_fmt)
-        sheet.write(1, col_idx, _hint_text(col), fmts["hint"])
-        sheet.write_comment(0, col_idx, _comment_text(col, spec), {"x_scale": 2.2, "y_scale": 1.6})
+        if table:
+            # The table writes the header cells; the hint goes into the comment.
+            comment = f"{_comment_text(col, spec)}\n\n{_hint_text(col)}"
+        else:
+            header_fmt = fmts["header_required"] if col.required else fmts["header_optional"]
+            sheet.write(0, col_idx, col.header, header_fmt)
+            comment = _comment_text(col, spec)
+        if not compact_comments:
+            sheet.write_comment(0, col_idx, comment, {"x_scale": 2.2, "y_scale": 1.6})
 
         # Column width + default (unlocked) data format so submitters can type.
         width = min(max(len(col.header) + 2, 14), 40)
         data_fmt = (
             fmts["data_general"] if col.data_type in ("integer", "number") else fmts["data_text"]
         )
+        data_fmts.append(data_fmt)
         sheet.set_column(col_idx, col_idx, width, data_fmt)
 
+    if not table:
+        # A row at a time: constant_memory mode flushes a row once the next starts.
+        for col_idx, col in enumerate(node_template.columns):
+            sheet.write(1, col_idx, _hint_text(col), fmts["hint"])
+
+    filled = 0
+    if records is not None:
+        filled = _write_records(sheet, node_template, records, first_data_row, data_fmts)
+    # Blank rows are provisioned below the records only as far as Excel goes.
+    last_data_row = min(first_data_row + filled + data_rows, EXCEL_MAX_ROWS) - 1
+
+    for col_idx, col in enumerate(node_template.columns):
         _apply_validation(
             workbook,
             sheet,
@@ -201,22 +448,142 @@ def _write_node_sheet(
             first_data_row,
             last_data_row,
             spec,
-            lists_sheet,
             lists_state,
+            _input_note(col, spec, layout) if compact_comments else None,
         )
 
+    last_col = max(len(node_template.columns) - 1, 0)
+    if table:
+        _add_table(workbook, sheet, node_template, fmts, last_data_row, last_col)
+        return filled
+
     # A workbook-scoped name pointing at this sheet's submitter_id column, so
     # child sheets can build cross-sheet dropdowns from it.
-    pk_end = first_data_row + data_rows
     workbook.define_name(
         named_range(node_template.node),
-        f"='{node_template.sheet_name}'!$A${first_data_row + 1}:$A${pk_end}",
+        f"='{node_template.sheet_name}'!$A${first_data_row + 1}:$A${last_data_row + 1}",
     )
 
     sheet.freeze_panes(2, 1)
-    sheet.autofilter(0, 0, 0, max(len(node_template.columns) - 1, 0))
+    sheet.autofilter(0, 0, 0, last_col)
     if protect_headers:
         sheet.protect()
+    return filled
+
+
+def _write_records(
+    sheet,
+    node_template: NodeTemplate,
+    records: Iterable[Mapping[str, Any]],
+    first_row: int,
+    data_fmts: list,
+) -> int:
+    """Write ``records`` one row each from ``first_row`` (0-indexed); returns the count."""
+    columns = [
+        (i, col, _record_keys(col), data_fmts[i]) for i, col in enumerate(node_template.columns)
+    ]
+    row = first_row - 1
+    for row, record in enumerate(records, start=first_row):
+        if row >= EXCEL_MAX_ROWS:
+            raise G3mtError(
+                f"Sheet '{node_template.sheet_name}' would need more than Excel's "
+                f"{EXCEL_MAX_ROWS:,} rows. Split the records across several workbooks."
+            )
+        for col_idx, col, keys, fmt in columns:
+            value = None
+            for key in keys:
+                value = record.get(key)
+                if value is not None:
+                    break
+            value = _cell_value(value, col)
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                sheet.write_boolean(row, col_idx, value, fmt)
+            elif isinstance(value, (int, float)):
+                sheet.write_number(row, col_idx, value, fmt)
+            else:
+                sheet.write_string(row, col_idx, value, fmt)
+    return row - first_row + 1
+
+
+def _record_keys(col: ColumnSpec) -> Tuple[str, ...]:
+    """Where a record may keep this column's value, most specific first."""
+    keys = [col.prop_name, col.header]
+    if col.kind is ColumnKind.LINK:
+        keys.append(f"{col.prop_name}.{PRIMARY_KEY}")
+    return tuple(dict.fromkeys(keys))
+
+
+def _cell_value(value: Any, col: ColumnSpec) -> Any:
+    """A record value as the cell the reader turns back into that value.
+
+    Links (``{"submitter_id": ...}`` or a list of them) become the ids, and
+    lists become ``;``-joined text. Text in a numeric or boolean column is
+    written as a number/boolean when it cleanly is one, as Excel would store it.
+    NaN and infinities, which no cell can hold as a number, are written as
+    text, so validation reports them rather than the write failing.
+    """
+    if value is None or value == "" or value == []:
+        return None
+    if col.kind is ColumnKind.LINK:
+        items = value if isinstance(value, list) else [value]
+        ids = [str(v.get(PRIMARY_KEY, "")) if isinstance(v, dict) else str(v) for v in items]
+        return LIST_SPLIT_CHAR.join(i for i in ids if i) or None
+    if isinstance(value, (list, tuple)):
+        return LIST_SPLIT_CHAR.join(str(v) for v in value)
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    if col.data_type in ("integer", "number"):
+        try:
+            number = float(text)
+        except ValueError:
+            return text
+        if not math.isfinite(number):
+            return text
+        if col.data_type == "integer" and number.is_integer() and "." not in text:
+            return int(number)
+        return number
+    if col.data_type == "boolean" and text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    return text
+
+
+def _add_table(
+    workbook, sheet, node_template: NodeTemplate, fmts: dict, last_row: int, last_col: int
+) -> None:
+    """Turn a node sheet into an Excel Table that grows as rows are typed below it.
+
+    Excel carries a table's data validation and formats down into each new row,
+    and the ``ids_<node>`` name is a structured reference to the table's
+    submitter_id column, so child-sheet dropdowns follow the table as it grows.
+    """
+    name = table_name(node_template.node)
+    sheet.add_table(
+        0,
+        0,
+        last_row,
+        last_col,
+        {
+            "name": name,
+            "style": "Table Style Light 1",
+            "columns": [
+                {
+                    "header": col.header,
+                    "header_format": (
+                        fmts["header_required"] if col.required else fmts["header_optional"]
+                    ),
+                }
+                for col in node_template.columns
+            ],
+        },
+    )
+    pk_header = node_template.columns[0].header if node_template.columns else PRIMARY_KEY
+    workbook.define_name(named_range(node_template.node), f"={name}[{pk_header}]")
+    sheet.freeze_panes(1, 1)
 
 
 def _apply_validation(
@@ -227,46 +594,46 @@ def _apply_validation(
     first_row: int,
     last_row: int,
     spec: TemplateSpec,
-    lists_sheet,
     lists_state: dict,
+    input_note: Optional[Tuple[str, str]] = None,
 ) -> None:
-    """Attach an Excel dropdown to a column where it makes sense."""
+    """Attach an Excel dropdown to a column where it makes sense.
+
+    ``input_note`` is a (title, message) shown when a cell in the column is
+    selected; a column with no dropdown gets a validation that only carries it.
+    """
+    options = _validation_options(workbook, col, spec, lists_state)
+    if input_note is not None:
+        title, message = input_note
+        options = {**(options or {"validate": "any"})}
+        options.update({"input_title": title, "input_message": message})
+    if options:
+        sheet.data_validation(first_row, col_idx, last_row, col_idx, options)
+
+
+def _validation_options(
+    workbook, col: ColumnSpec, spec: TemplateSpec, lists_state: dict
+) -> Optional[dict]:
+    """The xlsxwriter data-validation options for a column's dropdown, if it has one."""
     # Foreign-key column -> pick from the parent sheet's submitter_id column.
     if col.kind is ColumnKind.LINK and not col.is_multi:
         parent_nt = spec.node_template(col.link_target)
-        if parent_nt is not None:
-            parent_sheet = parent_nt.sheet_name
-            sheet.data_validation(
-                first_row,
-                col_idx,
-                last_row,
-                col_idx,
-                {
-                    "validate": "list",
-                    "source": f"={named_range(col.link_target)}",
-                    "error_type": "warning",
-                    "error_title": "Unknown ID",
-                    "error_message": (
-                        f"Pick a submitter_id from the '{parent_sheet}' sheet, or type "
-                        f"it if you will add that row later."
-                    ),
-                },
-            )
-        return
+        if parent_nt is None:
+            return None
+        return {
+            "validate": "list",
+            "source": f"={named_range(col.link_target)}",
+            "error_type": "warning",
+            "error_title": "Unknown ID",
+            "error_message": (
+                f"Pick a submitter_id from the '{parent_nt.sheet_name}' sheet, or type "
+                f"it if you will add that row later."
+            ),
+        }
 
     # Boolean -> TRUE/FALSE.
     if col.data_type == "boolean":
-        sheet.data_validation(
-            first_row,
-            col_idx,
-            last_row,
-            col_idx,
-            {
-                "validate": "list",
-                "source": ["TRUE", "FALSE"],
-            },
-        )
-        return
+        return {"validate": "list", "source": ["TRUE", "FALSE"]}
 
     # Enum (single value only) -> dropdown of allowed values.
     if col.enum and not col.is_multi:
@@ -274,38 +641,53 @@ def _apply_validation(
         if len(joined) <= MAX_INLINE_LIST_LEN:
             source = list(col.enum)
         else:
-            source = _write_enum_list(lists_sheet, lists_state, workbook, col)
-        sheet.data_validation(
-            first_row,
-            col_idx,
-            last_row,
-            col_idx,
-            {
-                "validate": "list",
-                "source": source,
-                "error_type": "stop",
-                "error_title": "Not an allowed value",
-                "error_message": "Choose one of the values from the dropdown.",
-            },
-        )
+            source = _enum_list_name(lists_state, workbook, col)
+        return {
+            "validate": "list",
+            "source": source,
+            "error_type": "stop",
+            "error_title": "Not an allowed value",
+            "error_message": "Choose one of the values from the dropdown.",
+        }
+    return None
 
 
-def _write_enum_list(lists_sheet, lists_state: dict, workbook, col: ColumnSpec) -> str:
-    """Write a long enum's values down a hidden column and return its range name.
+def _enum_list_name(lists_state: dict, workbook, col: ColumnSpec) -> str:
+    """Give a long enum a column on the hidden lists sheet and return its range name.
 
     Excel rejects an inline dropdown list longer than 255 characters, so long
-    enums live on a hidden sheet and are referenced by a defined name.
+    enums live on a hidden sheet and are referenced by a defined name. Columns
+    that share a value list (ontology-backed enums often do, across many
+    sheets) share one column and one name. The values themselves are written
+    by :func:`_write_enum_lists` once every sheet is done.
     """
-    col_idx = lists_state["col"]
-    for row_idx, value in enumerate(col.enum):
-        lists_sheet.write(row_idx, col_idx, value)
+    values = tuple(col.enum)
+    name = lists_state["by_values"].get(values)
+    if name is not None:
+        return f"={name}"
+
+    col_idx = len(lists_state["columns"])
     letter = _col_letter(col_idx)
     name = enum_range(col.prop_name, col.header)
-    workbook.define_name(name, f"='{LISTS_SHEET}'!${letter}$1:${letter}${len(col.enum)}")
-    lists_state["col"] += 1
+    if name in lists_state["names"]:
+        # Same property name with a different list on another sheet.
+        name = f"{name}_{col_idx}"
+    workbook.define_name(name, f"='{LISTS_SHEET}'!${letter}$1:${letter}${len(values)}")
+    lists_state["columns"].append(values)
+    lists_state["by_values"][values] = name
+    lists_state["names"].add(name)
     return f"={name}"
 
 
+def _write_enum_lists(lists_sheet, lists_state: dict) -> None:
+    """Write the collected enum lists side by side, a row at a time."""
+    columns = lists_state["columns"]
+    for row_idx in range(max((len(values) for values in columns), default=0)):
+        for col_idx, values in enumerate(columns):
+            if row_idx < len(values):
+                lists_sheet.write(row_idx, col_idx, values[row_idx])
+
+
 def _col_letter(index: int) -> str:
     """0-indexed column number -> Excel column letter(s)."""
     letters = ""
@@ -368,7 +750,47 @@ def _fill_order_lines(spec: TemplateSpec, fmts: dict) -> List[tuple]:
     return lines
 
 
-def _write_instructions(workbook, spec: TemplateSpec, fmts: dict) -> None:
+def _layout_lines(layout: str, fmts: dict, compact_comments: bool) -> List[tuple]:
+    """The "Required vs optional" block, which depends on where the hints live."""
+    lines: List[tuple] = []
+    if compact_comments:
+        lines = [
+            (
+                "Select a cell under a header to see a short note about that column. "
+                f"Full descriptions and allowed values are on the '{DICTIONARY_SHEET}' sheet.",
+                fmts["wrap"],
+            ),
+            ("", fmts["wrap"]),
+        ]
+    if layout == LAYOUT_TABLE:
+        where = "Select a cell under" if compact_comments else "Hover over"
+        return lines + [
+            (
+                f"Dark blue headers are required; light headers are optional. {where} "
+                "a header to see its type and whether it is required.",
+                fmts["wrap"],
+            ),
+            ("", fmts["wrap"]),
+            (
+                "Do not edit the header row. To add rows, just type in the row below "
+                "the last one — the table grows to include it, dropdowns and all.",
+                fmts["wrap"],
+            ),
+        ]
+    return lines + [
+        (
+            "Dark blue headers are required; light headers are optional. The grey "
+            "hint row under each header tells you the type and whether it is required.",
+            fmts["wrap"],
+        ),
+        ("", fmts["wrap"]),
+        ("Do not edit the header row or the hint row.", fmts["wrap"]),
+    ]
+
+
+def _write_instructions(
+    workbook, spec: TemplateSpec, fmts: dict, layout: str, compact_comments: bool
+) -> None:
     sheet = workbook.add_worksheet(INSTRUCTIONS_SHEET)
     sheet.hide_gridlines(2)
     sheet.set_column(0, 0, 100)
@@ -411,13 +833,11 @@ def _write_instructions(workbook, spec: TemplateSpec, fmts: dict) -> None:
             ),
             ("", fmts["wrap"]),
             ("Required vs optional", fmts["subtitle"]),
-            (
-                "Dark blue headers are required; light headers are optional. The grey "
-                "hint row under each header tells you the type and whether it is required.",
-                fmts["wrap"],
-            ),
-            ("", fmts["wrap"]),
-            ("Do not edit the header row or the hint row.", fmts["wrap"]),
+        ]
+    )
+    lines.extend(_layout_lines(layout, fmts, compact_comments))
+    lines.extend(
+        [
             ("", fmts["wrap"]),
             ("When you are done, validate your file with:", fmts["subtitle"]),
             ("    g3mt validate <this_file>.xlsx --schema <schema.json>", fmts["wrap"]),
@@ -465,16 +885,18 @@ def _write_dictionary(workbook, spec: TemplateSpec, fmts: dict) -> None:
     sheet.autofilter(0, 0, 0, len(headers) - 1)
 
 
-def _write_meta(workbook, spec: TemplateSpec, fmts: dict, data_rows: int) -> None:
-    """Hidden sheet recording how the workbook was generated, so validate can
-    recover the schema and the sheets it contains automatically.
+def metadata_rows(
+    spec: TemplateSpec, *, data_rows: int, layout: str, first_data_row: int
+) -> List[Tuple[str, str]]:
+    """The ``(key, value)`` pairs describing how a template was generated.
 
     ``target_node`` and ``path`` describe only the primary target and are kept
     so that an older g3mt install can still read a workbook written by this one.
-    ``node_order`` is the authoritative list of sheets for anything newer.
+    ``node_order`` is the authoritative list of sheets for anything newer, and
+    the embedded spec (``spec_hash`` plus its packed parts) lets the reader map
+    columns without rebuilding them from the schema first. ``layout`` and
+    ``first_data_row`` tell the reader where records start on each node sheet.
     """
-    sheet = workbook.add_worksheet(META_SHEET)
-    sheet.hide()
     rows = [
         ("g3mt_version", __version__),
         ("schema_file", Path(spec.schema_path).name),
@@ -488,7 +910,23 @@ def _write_meta(workbook, spec: TemplateSpec, fmts: dict, data_rows: int) -> Non
         ("target_paths", json.dumps({t: list(p) for t, p in spec.paths.items()})),
         ("selection_category", spec.category or ""),
         ("data_rows", str(data_rows)),
+        ("layout", layout),
+        ("first_data_row", str(first_data_row)),
     ]
+    rows.extend(pack_spec_rows(spec))
+    return rows
+
+
+def _write_meta(workbook, spec: TemplateSpec, fmts: dict, data_rows: int, layout: str) -> None:
+    """Hidden sheet recording how the workbook was generated (see
+    :func:`metadata_rows`), so validate can recover the schema and the sheets
+    it contains automatically.
+    """
+    sheet = workbook.add_worksheet(META_SHEET)
+    sheet.hide()
+    rows = metadata_rows(
+        spec, data_rows=data_rows, layout=layout, first_data_row=first_data_row_for(layout)
+    )
     for row_idx, (key, value) in enumerate(rows):
         sheet.write(row_idx, 0, key, fmts["meta_key"])
         sheet.write(row_idx, 1, value)
@@ -0,0 +1,107 @@
+"""Tests for batch generation (:mod:`gen3_metadata_templates.batch` and
+``g3mt generate-batch``).
+
+The promise of the batch command is that it is only faster, never different:
+each workbook must be exactly what ``g3mt generate`` writes for the same
+selection, down to the byte.
+"""
+
+from __future__ import annotations
+
+import pytest
+from typer.testing import CliRunner
+
+from gen3_metadata_templates.batch import (
+    BatchSelection,
+    every_category,
+    every_node,
+    plan_batch,
+    run_batch,
+)
+from gen3_metadata_templates.cli import app
+from gen3_metadata_templates.constants import DEFAULT_EXCLUDED_NODES
+from gen3_metadata_templates.errors import SelectionError
+
+runner = CliRunner()
+
+
+def test_selection_parsing():
+    assert BatchSelection.parse("category:clinical") == BatchSelection(category="clinical")
+    assert BatchSelection.parse(" subject, sample ,subject") == BatchSelection(
+        nodes=("subject", "sample")
+    )
+    with pytest.raises(SelectionError):
+        BatchSelection.parse(" , ")
+
+
+def test_every_node_skips_excluded_nodes(mini_bundle):
+    nodes = {s.nodes[0] for s in every_node(mini_bundle, DEFAULT_EXCLUDED_NODES)}
+    assert "subject" in nodes
+    assert not nodes & set(DEFAULT_EXCLUDED_NODES)
+
+
+def test_every_category_skips_categories_with_nothing_left(mini_bundle, tmp_path):
+    """A category made only of excluded nodes is reported as skipped, not fatal."""
+    plan = plan_batch(mini_bundle, every_category(mini_bundle), tmp_path, skip_empty=True)
+    planned = {job.selection.category for job in plan.jobs}
+    assert "biospecimen" in planned
+    assert all(label.startswith("category:") for label, _ in plan.skipped)
+
+
+def test_selections_writing_the_same_file_are_skipped_with_a_reason(mini_bundle, tmp_path):
+    """A later selection that would overwrite an earlier one's workbook is reported, not lost."""
+    subject = BatchSelection(nodes=("subject",))
+    plan = plan_batch(
+        mini_bundle, [subject, BatchSelection(category="biospecimen"), subject], tmp_path
+    )
+    assert [job.selection for job in plan.jobs] == [subject, BatchSelection(category="biospecimen")]
+    assert plan.skipped == [("subject", "same output file as subject (subject_template.xlsx).")]
+
+    plan.merge(plan_batch(mini_bundle, every_node(mini_bundle, DEFAULT_EXCLUDED_NODES), tmp_path))
+    outputs = [job.output for job in plan.jobs]
+    assert len(outputs) == len(set(outputs))
+    assert (
+        plan.skipped.count(("subject", "same output file as subject (subject_template.xlsx).")) == 2
+    )
+
+
+def test_batch_output_matches_single_generate(mini_schema_path, mini_bundle, tmp_path):
+    """A batch workbook is byte-for-byte what `g3mt generate` writes."""
+    single = tmp_path / "single.xlsx"
+    result = runner.invoke(
+        app, ["generate", mini_schema_path, "--category", "biospecimen", "-o", str(single)]
+    )
+    assert result.exit_code == 0
+
+    plan = plan_batch(mini_bundle, [BatchSelection(category="biospecimen")], tmp_path / "batch")
+    (written,) = run_batch(plan.jobs)
+    assert written.output.read_bytes() == single.read_bytes()
+
+
+def test_process_pool_writes_every_workbook(mini_bundle, tmp_path):
+    """With several workers, results still come back in job order."""
+    selections = every_node(mini_bundle, DEFAULT_EXCLUDED_NODES)
+    plan = plan_batch(mini_bundle, selections, tmp_path)
+    results = run_batch(plan.jobs, data_rows=10, workers=2)
+    assert [r.output for r in results] == [job.output for job in plan.jobs]
+    assert all(r.output.exists() and r.size > 0 for r in results)
+
+
+def test_cli_generate_batch_writes_and_summarises(mini_schema_path, tmp_path):
+    out_dir = tmp_path / "templates"
+    args = ["generate-batch", mini_schema_path, "--every-category", "--select", "subject,visit"]
+    result = runner.invoke(app, args + ["-d", str(out_dir), "--rows", "10"])
+    assert result.exit_code == 0, result.output
+    assert (out_dir / "subject_visit_template.xlsx").exists()
+    assert (out_dir / "biospecimen_template.xlsx").exists()
+    assert "Wrote" in result.output
+
+    # Running again without --force refuses to overwrite.
+    again = runner.invoke(app, args + ["-d", str(out_dir)])
+    assert again.exit_code == 2
+
+
+def test_cli_generate_batch_needs_a_selection(mini_schema_path, tmp_path):
+    result = runner.invoke(app, ["generate-batch", mini_schema_path, "-d", str(tmp_path)])
+    assert result.exit_code == 2
+    assert "Nothing selected" in result.output
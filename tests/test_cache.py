@@ -0,0 +1,212 @@
+"""Tests for spec serialisation and :mod:`gen3_metadata_templates.cache`.
+
+A spec is a pure function of the schema and the selection, so it can be stored
+and reused. These tests pin down the two halves of that: the JSON form
+round-trips to an *equal* spec (so reused specs write identical workbooks), and
+the cache really does skip column derivation on a hit — while never serving a
+spec built from different inputs.
+"""
+
+from __future__ import annotations
+
+import json
+
+import openpyxl
+import pytest
+
+from gen3_metadata_templates import (
+    SpecCache,
+    TemplateSpec,
+    WorkbookCache,
+    build_multi_template_spec,
+    build_spec_for_nodes,
+    build_template_spec,
+    template_bytes,
+    validate_workbook,
+    write_template,
+)
+from gen3_metadata_templates import model as model_module
+from gen3_metadata_templates.constants import DEFAULT_EXCLUDED_NODES
+from gen3_metadata_templates.selection import resolve_selection
+
+
+@pytest.fixture()
+def count_derivations(monkeypatch):
+    """Count how many times columns are actually derived from the schema."""
+    calls = {"n": 0}
+    real = model_module._link_columns
+
+    def counting(*args, **kwargs):
+        calls["n"] += 1
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(model_module, "_link_columns", counting)
+    return calls
+
+
+# --- serialisation ---------------------------------------------------------
+
+
+def test_spec_round_trips_to_an_equal_spec(mini_bundle):
+    """``from_json(to_json(spec))`` must give back an equal spec.
+
+    Cached and embedded specs are only safe to use in place of a freshly built
+    one if nothing — enums, link multiplicity, depth, paths — is lost on the way.
+    """
+    selection = resolve_selection(
+        mini_bundle, ["sample", "assay_file"], excluded_nodes=DEFAULT_EXCLUDED_NODES
+    )
+    spec = build_multi_template_spec(mini_bundle, selection)
+    again = TemplateSpec.from_json(spec.to_json())
+
+    assert again == spec
+    assert again.node_order == spec.node_order
+    assert list(again.paths) == list(spec.paths)  # order survives, not just contents
+
+
+def test_json_is_deterministic(mini_bundle):
+    """Building the same spec twice gives byte-identical JSON and the same hash."""
+    first = build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+    second = build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+    assert first.to_json() == second.to_json()
+    assert first.content_hash == second.content_hash
+
+
+def test_unknown_spec_format_is_refused(mini_bundle):
+    """A spec written by an incompatible layout is rejected rather than misread."""
+    data = build_template_spec(mini_bundle, "visit", ["subject", "visit"]).to_dict()
+    data["spec_format"] = 999
+    with pytest.raises(ValueError):
+        TemplateSpec.from_dict(data)
+
+
+def test_round_tripped_spec_writes_the_same_sheets(mini_bundle, tmp_path):
+    """A deserialised spec drives the writer exactly like the original."""
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "visit", "sample"])
+    write_template(TemplateSpec.from_json(spec.to_json()), tmp_path / "a.xlsx", data_rows=5)
+    ws = openpyxl.load_workbook(tmp_path / "a.xlsx")["sample"]
+    assert [c.value for c in ws[1]] == [c.header for c in spec.node_template("sample").columns]
+
+
+# --- SpecCache ---------------------------------------------------------------
+
+
+def test_cache_hit_skips_derivation(mini_bundle, count_derivations):
+    """The second identical request is served without touching the schema."""
+    cache = SpecCache()
+    first = build_spec_for_nodes(mini_bundle, ["subject", "sample"], cache=cache)
+    derived = count_derivations["n"]
+    second = build_spec_for_nodes(mini_bundle, ["subject", "sample"], cache=cache)
+
+    assert count_derivations["n"] == derived
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second == first
+    assert second is not first  # a fresh object, so callers can't corrupt the cache
+
+
+def test_different_inputs_are_different_entries(mini_bundle):
+    """Excluded columns are part of the key: a narrower spec is never reused."""
+    cache = SpecCache()
+    full = build_spec_for_nodes(mini_bundle, ["subject"], cache=cache)
+    narrow = build_spec_for_nodes(
+        mini_bundle, ["subject"], excluded_columns=["type", "age"], cache=cache
+    )
+    assert cache.misses == 2
+    assert full.node_template("subject").column_by_prop("age") is not None
+    assert narrow.node_template("subject").column_by_prop("age") is None
+
+
+def test_lru_evicts_the_oldest_entry(mini_bundle):
+    cache = SpecCache(maxsize=1)
+    build_spec_for_nodes(mini_bundle, ["subject"], cache=cache)
+    build_spec_for_nodes(mini_bundle, ["subject", "visit"], cache=cache)
+    build_spec_for_nodes(mini_bundle, ["subject"], cache=cache)
+    assert len(cache) == 1
+    assert cache.misses == 3
+
+
+def test_disk_cache_survives_a_new_process(mini_bundle, tmp_path, count_derivations):
+    """A directory-backed cache serves a spec built by an earlier cache instance."""
+    build_spec_for_nodes(mini_bundle, ["subject"], cache=SpecCache(directory=tmp_path))
+    derived = count_derivations["n"]
+
+    fresh = SpecCache(directory=tmp_path)
+    spec = build_spec_for_nodes(mini_bundle, ["subject"], cache=fresh)
+    assert fresh.hits == 1
+    assert count_derivations["n"] == derived
+    assert spec.node_order == ["subject"]
+
+
+def test_corrupt_cache_file_is_rebuilt(mini_bundle, tmp_path):
+    """A damaged file on disk is a miss, never an error."""
+    cache = SpecCache(directory=tmp_path)
+    build_spec_for_nodes(mini_bundle, ["subject"], cache=cache)
+    for path in tmp_path.glob("spec-*.json"):
+        path.write_text("{not json")
+
+    fresh = SpecCache(directory=tmp_path)
+    spec = build_spec_for_nodes(mini_bundle, ["subject"], cache=fresh)
+    assert fresh.misses == 1
+    assert json.loads(next(tmp_path.glob("spec-*.json")).read_text())["nodes"]
+    assert spec.node_order == ["subject"]
+
+
+def test_repeat_validation_reuses_the_spec(mini_bundle, tmp_path, count_derivations):
+    """Validating the same template twice derives its columns only once."""
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+    out = tmp_path / "t.xlsx"
+    write_template(spec, out, data_rows=5)
+
+    cache = SpecCache()
+    validate_workbook(out, mini_bundle.schema_path, spec_cache=cache)
+    derived = count_derivations["n"]
+    report = validate_workbook(out, mini_bundle.schema_path, spec_cache=cache)
+
+    assert report.ok
+    assert cache.hits == 1
+    assert count_derivations["n"] == derived
+
+
+# --- WorkbookCache -----------------------------------------------------------
+
+
+def test_workbook_cache_serves_identical_bytes(mini_bundle, tmp_path, monkeypatch):
+    """A repeat request is a copy of the stored file, not a rewrite."""
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+    cache = WorkbookCache(tmp_path / "cache")
+    write_template(spec, tmp_path / "first.xlsx", data_rows=5, cache=cache)
+
+    monkeypatch.setattr("xlsxwriter.Workbook", None)  # any real write would now fail
+    write_template(spec, tmp_path / "second.xlsx", data_rows=5, cache=cache)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (tmp_path / "second.xlsx").read_bytes() == (tmp_path / "first.xlsx").read_bytes()
+
+
+def test_workbook_cache_keys_on_every_option(mini_bundle, tmp_path):
+    """A different row count or option is a different workbook, never a stale one."""
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+    cache = WorkbookCache(tmp_path / "cache")
+    write_template(spec, tmp_path / "a.xlsx", data_rows=5, cache=cache)
+    write_template(spec, tmp_path / "b.xlsx", data_rows=6, cache=cache)
+    write_template(spec, tmp_path / "c.xlsx", data_rows=6, compact_comments=True, cache=cache)
+    assert cache.misses == 3
+    assert len(list((tmp_path / "cache").glob("workbook-*.xlsx"))) == 3
+
+
+def test_linked_outputs_share_the_cached_file(mini_bundle, tmp_path):
+    spec = build_template_spec(mini_bundle, "visit", ["subject", "visit"])
+    cache = WorkbookCache(tmp_path / "cache", link=True)
+    write_template(spec, tmp_path / "out.xlsx", data_rows=5, cache=cache)
+    (cached,) = (tmp_path / "cache").glob("workbook-*.xlsx")
+    assert (tmp_path / "out.xlsx").samefile(cached)
+
+
+def test_workbook_cache_serves_streams(mini_bundle, tmp_path):
+    """A cached workbook can be handed straight to a response stream."""
+    spec = build_template_spec(mini_bundle, "visit", ["subject", "visit"])
+    cache = WorkbookCache(tmp_path / "cache")
+    first = template_bytes(spec, data_rows=5, cache=cache)
+    second = template_bytes(spec, data_rows=5, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first == second == template_bytes(spec, data_rows=5)
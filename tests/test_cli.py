@@ -27,6 +27,19 @@ def test_generate_writes_a_workbook(mini_schema_path, tmp_path):
     assert "visit" in openpyxl.load_workbook(out).sheetnames
 
 
+def test_generate_table_layout(mini_schema_path, tmp_path):
+    """`--layout table` writes Excel Tables; an unknown layout is a usage error."""
+    out = tmp_path / "visit.xlsx"
+    result = runner.invoke(
+        app, ["generate", mini_schema_path, "visit", "--layout", "table", "-o", str(out)]
+    )
+    assert result.exit_code == 0
+    assert "tbl_visit" in openpyxl.load_workbook(out)["visit"].tables
+
+    bad = runner.invoke(app, ["generate", mini_schema_path, "visit", "--layout", "pivot"])
+    assert bad.exit_code == 2
+
+
 def test_generate_ambiguous_without_path_exits_2(mini_schema_path, tmp_path):
     """An ambiguous target with no --path fails clearly in a non-interactive run.
 
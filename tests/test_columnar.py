@@ -0,0 +1,82 @@
+"""Tests for :mod:`gen3_metadata_templates.workbook.columnar`.
+
+The columns must hold exactly what ``read_workbook`` reads — same records,
+same types, same cells — however they are packed.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from gen3_metadata_templates import build_template_spec, fill_template
+from gen3_metadata_templates.workbook.columnar import pack_records, read_columns
+from gen3_metadata_templates.workbook.reader import ParsedWorkbook, read_workbook
+
+
+@pytest.fixture()
+def filled(mini_bundle, tmp_path):
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "visit", "sample"])
+    out = tmp_path / "filled.xlsx"
+    records = {
+        "subject": [
+            {"submitter_id": "subj_1", "age": 42, "subject_id": "S1"},
+            {"submitter_id": "subj_2", "aliases": ["a", "b"]},
+            {"submitter_id": "subj_3", "age": "n/a"},
+        ],
+        "sample": [
+            {"submitter_id": f"samp_{i}", "subjects": {"submitter_id": "subj_1"}} for i in range(3)
+        ],
+    }
+    fill_template(spec, out, records)
+    return out, spec
+
+
+def test_columns_give_back_the_records_read_workbook_reads(filled):
+    path, spec = filled
+    full = read_workbook(path, spec)
+    sink = ParsedWorkbook()
+    sheets = read_columns(path, spec, parsed=sink)
+
+    assert list(sheets) == spec.node_order
+    for node, records in full.records.items():
+        assert list(sheets[node].records()) == records
+    assert sheets["subject"].rows.tolist() == [3, 4, 5]
+    assert sink.warnings == full.warnings
+
+
+def test_columns_keep_a_null_mask_and_pack_plain_values(filled, tmp_path):
+    path, spec = filled
+    subject = read_columns(path, spec)["subject"]
+    age = subject.column("age")
+    assert list(age.present) == [1, 0, 1]
+    assert isinstance(age.values, list)  # "n/a" must reach the validator as it is
+    assert [age.value(i) for i in range(3)] == [42, None, "n/a"]
+    assert subject.column("aliases").count() == 1
+
+    clean = tmp_path / "clean.xlsx"
+    fill_template(spec, clean, {"subject": [{"submitter_id": "s", "age": 42}, {"age": 7}]})
+    age = read_columns(clean, spec)["subject"].column("age")
+    assert isinstance(age.values, array) and age.values.typecode == "q"
+    assert age.value(0) == 42 and type(age.value(0)) is int
+
+
+def test_a_sheet_with_no_records_is_an_empty_columnar_sheet(filled):
+    path, spec = filled
+    visit = read_columns(path, spec)["visit"]
+    assert len(visit) == 0
+    assert list(visit.records()) == []
+    assert visit.column("submitter_id") is not None
+
+
+def test_a_run_of_records_packs_into_a_sheet_of_its_own(filled):
+    path, spec = filled
+    parsed = ParsedWorkbook()
+    subjects = read_workbook(path, spec).records["subject"]
+    sheets = read_columns(path, spec, parsed=parsed)
+
+    run = pack_records(spec.node_template("subject"), sheets["subject"].coords, subjects[1:], 1)
+    assert list(run.records()) == subjects[1:]
+    assert run.rows.tolist() == [4, 5]
+    assert run.coords.cell(0, "age").a1 == sheets["subject"].coords.cell(1, "age").a1
@@ -0,0 +1,160 @@
+"""Tests for the spec embedded in the ``_g3mt`` sheet.
+
+A generated workbook carries the exact spec it was written from, so its records
+can be read before the schema is resolved. The contract tested here: the spec
+survives the trip through Excel cells intact, a damaged copy is never trusted,
+and validation only reuses the early read when the current schema lays the
+columns out the same way.
+"""
+
+from __future__ import annotations
+
+import time
+
+import openpyxl
+import pytest
+
+from gen3_metadata_templates import (
+    build_spec_for_nodes,
+    build_template_spec,
+    validate_workbook,
+    write_template,
+)
+from gen3_metadata_templates.constants import META_SHEET
+from gen3_metadata_templates.validation import runner as runner_module
+from gen3_metadata_templates.workbook.embed import (
+    SPEC_PART_LEN,
+    pack_spec,
+    pack_spec_rows,
+    unpack_spec,
+)
+from gen3_metadata_templates.workbook.handle import WorkbookHandle
+from gen3_metadata_templates.workbook.reader import read_embedded_spec, read_meta, read_workbook
+
+
+@pytest.fixture()
+def written(mini_bundle, tmp_path):
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+    out = tmp_path / "embedded.xlsx"
+    write_template(spec, out, data_rows=10)
+    return out, spec
+
+
+def _fill_valid(path):
+    wb = openpyxl.load_workbook(path)
+    ws = wb["subject"]
+    headers = {ws.cell(1, c).value: c for c in range(1, ws.max_column + 1)}
+    ws.cell(3, headers["submitter_id"]).value = "subj_1"
+    ws.cell(3, headers["subject_id"]).value = "S1"
+    wb.save(path)
+
+
+def test_pack_and_unpack_round_trip(mini_bundle):
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "visit", "sample"])
+    meta = dict(pack_spec_rows(spec))
+    assert unpack_spec(meta) == spec
+
+
+def test_large_specs_are_split_into_cell_sized_parts(acdc_bundle):
+    """No part may exceed Excel's per-cell character limit."""
+    spec = build_spec_for_nodes(acdc_bundle, acdc_bundle.node_names)
+    _, parts = pack_spec(spec)
+    assert all(len(p) <= SPEC_PART_LEN for p in parts)
+    assert unpack_spec(dict(pack_spec_rows(spec))) == spec
+
+
+def test_written_workbook_carries_its_spec(written):
+    """The spec can be read back from the file alone, with no schema."""
+    path, spec = written
+    assert read_embedded_spec(path) == spec
+
+
+def test_records_can_be_read_before_the_schema(written):
+    """``read_workbook`` works straight from the embedded spec."""
+    path, _ = written
+    _fill_valid(path)
+    parsed = read_workbook(path, read_embedded_spec(path))
+    assert parsed.records["subject"][0]["submitter_id"] == "subj_1"
+
+
+def test_tampered_spec_is_not_trusted(written):
+    """A part that no longer matches the stored hash makes the spec unusable."""
+    path, _ = written
+    meta = read_meta(path)
+    meta["spec_1"] = meta["spec_1"][:-8] + "AAAAAAAA"
+    assert unpack_spec(meta) is None
+
+
+def test_workbook_without_an_embedded_spec_returns_none(written):
+    """Older workbooks (no spec rows) simply have no embedded spec."""
+    path, _ = written
+    wb = openpyxl.load_workbook(path)
+    ws = wb[META_SHEET]
+    for row in range(1, ws.max_row + 1):
+        if str(ws.cell(row, 1).value or "").startswith("spec_"):
+            ws.cell(row, 1).value = None
+            ws.cell(row, 2).value = None
+    wb.save(path)
+    assert read_embedded_spec(path) is None
+
+
+def test_validation_reuses_the_early_read(written, monkeypatch):
+    """When the rebuilt spec matches, the workbook is parsed exactly once."""
+    path, spec = written
+    _fill_valid(path)
+    calls = []
+    real = WorkbookHandle.iter_records
+    monkeypatch.setattr(
+        WorkbookHandle, "iter_records", lambda wb, *a, **kw: calls.append(a) or real(wb, *a, **kw)
+    )
+
+    report = validate_workbook(path, spec.schema_path)
+    assert report.ok
+    assert len(calls) == 1
+
+
+def test_validation_rereads_when_the_layout_differs(written, monkeypatch):
+    """Excluding a column at validation time forces a read through the new spec."""
+    path, spec = written
+    _fill_valid(path)
+    calls = []
+    real = WorkbookHandle.iter_records
+    monkeypatch.setattr(
+        WorkbookHandle, "iter_records", lambda wb, *a, **kw: calls.append(a) or real(wb, *a, **kw)
+    )
+
+    report = validate_workbook(path, spec.schema_path, excluded_columns=["type", "id", "age"])
+    assert len(calls) == 2
+    assert calls[-1][0].node_template("subject").column_by_prop("age") is None
+    assert report.node_counts["subject"][0] == 1
+
+
+def test_the_early_read_stops_at_its_cap_until_the_schema_resolves(written, monkeypatch):
+    """A slow schema doesn't let the read run ahead past the cap; nothing is lost."""
+    path, spec = written
+    wb = openpyxl.load_workbook(path)
+    ws = wb["subject"]
+    headers = {ws.cell(1, c).value: c for c in range(1, ws.max_column + 1)}
+    for row in range(3, 6):
+        ws.cell(row, headers["submitter_id"]).value = f"subj_{row}"
+        ws.cell(row, headers["subject_id"]).value = f"S{row}"
+    wb.save(path)
+
+    real_bundle = runner_module.SchemaBundle
+
+    def slow_bundle(*args, **kwargs):
+        time.sleep(0.2)
+        return real_bundle(*args, **kwargs)
+
+    early_reads = []
+    real_early = runner_module._EarlyRead
+    monkeypatch.setattr(runner_module, "SchemaBundle", slow_bundle)
+    monkeypatch.setattr(runner_module, "_MAX_READ_AHEAD", 2)
+    monkeypatch.setattr(
+        runner_module, "_EarlyRead", lambda *a: early_reads.append(a) or real_early(*a)
+    )
+
+    report = validate_workbook(path, spec.schema_path)
+    assert len(early_reads[0][2]) == 2
+    assert report.ok
+    assert report.node_counts["subject"][0] == 3
@@ -0,0 +1,152 @@
+"""Tests for validating text exports (:mod:`gen3_metadata_templates.workbook.exports`).
+
+An export is checked with the workbook's checks; what differs is how it is
+found (by file, node by ``type`` column or file name) and how a problem is
+located (by file and line).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from gen3_metadata_templates import validate_export
+from gen3_metadata_templates.cli import app
+from gen3_metadata_templates.errors import RecordSourceError
+
+runner = CliRunner()
+
+SUBJECTS = (
+    "type\tid\tsubmitter_id\tsubject_id\tage\taliases\tsex\n"
+    "subject\tu1\tsubj_1\tS1\t42\ta;b\tmale\n"
+    "subject\tu2\tsubj_2\tS2\told\t\t\n"
+)
+SAMPLES = (
+    "type\tsubmitter_id\tsubjects.submitter_id\tsubjects.id\tsample_id\tsample_type\n"
+    "sample\tsamp_1\tsubj_1\tu1\tX1\tBlood\n"
+    "sample\tsamp_2\tsubj_9\t\tX2\tBlood\n"
+    "sample\tsamp_1\tsubj_2\tu2\tX3\tBlood\n"
+)
+
+
+@pytest.fixture()
+def exports(tmp_path):
+    (tmp_path / "subject.tsv").write_text(SUBJECTS, encoding="utf-8")
+    (tmp_path / "sample.tsv").write_text(SAMPLES, encoding="utf-8")
+    return tmp_path
+
+
+def test_gen3_tsv_exports_are_checked_parents_first_and_located_by_line(exports, mini_schema_path):
+    # Passed child-first: the order comes from the schema, not the arguments.
+    report = validate_export([exports / "sample.tsv", exports / "subject.tsv"], mini_schema_path)
+
+    assert list(report.node_counts) == ["subject", "sample"]
+    assert report.node_counts["subject"][0] == 2
+    where = {(f.validator, f.location) for f in report.findings}
+    assert ("type", "subject.tsv, line 3, column E") in where  # age "old"
+    assert ("link", "sample.tsv, line 3, column C") in where  # subj_9 isn't a subject
+    duplicate = next(f for f in report.findings if f.validator == "duplicate")
+    assert duplicate.location == "sample.tsv, line 4, column B"
+    assert "already used on line 2" in duplicate.message
+    assert {f.sheet for f in report.findings} == {"subject.tsv", "sample.tsv"}
+    # type, id and the link's uuid column are expected in an export, not noise.
+    assert not [w for w in report.warnings if "is not in the schema" in w]
+
+
+def test_sqlite_staging_resolves_links_by_any_key_as_memory_does(exports, mini_schema_path):
+    paths = [exports / "subject.tsv", exports / "sample.tsv"]
+    in_memory = validate_export(paths, mini_schema_path)
+    staged = validate_export(paths, mini_schema_path, staging="sqlite", staging_dir=exports)
+    assert staged.findings == in_memory.findings
+    assert not list(exports.glob("*.sqlite"))
+
+
+def test_jsonl_and_csv_records_validate_alike(tmp_path, mini_schema_path):
+    jsonl = tmp_path / "records.jsonl"
+    lines = [
+        {"type": "subject", "submitter_id": "subj_1", "subject_id": "S1", "age": 42},
+        {"type": "subject", "submitter_id": "subj_2", "subject_id": "S2", "age": "old"},
+        {"type": "sample", "submitter_id": "samp_1", "subjects": "subj_1", "extra": 1},
+    ]
+    jsonl.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n", encoding="utf-8")
+    csv_file = tmp_path / "samples.csv"
+    csv_file.write_text(
+        "type,submitter_id,subjects.submitter_id,sample_id,sample_type\n"
+        'sample,samp_2,"subj_2",X2,"Hair"\n',
+        encoding="utf-8",
+    )
+
+    with pytest.raises(RecordSourceError, match="both"):
+        validate_export([jsonl, csv_file], mini_schema_path)
+
+    jsonl.write_text("\n".join(json.dumps(line) for line in lines[:2]), encoding="utf-8")
+    report = validate_export([jsonl, csv_file], mini_schema_path)
+    where = {(f.validator, f.location) for f in report.findings}
+    assert ("type", "records.jsonl, line 2") in where
+    assert ("enum", "samples.csv, line 2, column E") in where
+
+
+def test_jsonl_links_may_be_bare_ids_and_unknown_keys_warn(tmp_path, mini_schema_path):
+    jsonl = tmp_path / "records.jsonl"
+    lines = [
+        {"type": "subject", "submitter_id": "subj_1", "subject_id": "S1"},
+        {"type": "sample", "submitter_id": "s1", "subjects": "subj_1", "sample_id": "X"},
+        {"type": "sample", "submitter_id": "s2", "subjects": {"submitter_id": "nope"}},
+        {"type": "sample", "submitter_id": "s3", "colour": "red", "colour_too": 1},
+    ]
+    jsonl.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+    report = validate_export([jsonl], mini_schema_path)
+
+    links = [f.location for f in report.findings if f.validator == "link"]
+    assert links == ["records.jsonl, line 3"]
+    assert [w for w in report.warnings if "colour" in w] == [
+        "Key 'colour' in 'records.jsonl' is not in the schema for 'sample' — ignored.",
+        "Key 'colour_too' in 'records.jsonl' is not in the schema for 'sample' — ignored.",
+    ]
+
+
+def test_nodes_the_schema_lacks_are_skipped_with_a_warning(tmp_path, mini_schema_path):
+    (tmp_path / "subject.tsv").write_text(SUBJECTS, encoding="utf-8")
+    (tmp_path / "widget.tsv").write_text("submitter_id\nw1\n", encoding="utf-8")
+    report = validate_export([tmp_path / "subject.tsv", tmp_path / "widget.tsv"], mini_schema_path)
+    assert list(report.node_counts) == ["subject"]
+    assert any("'widget' is not in the schema" in w for w in report.warnings)
+
+    with pytest.raises(RecordSourceError, match="None of the nodes"):
+        validate_export([tmp_path / "widget.tsv"], mini_schema_path)
+
+
+def test_standard_input_is_sniffed_and_needs_a_type_column(mini_schema_path):
+    report = validate_export(["-"], mini_schema_path, stdin=io.BytesIO(SUBJECTS.encode()))
+    assert report.node_counts["subject"][0] == 2
+    assert any(f.location == "<stdin>, line 3, column E" for f in report.findings)
+
+    line = json.dumps({"type": "subject", "submitter_id": "s", "subject_id": "S"})
+    assert validate_export(["-"], mini_schema_path, stdin=io.BytesIO(line.encode())).ok
+
+    with pytest.raises(RecordSourceError, match="'type' column"):
+        validate_export(["-"], mini_schema_path, stdin=io.BytesIO(b"submitter_id,age\ns,1\n"))
+
+
+def test_cli_validates_exports_and_rejects_mixing_them_with_a_workbook(exports, mini_schema_path):
+    subject = str(exports / "subject.tsv")
+    result = runner.invoke(
+        app, ["validate", subject, str(exports / "sample.tsv"), "-s", mini_schema_path, "--json"]
+    )
+    assert result.exit_code == 1, result.output
+    cells = {f["cell"] for f in json.loads(result.output)["findings"]}
+    assert "line 3, column E" in cells
+
+    result = runner.invoke(
+        app, ["validate", "-", "-s", mini_schema_path, "--staging", "sqlite"], input=SUBJECTS
+    )
+    assert result.exit_code == 1, result.output
+    assert "<stdin>" in result.output
+    assert "--annotate" not in result.output
+
+    result = runner.invoke(app, ["validate", subject, "book.xlsx", "-s", mini_schema_path])
+    assert result.exit_code != 0
+    assert "book.xlsx" in result.output
@@ -0,0 +1,169 @@
+"""Tests for pre-filling templates (:mod:`gen3_metadata_templates.sources`,
+``fill_template`` and ``g3mt fill``).
+
+A filled template has to be indistinguishable from one a user typed into: the
+reader gives back the records that went in, and validation passes them.
+"""
+
+from __future__ import annotations
+
+import json
+
+import openpyxl
+import pytest
+from typer.testing import CliRunner
+
+from gen3_metadata_templates import build_template_spec, validate_workbook
+from gen3_metadata_templates.cli import app
+from gen3_metadata_templates.errors import G3mtError, RecordSourceError
+from gen3_metadata_templates.sources import RecordFiles, detect_format, iter_records
+from gen3_metadata_templates.workbook.reader import read_workbook
+from gen3_metadata_templates.workbook.writer import fill_template
+
+runner = CliRunner()
+
+SUBJECTS_TSV = (
+    "submitter_id\tsubject_id\tprojects.code\tsex\tage\taliases\n"
+    "subj_1\tS1\tproj\tMale\t42\ta;b\n"
+    "subj_2\tS2\tproj\t\t\t\n"
+)
+
+
+@pytest.fixture()
+def record_files(tmp_path):
+    subjects = tmp_path / "subject.tsv"
+    subjects.write_text(SUBJECTS_TSV, encoding="utf-8")
+    samples = tmp_path / "samples.jsonl"
+    samples.write_text(
+        "\n".join(
+            json.dumps(r)
+            for r in [
+                {
+                    "type": "sample",
+                    "submitter_id": "samp_1",
+                    "sample_id": "X1",
+                    "sample_type": "Blood",
+                    "subjects": {"submitter_id": "subj_1"},
+                },
+                {
+                    "type": "sample",
+                    "submitter_id": "samp_2",
+                    "sample_id": "X2",
+                    "sample_type": "Saliva",
+                    "subjects.submitter_id": "subj_2",
+                },
+            ]
+        ),
+        encoding="utf-8",
+    )
+    return subjects, samples
+
+
+def test_detect_format():
+    assert detect_format("a/subject.TSV") == "tsv"
+    assert detect_format("records.ndjson") == "jsonl"
+    with pytest.raises(RecordSourceError):
+        detect_format("records.xlsx")
+
+
+def test_delimited_rows_take_their_node_from_the_file_name(record_files):
+    subjects, _ = record_files
+    first, second = iter_records(subjects)
+    assert first["type"] == "subject" and first["age"] == "42"
+    assert "sex" not in second  # empty cells are left out
+
+
+def test_json_accepts_a_list_or_a_node_map(tmp_path):
+    as_map = tmp_path / "by_node.json"
+    as_map.write_text(json.dumps({"subject": [{"submitter_id": "s1"}]}), encoding="utf-8")
+    assert [r["type"] for r in iter_records(as_map)] == ["subject"]
+
+    untyped = tmp_path / "list.json"
+    untyped.write_text(json.dumps([{"submitter_id": "s1"}]), encoding="utf-8")
+    with pytest.raises(RecordSourceError, match="record 0"):
+        list(iter_records(untyped))
+
+
+def test_bad_jsonl_line_is_reported_by_number(tmp_path):
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"type": "subject"}\n{nope\n', encoding="utf-8")
+    with pytest.raises(RecordSourceError, match="line 2"):
+        list(iter_records(path))
+
+
+def test_record_files_list_nodes_in_first_seen_order(record_files):
+    files = RecordFiles(record_files)
+    assert files.nodes == ["subject", "sample"]
+    assert [r["submitter_id"] for r in files.records("sample")] == ["samp_1", "samp_2"]
+
+
+def test_filled_template_reads_back_and_validates(mini_bundle, record_files, tmp_path):
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+    out = tmp_path / "filled.xlsx"
+    counts = fill_template(spec, out, RecordFiles(record_files).by_node(spec.node_order))
+    assert counts == {"subject": 2, "sample": 2}
+
+    parsed = read_workbook(out, spec)
+    subject = parsed.records["subject"][0]
+    assert subject["age"] == 42
+    assert subject["aliases"] == ["a", "b"]
+    assert parsed.records["sample"][1]["subjects"] == {"submitter_id": "subj_2"}
+
+    report = validate_workbook(out, spec.schema_path)
+    assert report.ok, report.findings
+
+
+def test_fill_refuses_more_rows_than_excel_holds(mini_bundle, tmp_path, monkeypatch):
+    from gen3_metadata_templates.workbook import writer
+
+    monkeypatch.setattr(writer, "EXCEL_MAX_ROWS", 5)
+    spec = build_template_spec(mini_bundle, "subject", ["subject"])
+    records = ({"submitter_id": f"s{i}"} for i in range(10))
+    out = tmp_path / "big.xlsx"
+    out.write_bytes(b"earlier workbook")
+    with pytest.raises(G3mtError, match="more than Excel"):
+        fill_template(spec, out, {"subject": records}, data_rows=0)
+    # Neither a partial workbook nor a temporary file is left; the old file stands.
+    assert [p.name for p in tmp_path.iterdir()] == ["big.xlsx"]
+    assert out.read_bytes() == b"earlier workbook"
+
+
+def test_provisioned_rows_stop_at_excels_last_row(mini_bundle, tmp_path, monkeypatch):
+    from gen3_metadata_templates.workbook import writer
+
+    monkeypatch.setattr(writer, "EXCEL_MAX_ROWS", 10)
+    spec = build_template_spec(mini_bundle, "subject", ["subject"])
+    out = tmp_path / "full.xlsx"
+    fill_template(spec, out, {"subject": [{"submitter_id": "s1"}]}, data_rows=50)
+    ranges = openpyxl.load_workbook(out).defined_names["ids_subject"].attr_text
+    assert ranges.endswith("$A$10")
+
+
+def test_nan_and_infinity_are_written_as_text_for_validation_to_report(
+    mini_bundle, mini_schema_path, tmp_path
+):
+    spec = build_template_spec(mini_bundle, "subject", ["subject"])
+    out = tmp_path / "nan.xlsx"
+    records = [
+        {"submitter_id": "s1", "subject_id": "S1", "age": "NaN"},
+        {"submitter_id": "s2", "subject_id": "S2", "age": "-inf"},
+        {"submitter_id": "s3", "subject_id": "S3", "age": float("inf")},
+    ]
+    fill_template(spec, out, {"subject": records})
+
+    ages = [r.get("age") for r in read_workbook(out, spec).records["subject"]]
+    assert ages == ["NaN", "-inf", "inf"]
+    report = validate_workbook(out, mini_schema_path)
+    assert [f.cell.a1 for f in report.findings if f.header == "age"] == ["C3", "C4", "C5"]
+
+
+def test_cli_fill(mini_schema_path, record_files, tmp_path):
+    out = tmp_path / "out.xlsx"
+    args = ["fill", mini_schema_path, *map(str, record_files), "-o", str(out), "--rows", "5"]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert out.exists()
+    assert "sample" in result.output
+
+    again = runner.invoke(app, args)
+    assert again.exit_code == 2
@@ -210,3 +210,20 @@ def test_build_spec_for_nodes_takes_the_node_list_verbatim(mini_bundle):
     """
     spec = build_spec_for_nodes(mini_bundle, ["sample", "subject"])
     assert spec.node_order == ["sample", "subject"]
+
+
+def test_parallel_build_is_identical_to_serial(acdc_bundle):
+    """Deriving columns on a pool must not change a single byte of the spec.
+
+    Large templates fan the per-node work out over threads or processes; the
+    sheets still have to come back in the requested order, with exactly the
+    columns a serial build gives, or workbooks would differ run to run.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    nodes = acdc_bundle.node_names
+    serial = build_spec_for_nodes(acdc_bundle, nodes).to_json()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert build_spec_for_nodes(acdc_bundle, nodes, executor=pool).to_json() == serial
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert build_spec_for_nodes(acdc_bundle, nodes, executor=pool).to_json() == serial
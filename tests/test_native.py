@@ -0,0 +1,272 @@
+"""Tests for :mod:`gen3_metadata_templates.workbook.native`.
+
+The native parser is only worth having if it's indistinguishable from
+openpyxl: every workbook is read through both engines and the records,
+coordinates and warnings compared. Cells it can't read identically must send
+the whole read back to openpyxl rather than produce a different answer.
+"""
+
+from __future__ import annotations
+
+import datetime
+import io
+
+import openpyxl
+import pytest
+import xlsxwriter
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.text import InlineFont
+from openpyxl.styles import Font
+
+from gen3_metadata_templates import build_template_spec, fill_template, write_template
+from gen3_metadata_templates.workbook.native import (
+    NativeWorkbook,
+    Unsupported,
+    _BlankRowsCollapsed,
+)
+from gen3_metadata_templates.workbook.reader import (
+    ParsedWorkbook,
+    iter_workbook_records,
+    read_workbook,
+)
+
+
+@pytest.fixture()
+def spec(mini_bundle):
+    return build_template_spec(mini_bundle, "sample", ["subject", "visit", "sample"])
+
+
+def _headers(ws):
+    return {ws.cell(1, c).value: c for c in range(1, ws.max_column + 1)}
+
+
+@pytest.fixture()
+def saved_workbook(spec, tmp_path):
+    """A template filled and saved by openpyxl: inline strings, gaps, stray types."""
+    out = tmp_path / "filled.xlsx"
+    write_template(spec, out, data_rows=20)
+    wb = openpyxl.load_workbook(out)
+    subj = wb["subject"]
+    col = _headers(subj)
+    subj.cell(3, col["submitter_id"]).value = "subj_1"
+    subj.cell(3, col["age"]).value = 42
+    subj.cell(3, col["aliases"]).value = "a; b"
+    subj.cell(4, col["submitter_id"]).value = "  subj_2 "
+    subj.cell(4, col["age"]).value = 41.5
+    subj.cell(4, col["subject_id"]).value = True
+    subj.cell(7, col["submitter_id"]).value = "subj_3"
+    subj.cell(7, col["age"]).value = "#N/A"  # stored as an error cell
+    dated = subj.cell(7, col["subject_id"])
+    dated.value = datetime.datetime(2024, 1, 31, 9, 30)
+    dated.number_format = "yyyy-mm-dd hh:mm"
+
+    samp = wb["sample"]
+    col = _headers(samp)
+    samp.cell(3, col["submitter_id"]).value = "samp_1"
+    samp.cell(3, col["subject.submitter_id"]).value = 1001
+    samp.cell(3, col["sample_type"]).value = "Blood"
+    samp.cell(5, col["sample_id"]).value = 7.0
+    wb.save(out)
+    return out
+
+
+@pytest.fixture()
+def excel_workbook(spec, tmp_path):
+    """Node sheets as Excel saves them: shared strings and cached formula results."""
+    out = tmp_path / "excel.xlsx"
+    with xlsxwriter.Workbook(str(out)) as wb:
+        date_fmt = wb.add_format({"num_format": "dd/mm/yyyy"})
+        for node_template in spec.nodes:
+            ws = wb.add_worksheet(node_template.sheet_name)
+            for c, column in enumerate(node_template.columns):
+                ws.write_string(0, c, column.header)
+        subj = wb.get_worksheet_by_name("subject")
+        subj.write_string(2, 0, "subj_x005F_1")  # an escaped underscore
+        subj.write_string(3, 0, "subj_2")
+        subj.write_formula(3, 1, '="S" & 2', None, "S2")
+        subj.write_formula(3, 2, "=40+1", None, 41)
+        subj.write_datetime(4, 0, datetime.datetime(2024, 2, 29), date_fmt)
+        subj.write_boolean(4, 1, False)
+        subj.write_formula(4, 2, "=1/0", None, "#DIV/0!")
+    return out
+
+
+def _assert_engines_agree(path, spec):
+    native = read_workbook(path, spec, engine="native")
+    reference = read_workbook(path, spec, engine="openpyxl")
+    assert native.records == reference.records
+    assert native._coords == reference._coords
+    assert native.warnings == reference.warnings
+    assert native.missing_columns == reference.missing_columns
+    return native
+
+
+def test_native_reads_a_saved_workbook_as_openpyxl_does(saved_workbook, spec):
+    """Numbers, booleans, errors, dates and row gaps all read identically."""
+    wb = NativeWorkbook(saved_workbook)
+    try:
+        for name in ("subject", "visit", "sample"):
+            list(wb.rows(name))  # no fallback needed
+    finally:
+        wb.close()
+    parsed = _assert_engines_agree(saved_workbook, spec)
+    assert [r["submitter_id"] for r in parsed.records["subject"]] == [
+        "subj_1",
+        "subj_2",
+        "subj_3",
+    ]
+    assert parsed.coord("subject", 2, "age").a1.endswith("7")
+
+
+def test_native_reads_shared_strings_and_cached_results(excel_workbook, spec):
+    wb = NativeWorkbook(excel_workbook)
+    try:
+        rows = dict(wb.rows("subject"))
+    finally:
+        wb.close()
+    assert rows[3] == ["subj_1"]
+    assert rows[4] == ["subj_2", "S2", 41]
+    assert rows[5] == [datetime.datetime(2024, 2, 29), False, "#DIV/0!"]
+    _assert_engines_agree(excel_workbook, spec)
+
+
+def test_native_reads_a_filled_template_as_openpyxl_does(spec, tmp_path):
+    """``fill_template`` writes inline strings, which are read natively."""
+    out = tmp_path / "prefilled.xlsx"
+    records = {
+        "subject": [{"submitter_id": f"subj_{i}", "age": i} for i in range(5)],
+        "sample": [{"submitter_id": "samp_1", "subjects": {"submitter_id": "subj_0"}}],
+    }
+    fill_template(spec, out, records)
+    parsed = _assert_engines_agree(out, spec)
+    assert len(parsed.records["subject"]) == 5
+
+
+def test_formatted_blank_rows_read_as_openpyxl_reads_them(spec, tmp_path):
+    """Rows of styled empty cells, as a re-saved template has, yield nothing."""
+    out = tmp_path / "formatted.xlsx"
+    write_template(spec, out, data_rows=0)
+    wb = openpyxl.load_workbook(out)
+    subj = wb["subject"]
+    for row in range(3, 400):
+        for col in range(1, subj.max_column + 1):
+            subj.cell(row, col).font = Font(italic=True)
+    subj.cell(3, 1).value = "subj_1"
+    subj.cell(250, 1).value = "subj_2"
+    wb.save(out)
+
+    parsed = _assert_engines_agree(out, spec)
+    assert parsed._coords["subject"].rows.tolist() == [3, 250]
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 20])
+def test_collapsing_blank_rows_keeps_every_row_number(saved_workbook, chunk_size):
+    blank = '<c r="A{0}" s="1"/>\n<c r="B{0}" s="1" />'
+    rows = ['<row r="1"><c r="A1" t="inlineStr"><is><t>h</t></is></c></row>']
+    rows += [f'<row r="{n}" spans="1:2">{blank.format(n)}</row>' for n in range(2, 9)]
+    rows += ['<row r="9"><c r="B9"><v>5</v></c><c r="C9" s="1"/></row>']
+    rows += [f'<row r="{n}">{blank.format(n)}</row>' for n in range(10, 30)]
+    rows += ["<row><c><v>6</v></c></row>", "<row/>", "<row><c><v>7</v></c></row>"]
+    xml = (
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'<sheetData>{"".join(rows)}</sheetData><rowBreaks count="0"/></worksheet>'
+    ).encode()
+
+    wb = NativeWorkbook(saved_workbook)
+    try:
+        expected = list(wb._parse_rows(io.BytesIO(xml)))
+        collapsed = _BlankRowsCollapsed(io.BytesIO(xml), chunk_size=chunk_size)
+        assert list(wb._parse_rows(collapsed)) == expected
+    finally:
+        wb.close()
+    assert expected == [(1, ["h"]), (9, [None, 5]), (30, [6]), (32, [7])]
+
+
+def test_rich_text_falls_back_to_openpyxl(saved_workbook, spec):
+    wb = openpyxl.load_workbook(saved_workbook, rich_text=True)
+    ws = wb["subject"]
+    ws.cell(5, 1).value = CellRichText("subj_", TextBlock(InlineFont(b=True), "bold"))
+    wb.save(saved_workbook)
+
+    native = NativeWorkbook(saved_workbook)
+    try:
+        with pytest.raises(Unsupported):
+            list(native.rows("subject"))
+    finally:
+        native.close()
+    parsed = _assert_engines_agree(saved_workbook, spec)
+    assert "subj_bold" in [r["submitter_id"] for r in parsed.records["subject"]]
+
+
+def test_formula_without_a_cached_value_falls_back_to_openpyxl(saved_workbook, spec):
+    wb = openpyxl.load_workbook(saved_workbook)
+    wb["sample"].cell(3, 1).value = '="samp_" & 1'  # openpyxl stores no result
+    wb.save(saved_workbook)
+
+    native = NativeWorkbook(saved_workbook)
+    try:
+        with pytest.raises(Unsupported):
+            list(native.rows("sample"))
+    finally:
+        native.close()
+    _assert_engines_agree(saved_workbook, spec)
+
+
+def test_unknown_engine_is_rejected(saved_workbook, spec):
+    with pytest.raises(ValueError, match="read engine"):
+        read_workbook(saved_workbook, spec, engine="lxml")
+
+
+def test_sheets_read_on_a_process_pool_match_a_serial_read(saved_workbook, spec, monkeypatch):
+    from gen3_metadata_templates.workbook import handle
+
+    serial = read_workbook(saved_workbook, spec, workers=1)
+    monkeypatch.setattr(handle, "PARALLEL_READ_MIN_BYTES", 0)
+    parallel = read_workbook(saved_workbook, spec, workers=2)
+    assert parallel.records == serial.records
+    assert list(parallel.records) == [n.node for n in spec.nodes]
+    assert parallel._coords == serial._coords
+    assert parallel.warnings == serial.warnings
+    assert parallel.missing_columns == serial.missing_columns
+
+
+def test_a_read_without_workers_stays_in_process(saved_workbook, spec, monkeypatch):
+    from gen3_metadata_templates.workbook import handle
+
+    monkeypatch.setattr(handle, "PARALLEL_READ_MIN_BYTES", 0)
+    monkeypatch.setattr(handle, "_read_native_parallel", None)  # a pool would fail here
+    assert (
+        read_workbook(saved_workbook, spec).records
+        == read_workbook(saved_workbook, spec, engine="openpyxl").records
+    )
+
+
+def test_a_worker_that_needs_openpyxl_sends_the_read_back_to_it(saved_workbook, spec, monkeypatch):
+    from gen3_metadata_templates.workbook import handle
+
+    wb = openpyxl.load_workbook(saved_workbook)
+    wb["sample"].cell(3, 1).value = '="samp_" & 1'
+    wb.save(saved_workbook)
+    monkeypatch.setattr(handle, "PARALLEL_READ_MIN_BYTES", 0)
+    parallel = read_workbook(saved_workbook, spec, workers=2)
+    reference = read_workbook(saved_workbook, spec, engine="openpyxl")
+    assert parallel.records == reference.records
+
+
+def test_a_stream_that_needs_openpyxl_mid_sheet_carries_on_where_it_stopped(saved_workbook, spec):
+    """Records already yielded natively aren't yielded again, or lost."""
+    wb = openpyxl.load_workbook(saved_workbook)
+    wb["subject"].cell(7, 1).value = '="subj_" & 3'  # the third record; openpyxl caches nothing
+    wb.save(saved_workbook)
+
+    sink = ParsedWorkbook()
+    streamed = list(iter_workbook_records(saved_workbook, spec, parsed=sink))
+    reference = read_workbook(saved_workbook, spec, engine="openpyxl")
+    assert [(n, i) for n, i, _, _ in streamed] == [
+        (node, i) for node, records in reference.records.items() for i in range(len(records))
+    ]
+    assert [r for _, _, r, _ in streamed] == [
+        r for records in reference.records.values() for r in records
+    ]
+    assert sink._coords == reference._coords
+    assert sink.warnings == reference.warnings
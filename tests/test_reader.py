@@ -10,13 +10,23 @@ generated-then-filled workbook.
 from __future__ import annotations
 
 import datetime
+import re
+import zipfile
 
 import openpyxl
 import pytest
 
 from gen3_metadata_templates import build_template_spec, write_template
+from gen3_metadata_templates.errors import WorkbookFormatError
 from gen3_metadata_templates.model import ColumnKind, ColumnSpec
-from gen3_metadata_templates.workbook.reader import coerce_cell, read_meta, read_workbook
+from gen3_metadata_templates.workbook.reader import (
+    ParsedWorkbook,
+    coerce_cell,
+    column_coercer,
+    iter_workbook_records,
+    read_meta,
+    read_workbook,
+)
 
 
 def _col(data_type="string", kind=ColumnKind.PROPERTY, is_multi=False):
@@ -93,6 +103,26 @@ def test_to_many_link_folds_to_list():
     assert coerce_cell("a; b", col) == [{"submitter_id": "a"}, {"submitter_id": "b"}]
 
 
+@pytest.mark.parametrize(
+    "col, raw, expected",
+    [
+        (_col("integer"), " 7 ", 7),
+        (_col("number"), "2.5", 2.5),
+        (_col("number"), 3, 3),
+        (_col("boolean"), 1, True),
+        (_col("boolean"), "maybe", "maybe"),
+        (_col("string", is_multi=True), 12.0, "12"),
+        (_col("string", is_multi=True), " ; ", []),
+        (_col(kind=ColumnKind.LINK), 1001.0, {"submitter_id": "1001"}),
+        (_col(kind=ColumnKind.LINK), "  ", None),
+    ],
+)
+def test_column_coercer_is_coerce_cell_for_that_column(col, raw, expected):
+    """The reader looks a column's coercer up once; it must give what coerce_cell gives."""
+    assert column_coercer(col)(raw) == expected
+    assert coerce_cell(raw, col) == expected
+
+
 # --- read_workbook: records + coordinates on a real workbook --------------
 
 
@@ -156,6 +186,81 @@ def test_coordinates_point_at_the_source_cell(filled_workbook):
     assert ref.row == 3
 
 
+def test_blank_cells_of_a_record_can_still_be_located(filled_workbook):
+    """A record's empty cells resolve too, so "required but empty" has a cell."""
+    path, spec = filled_workbook
+    parsed = read_workbook(path, spec)
+    assert "sex" not in parsed.records["subject"][0]
+    ref = parsed.coord("subject", 0, "sex")
+    assert ref is not None and ref.row == 3
+    assert parsed.coord("subject", 1, "sex") is None  # no such record
+    assert parsed.coord("subject", 0, "not_a_column") is None
+
+
+def test_wrong_stored_dimensions_do_not_cut_rows_off(filled_workbook, tmp_path):
+    """Rows past a sheet's recorded ``<dimension>`` are still read.
+
+    The reader streams sheets, and streaming would otherwise trust whatever
+    extent the program that saved the file claimed.
+    """
+    path, spec = filled_workbook
+    broken = tmp_path / "broken.xlsx"
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(broken, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"', data)
+            dst.writestr(item, data)
+    parsed = read_workbook(broken, spec)
+    assert parsed.records == read_workbook(path, spec).records
+    assert parsed.records["sample"][0]["sample_type"] == "Blood"
+
+
+def test_streamed_records_match_a_full_read(filled_workbook):
+    """The iterator yields read_workbook's records, in sheet order, with their cells."""
+    path, spec = filled_workbook
+    full = read_workbook(path, spec)
+    sink = ParsedWorkbook()
+    streamed = list(iter_workbook_records(path, spec, parsed=sink))
+
+    assert [(node, index) for node, index, _, _ in streamed] == [("subject", 0), ("sample", 0)]
+    assert {node: [r for n, _, r, _ in streamed if n == node] for node in full.records} == {
+        node: records for node, records in full.records.items()
+    }
+    _, _, _, coords = streamed[0]
+    assert coords.cell(0, "age") == full.coord("subject", 0, "age")
+    assert sink.warnings == full.warnings
+    assert sink.missing_columns == full.missing_columns
+    assert sink.records == {}
+
+
+@pytest.mark.parametrize("engine", ["native", "openpyxl"])
+def test_a_table_layout_sheet_is_read_from_the_row_its_metadata_records(
+    mini_bundle, tmp_path, engine
+):
+    """Table sheets have no hint row: their first record sits in row 2."""
+    spec = build_template_spec(mini_bundle, "subject", ["subject"])
+    out = tmp_path / "table.xlsx"
+    write_template(spec, out, layout="table")
+    wb = openpyxl.load_workbook(out)
+    wb["subject"]["A2"] = "s1"
+    wb["subject"]["A3"] = "s2"
+    wb.save(out)
+
+    parsed = read_workbook(out, spec, engine=engine)
+    assert [r["submitter_id"] for r in parsed.records["subject"]] == ["s1", "s2"]
+    assert parsed.coord("subject", 0, "submitter_id").a1 == "A2"
+    streamed = iter_workbook_records(out, spec, engine=engine)
+    assert [r["submitter_id"] for _, _, r, _ in streamed] == ["s1", "s2"]
+
+
+def test_a_file_that_is_not_a_workbook_is_a_format_error(tmp_path):
+    path = tmp_path / "records.xlsx"
+    path.write_text("submitter_id\tage\n")
+    with pytest.raises(WorkbookFormatError, match="not an .xlsx workbook"):
+        read_meta(path)
+
+
 def test_read_meta_recovers_target_and_path(filled_workbook):
     """The metadata sheet is read back into a usable dict for validate."""
     path, _ = filled_workbook
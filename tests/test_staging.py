@@ -0,0 +1,136 @@
+"""Tests for :mod:`gen3_metadata_templates.validation.staging`.
+
+The SQLite stage must answer the cross-record checks exactly as the in-memory
+checks do: the same duplicates, in record order, pointing at the same first
+use; the same unresolved references, whether they were staged before or
+after the records they point at; and nothing claimed about a parent sheet it
+was never given.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from gen3_metadata_templates import build_spec_for_nodes
+from gen3_metadata_templates.validation import runner as runner_module
+from gen3_metadata_templates.validation import staging as staging_module
+from gen3_metadata_templates.validation.report import ValidationReport
+from gen3_metadata_templates.validation.staging import SqliteStage
+from gen3_metadata_templates.workbook.reader import ParsedWorkbook, SheetCoords
+
+SUBJECT_LINKS = [{"name": "subjects", "target_type": "subject"}]
+
+
+@pytest.fixture()
+def stage(tmp_path):
+    with SqliteStage(["subject", "sample"], directory=tmp_path) as stage:
+        yield stage
+
+
+def test_duplicates_come_back_in_record_order_with_their_first_use(stage, monkeypatch):
+    monkeypatch.setattr(staging_module, "_BATCH_SIZE", 2)  # flush between records
+    for index, key in enumerate(["a", "b", "a", None, "b", "a", "c"]):
+        stage.add_identifiers("subject", index, {"submitter_id": key})
+    assert list(stage.duplicates("subject")) == [(2, "a", 0), (4, "b", 1), (5, "a", 0)]
+    assert list(stage.duplicates("sample")) == []
+
+
+def test_references_staged_before_their_targets_are_resolved_at_the_end(stage):
+    stage.add_links("sample", 0, {"subjects": {"submitter_id": "s1"}}, SUBJECT_LINKS)
+    stage.add_links(
+        "sample",
+        1,
+        {"subjects": [{"submitter_id": "s2"}, {"submitter_id": "nope"}, {"id": "x"}]},
+        SUBJECT_LINKS,
+    )
+    stage.add_links("sample", 2, {"subjects": {"submitter_id": "gone"}}, SUBJECT_LINKS)
+    stage.add_links("sample", 3, {"subjects": {"id": "x"}}, SUBJECT_LINKS)
+    # The subjects arrive after the samples that link to them.
+    stage.add_identifiers("subject", 0, {"submitter_id": "s1"})
+    stage.add_identifiers("subject", 1, {"submitter_id": "s2", "id": "x"})
+
+    # Each unresolved record comes back with all its references, as given.
+    assert list(stage.unresolved("sample", SUBJECT_LINKS)) == [
+        (1, {"subjects": [{"submitter_id": "s2"}, {"submitter_id": "nope"}, {"id": "x"}]}),
+        (2, {"subjects": [{"submitter_id": "gone"}]}),
+    ]
+    assert "s2" in stage.index["subject"].get("submitter_id")
+    assert "gone" not in stage.index["subject"].get("submitter_id")
+
+
+def test_links_to_a_parent_the_stage_does_not_hold_are_not_reported(stage):
+    visits = [{"name": "visits", "target_type": "visit"}]
+    stage.add_links("sample", 0, {"visits": {"submitter_id": "v1"}}, visits)
+    assert list(stage.unresolved("sample", visits)) == []
+    assert "visit" not in stage.index
+
+    # A parent it holds but that has no records: every reference is unresolved.
+    stage.add_links("sample", 1, {"subjects": {"submitter_id": "s1"}}, SUBJECT_LINKS)
+    assert list(stage.unresolved("sample", SUBJECT_LINKS)) == [
+        (1, {"subjects": [{"submitter_id": "s1"}]})
+    ]
+
+
+def test_the_file_is_removed_on_close(tmp_path):
+    stage = SqliteStage(["subject"], directory=tmp_path)
+    assert stage.path.exists()
+    stage.close()
+    assert not list(tmp_path.iterdir())
+
+
+def _run_checks(checks_cls, bundle, spec, records, **kwargs) -> ValidationReport:
+    parsed = ParsedWorkbook()
+    for node_template in spec.nodes:
+        letters = {col.prop_name: chr(ord("A") + i) for i, col in enumerate(node_template.columns)}
+        rows = array("I", range(3, 3 + len(records.get(node_template.node, []))))
+        parsed._coords[node_template.node] = SheetCoords(node_template.sheet_name, letters, rows)
+    report = ValidationReport()
+    with checks_cls(bundle, spec, parsed, set(), **kwargs) as checks:
+        for node_template in spec.nodes:
+            for index, record in enumerate(records.get(node_template.node, [])):
+                checks.check(node_template.node, index, {**record, "type": node_template.node})
+        for node_template in spec.nodes:
+            checks.finish_node(node_template, report)
+    return report
+
+
+def test_staged_checks_report_what_the_in_memory_checks_do(mini_bundle, tmp_path):
+    # Samples come before the subjects they link to, so their links are
+    # deferred; visit has a sheet but no rows, so a reference to it dangles.
+    spec = build_spec_for_nodes(mini_bundle, ["sample", "subject", "visit"])
+    sample = {"sample_id": "X", "sample_type": "Blood"}
+    records = {
+        "sample": [
+            {**sample, "submitter_id": "samp_1", "subjects": {"submitter_id": "subj_1"}},
+            {**sample, "submitter_id": "samp_2", "subjects": {"submitter_id": "subj_9"}},
+            {**sample, "submitter_id": "samp_1", "subjects": [{"submitter_id": "subj_2"}]},
+            {
+                **sample,
+                "submitter_id": "samp_3",
+                "subjects": {"submitter_id": "subj_2"},
+                "visits": {"submitter_id": "visit_1"},
+            },
+        ],
+        "subject": [
+            {"submitter_id": "subj_1", "subject_id": "S1"},
+            {"submitter_id": "subj_2", "subject_id": "S2"},
+            {"submitter_id": "subj_1", "subject_id": "S3"},
+        ],
+    }
+    in_memory = _run_checks(runner_module._RecordChecks, mini_bundle, spec, records)
+    staged = _run_checks(
+        runner_module._StagedRecordChecks, mini_bundle, spec, records, directory=tmp_path
+    )
+
+    assert staged.findings == in_memory.findings
+    assert staged.warnings == in_memory.warnings
+    assert staged.node_counts == in_memory.node_counts
+    assert [(f.node, f.validator, f.cell.a1) for f in staged.findings] == [
+        ("sample", "link", "B4"),
+        ("sample", "link", "C6"),
+        ("sample", "duplicate", "A5"),
+        ("subject", "duplicate", "A5"),
+    ]
+    assert not list(tmp_path.iterdir())
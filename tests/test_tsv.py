@@ -0,0 +1,142 @@
+"""Tests for the TSV bundle (:mod:`gen3_metadata_templates.workbook.tsv`).
+
+A bundle is the workbook's template as plain text, so the contract is parity:
+the same headers in the same order, the same metadata, and validation that
+reads and reports it exactly as it would the .xlsx.
+"""
+
+from __future__ import annotations
+
+import csv
+import zipfile
+
+import pytest
+from typer.testing import CliRunner
+
+from gen3_metadata_templates import build_template_spec, validate_workbook
+from gen3_metadata_templates.cli import app
+from gen3_metadata_templates.constants import BUNDLE_META_FILE
+from gen3_metadata_templates.workbook.reader import (
+    ParsedWorkbook,
+    read_embedded_spec,
+    read_meta,
+    read_workbook,
+)
+from gen3_metadata_templates.workbook.tsv import iter_tsv_bundle, write_tsv_bundle
+
+runner = CliRunner()
+
+
+@pytest.fixture()
+def spec(mini_bundle):
+    return build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+
+
+def _append(path, node, spec, **values):
+    """Add a record to ``node``'s file in a directory bundle."""
+    headers = [c.header for c in spec.node_template(node).columns]
+    line = "\t".join(str(values.get(h, "")) for h in headers)
+    with open(path / f"{node}.tsv", "a", encoding="utf-8") as handle:
+        handle.write(line + "\n")
+
+
+def test_zip_bundle_has_a_file_per_node_in_order(spec, tmp_path):
+    out = write_tsv_bundle(spec, tmp_path / "template.zip")
+    with zipfile.ZipFile(out) as zf:
+        assert zf.namelist() == ["subject.tsv", "sample.tsv", BUNDLE_META_FILE]
+        header = zf.read("sample.tsv").decode("utf-8").rstrip("\n").split("\t")
+    assert header == [c.header for c in spec.node_template("sample").columns]
+
+
+def test_bundle_output_is_deterministic(spec, tmp_path):
+    first = write_tsv_bundle(spec, tmp_path / "a.zip").read_bytes()
+    assert write_tsv_bundle(spec, tmp_path / "b.zip").read_bytes() == first
+
+
+def test_bundle_metadata_matches_the_workbook(spec, tmp_path):
+    out = write_tsv_bundle(spec, tmp_path / "bundle")
+    meta = read_meta(out)
+    assert meta["node_order"] == "subject,sample"
+    assert meta["first_data_row"] == "2"
+    assert meta["node_sheets"] == {"subject": "subject.tsv", "sample": "sample.tsv"}
+    assert read_embedded_spec(out) == spec
+
+
+def test_filled_bundle_reads_and_validates(spec, tmp_path):
+    out = write_tsv_bundle(spec, tmp_path / "bundle")
+    _append(out, "subject", spec, submitter_id="subj_1", subject_id="S1", age="42", aliases="a;b")
+    _append(
+        out,
+        "sample",
+        spec,
+        submitter_id="samp_1",
+        sample_id="X1",
+        sample_type="Blood",
+        **{"subject.submitter_id": "subj_1"},
+    )
+
+    parsed = read_workbook(out, spec)
+    assert parsed.records["subject"][0]["age"] == 42
+    assert parsed.records["subject"][0]["aliases"] == ["a", "b"]
+    assert parsed.records["sample"][0]["subjects"] == {"submitter_id": "subj_1"}
+    assert validate_workbook(out, spec.schema_path).ok
+
+
+def test_bundle_findings_point_at_line_and_column(spec, tmp_path):
+    out = write_tsv_bundle(spec, tmp_path / "bundle")
+    _append(out, "subject", spec, submitter_id="subj_1", subject_id="S1", age="ten")
+    report = validate_workbook(out, spec.schema_path)
+    (finding,) = [f for f in report.findings if f.header == "age"]
+    headers = [c.header for c in spec.node_template("subject").columns]
+    assert finding.cell.row == 2
+    assert finding.cell.column_letter == "ABCDEFGHIJ"[headers.index("age")]
+
+
+def test_a_cell_past_the_csv_modules_default_cap_reads_without_changing_it(spec, tmp_path):
+    """Long free text is read; the process-wide csv cap is only lifted during the read."""
+    limit = csv.field_size_limit()
+    out = write_tsv_bundle(spec, tmp_path / "bundle")
+    long_id = "S" * (limit + 1)
+    _append(out, "subject", spec, submitter_id="subj_1", subject_id=long_id)
+    parsed = read_workbook(out, spec)
+    assert parsed.records["subject"][0]["subject_id"] == long_id
+    assert csv.field_size_limit() == limit
+
+
+def test_interleaved_streams_never_leave_the_csv_cap_raised(spec, tmp_path):
+    """The cap is back to its value whenever a stream is suspended between records."""
+    limit = csv.field_size_limit()
+    bundles = []
+    for name in ("a", "b"):
+        out = write_tsv_bundle(spec, tmp_path / name)
+        for i in range(3):
+            _append(out, "subject", spec, submitter_id=f"{name}_{i}", subject_id="S" * (limit + 1))
+        bundles.append(iter_tsv_bundle(out, spec, ParsedWorkbook()))
+
+    read = []
+    for pair in zip(*bundles):
+        for node, record in pair:
+            assert csv.field_size_limit() == limit
+            read.append(record["submitter_id"])
+    assert read == ["a_0", "b_0", "a_1", "b_1", "a_2", "b_2"]
+
+
+def test_missing_node_file_is_a_warning(spec, tmp_path):
+    out = write_tsv_bundle(spec, tmp_path / "bundle")
+    (out / "sample.tsv").unlink()
+    parsed = read_workbook(out, spec)
+    assert parsed.records["sample"] == []
+    assert any("sample.tsv" in w for w in parsed.warnings)
+
+
+def test_cli_generate_tsv_and_validate(mini_schema_path, tmp_path):
+    out = tmp_path / "bundle.zip"
+    result = runner.invoke(
+        app,
+        ["generate", mini_schema_path, "sample", "--path", "1", "--format", "tsv", "-o", str(out)],
+    )
+    assert result.exit_code == 0, result.output
+    assert zipfile.is_zipfile(out)
+
+    result = runner.invoke(app, ["validate", str(out), "-s", mini_schema_path])
+    assert result.exit_code == 0, result.output
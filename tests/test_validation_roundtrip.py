@@ -22,7 +22,10 @@ from gen3_metadata_templates import (
 )
 from gen3_metadata_templates.constants import DEFAULT_EXCLUDED_NODES
 from gen3_metadata_templates.selection import resolve_selection
+from gen3_metadata_templates.validation import runner as runner_module
+from gen3_metadata_templates.workbook import handle as handle_module
 from gen3_metadata_templates.workbook.annotate import write_annotated_copy
+from gen3_metadata_templates.workbook.handle import WorkbookHandle
 
 
 def _set_row(wb, sheet, row, **values):
@@ -98,6 +101,126 @@ def test_broken_fill_reports_each_problem_at_the_right_cell(template_path):
     assert located.get(("sample", "D3")) == "required"  # empty sample_type
 
 
+def test_sqlite_staging_reports_exactly_what_memory_does(template_path, tmp_path):
+    """Staging the cross-sheet checks on disk must not change a single finding."""
+    path, schema = template_path
+    wb = openpyxl.load_workbook(path)
+    _set_row(wb, "subject", 3, submitter_id="subj_1", subject_id="S1", age=30)
+    _set_row(wb, "subject", 4, submitter_id="subj_2", subject_id="S2", age="ten")
+    _set_row(wb, "subject", 5, submitter_id="subj_1", subject_id="S3")
+    _set_row(wb, "subject", 6, submitter_id="subj_1", subject_id="S4")
+    for row, parent in enumerate(["subj_2", "ghost", "subj_1", "phantom"], start=3):
+        _set_row(wb, "sample", row, submitter_id=f"samp_{row}", **{"subject.submitter_id": parent})
+    wb.save(path)
+
+    in_memory = validate_workbook(path, schema)
+    staged = validate_workbook(path, schema, staging="sqlite", staging_dir=tmp_path)
+
+    assert staged.findings == in_memory.findings
+    assert staged.warnings == in_memory.warnings
+    assert staged.node_counts == in_memory.node_counts
+    assert [f.cell.a1 for f in staged.findings if f.validator in ("duplicate", "link")] == [
+        "A5",
+        "A6",
+        "B4",
+        "B6",
+    ]
+    duplicates = [f.message for f in staged.findings if f.validator == "duplicate"]
+    assert all("already used on row 3" in message for message in duplicates)
+    assert not list(tmp_path.glob("*.sqlite"))  # the staging file is removed
+
+    with pytest.raises(ValueError, match="Unknown staging"):
+        validate_workbook(path, schema, staging="redis")
+
+
+def test_only_linked_to_sheets_are_indexed_and_links_report_the_same(
+    mini_bundle, tmp_path, monkeypatch
+):
+    """Indexing just the sheets something links to must not change a link finding.
+
+    The chain subject -> visit -> sample -> assay_file is the deepest in the
+    mini schema. Nothing links to assay_file, and the core_metadata_collection
+    it links to has no sheet; neither may be indexed.
+    """
+    spec = build_template_spec(
+        mini_bundle, "assay_file", ["subject", "visit", "sample", "assay_file"]
+    )
+    path = tmp_path / "chain.xlsx"
+    write_template(spec, path, data_rows=20)
+    wb = openpyxl.load_workbook(path)
+    _set_row(wb, "subject", 3, submitter_id="subj_1", subject_id="S1")
+    for row, parent in enumerate(["subj_1", "ghost"], start=3):
+        _set_row(wb, "visit", row, submitter_id=f"v_{row}", **{"subject.submitter_id": parent})
+    for row, parent in enumerate(["v_3", "v_9", "v_4"], start=3):
+        _set_row(
+            wb,
+            "sample",
+            row,
+            submitter_id=f"samp_{row}",
+            **{"subject.submitter_id": "subj_1", "visit.submitter_id": parent},
+        )
+    for row, parent in enumerate(["samp_3", "phantom", "samp_5"], start=3):
+        _set_row(wb, "assay_file", row, submitter_id=f"af_{row}", **{"sample.submitter_id": parent})
+    wb.save(path)
+
+    seen = []
+    original_init = runner_module._RecordChecks.__init__
+
+    def spy(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        seen.append(self)
+
+    monkeypatch.setattr(runner_module._RecordChecks, "__init__", spy)
+    report = validate_workbook(path, str(mini_bundle.schema_path))
+    assert set(seen[0].index) == {"subject", "visit", "sample"}
+
+    def index_every_sheet(self, *args, **kwargs):
+        spy(self, *args, **kwargs)
+        self.index = {node: {} for node in self.on_path}
+
+    monkeypatch.setattr(runner_module._RecordChecks, "__init__", index_every_sheet)
+    every_sheet = validate_workbook(path, str(mini_bundle.schema_path))
+    assert set(seen[1].index) == {"subject", "visit", "sample", "assay_file"}
+
+    assert report.findings == every_sheet.findings
+    assert [(f.sheet, f.cell.a1) for f in report.findings if f.validator == "link"] == [
+        ("visit", "B4"),
+        ("sample", "C4"),
+        ("assay_file", "B4"),
+    ]
+
+
+def test_schema_checks_on_a_process_pool_report_what_one_process_does(template_path, monkeypatch):
+    """Runs of records checked in other processes come back in sheet order."""
+    path, schema = template_path
+    wb = openpyxl.load_workbook(path)
+    for row in range(3, 10):
+        age = "old" if row % 2 else row
+        _set_row(wb, "subject", row, submitter_id=f"subj_{row % 5}", age=age, sex="Alien")
+        _set_row(wb, "sample", row, submitter_id=f"samp_{row}", **{"subject.submitter_id": "x"})
+    wb.save(path)
+
+    pools = []
+
+    class CountedPool(runner_module.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(runner_module, "ProcessPoolExecutor", CountedPool)
+    one_process = validate_workbook(path, schema, workers=1)
+    assert validate_workbook(path, schema, workers=2).findings == one_process.findings
+    assert pools == []  # no sheet reaches a full run of records
+
+    monkeypatch.setattr(runner_module, "PARALLEL_VALIDATE_CHUNK", 3)
+    pooled = validate_workbook(path, schema, workers=2)
+    assert pools == [{"max_workers": 2}]
+    assert pooled.findings == one_process.findings
+    assert pooled.node_counts == one_process.node_counts
+    assert validate_workbook(path, schema).findings == one_process.findings
+    assert len(pools) == 1  # without workers=, everything is checked in this process
+
+
 def test_annotated_copy_highlights_bad_cells(template_path, tmp_path):
     """The annotated workbook must fill each bad cell and attach a comment.
 
@@ -129,6 +252,34 @@ def test_annotated_copy_highlights_bad_cells(template_path, tmp_path):
     assert "Validation Errors" in check.sheetnames
 
 
+def test_validate_and_annotate_share_one_open(template_path, tmp_path, monkeypatch):
+    """Through one handle, the file is read from disk once and openpyxl loads it once.
+
+    That one load is the editable copy annotation needs; the metadata and the
+    node sheets come from the native parser over the same bytes.
+    """
+    path, schema = template_path
+    wb = openpyxl.load_workbook(path)
+    _set_row(wb, "subject", 3, submitter_id="subj_1", subject_id="S1", age="oops")
+    wb.save(path)
+
+    disk_reads, loads = [], []
+    real_read_bytes, real_load = Path.read_bytes, openpyxl.load_workbook
+    monkeypatch.setattr(Path, "read_bytes", lambda p: disk_reads.append(p) or real_read_bytes(p))
+    monkeypatch.setattr(
+        handle_module.openpyxl,
+        "load_workbook",
+        lambda *a, **kw: loads.append(kw) or real_load(*a, **kw),
+    )
+    with WorkbookHandle(path) as handle:
+        report = validate_workbook(handle, schema)
+        write_annotated_copy(handle, report, tmp_path / "annotated.xlsx")
+
+    assert not report.ok
+    assert disk_reads == [path]
+    assert loads == [{}]
+
+
 def test_annotate_refuses_to_overwrite_input(template_path):
     """Annotating over the input file would destroy the user's work — refuse it."""
     from gen3_metadata_templates.errors import G3mtError
@@ -345,3 +496,33 @@ def test_branching_multi_target_roundtrip(mini_bundle, tmp_path):
 
     report = validate_workbook(out, str(mini_bundle.schema_path))
     assert report.ok, [f"{f.location}: {f.message}" for f in report.findings]
+
+
+def test_table_layout_round_trips(mini_bundle, tmp_path):
+    """Table-layout sheets start data on row 2 and are read past their initial size.
+
+    A table grows as the submitter types below it, so a row beyond the rows it
+    was written with must still be read, and reported at its real cell.
+    """
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "sample"])
+    path = tmp_path / "table.xlsx"
+    write_template(spec, path, layout="table", data_rows=5)
+
+    wb = openpyxl.load_workbook(path)
+    _set_row(wb, "subject", 2, submitter_id="subj_1", subject_id="S1", age=30, sex="Female")
+    _set_row(wb, "subject", 9, submitter_id="subj_2", subject_id="S2", age="ten", sex="Male")
+    _set_row(
+        wb,
+        "sample",
+        2,
+        submitter_id="samp_1",
+        **{"subject.submitter_id": "subj_2"},
+        sample_id="X1",
+        sample_type="Blood",
+    )
+    wb.save(path)
+
+    report = validate_workbook(path, mini_bundle.schema_path)
+    assert report.node_counts["subject"][0] == 2
+    located = {(f.sheet, f.cell.a1 if f.cell else None): f.validator for f in report.findings}
+    assert located == {("subject", "C9"): "type"}
@@ -9,18 +9,24 @@ makes linked-data submission approachable, so they are checked explicitly.
 
 from __future__ import annotations
 
+import dataclasses
+import io
+
 import openpyxl
 import pytest
 
 from gen3_metadata_templates import (
     build_multi_template_spec,
     build_template_spec,
+    template_bytes,
     write_template,
 )
 from gen3_metadata_templates.constants import (
     DEFAULT_EXCLUDED_NODES,
+    DEFAULT_TABLE_ROWS,
     DICTIONARY_SHEET,
     INSTRUCTIONS_SHEET,
+    LISTS_SHEET,
     META_SHEET,
 )
 from gen3_metadata_templates.selection import resolve_selection
@@ -90,6 +96,90 @@ def test_enum_dropdown_lists_allowed_values(sample_workbook):
     assert "Tissue" in enum_formulas[0] and "Saliva" in enum_formulas[0]
 
 
+def _with_long_enums(spec, lists):
+    """Give ``spec``'s enum columns the long value lists in ``lists``, in turn."""
+    it = iter(lists)
+    for nt in spec.nodes:
+        nt.columns = [
+            dataclasses.replace(col, enum=next(it)) if col.enum else col for col in nt.columns
+        ]
+    return spec
+
+
+def test_shared_long_enums_are_written_once(mini_bundle, tmp_path):
+    """Columns with the same long value list point at one shared backing list."""
+    terms = tuple(f"ontology term {i:03d}" for i in range(40))
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "visit", "sample"])
+    _with_long_enums(spec, [terms, terms])
+    out = tmp_path / "shared.xlsx"
+    write_template(spec, out, data_rows=5)
+
+    wb = openpyxl.load_workbook(out)
+    assert wb[LISTS_SHEET].max_column == 1
+    enum_names = [n for n in wb.defined_names if n.startswith("enum_")]
+    assert len(enum_names) == 1
+    for sheet in ("subject", "sample"):
+        sources = [str(dv.formula1) for dv in wb[sheet].data_validations.dataValidation]
+        assert enum_names[0] in sources
+
+
+def test_distinct_long_enums_each_get_a_list(mini_bundle, tmp_path):
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "visit", "sample"])
+    _with_long_enums(spec, [tuple(f"{prefix} value {i:03d}" for i in range(40)) for prefix in "ab"])
+    out = tmp_path / "distinct.xlsx"
+    write_template(spec, out, data_rows=5)
+    assert openpyxl.load_workbook(out)[LISTS_SHEET].max_column == 2
+
+
+def test_table_layout_makes_each_node_sheet_a_growing_table(mini_bundle, tmp_path):
+    """No hint row, an unprotected sheet, and link dropdowns bound to table columns."""
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "visit", "sample"])
+    out = tmp_path / "table.xlsx"
+    write_template(spec, out, layout="table")
+
+    wb = openpyxl.load_workbook(out)
+    ws = wb["sample"]
+    ((name, ref),) = ws.tables.items()
+    assert name == "tbl_sample"
+    assert ref == f"A1:F{1 + DEFAULT_TABLE_ROWS}"
+    assert [c.value for c in ws[1]][0] == "submitter_id"
+    assert all(c.value is None for c in ws[2])  # data starts straight under the header
+    assert not ws.protection.sheet
+    assert wb.defined_names["ids_subject"].value == "tbl_subject[submitter_id]"
+    meta = wb[META_SHEET]
+    meta = {meta.cell(r, 1).value: meta.cell(r, 2).value for r in range(1, meta.max_row + 1)}
+    assert (meta["layout"], str(meta["first_data_row"])) == ("table", "2")
+
+
+def test_unknown_layout_is_refused(mini_bundle, tmp_path):
+    spec = build_template_spec(mini_bundle, "visit", ["subject", "visit"])
+    with pytest.raises(ValueError):
+        write_template(spec, tmp_path / "x.xlsx", layout="pivot")
+
+
+def test_compact_comments_use_input_messages(mini_bundle, tmp_path):
+    """No header comments; each column's data cells carry a short note instead.
+
+    Dropdown columns keep their dropdown, with the note added to it, and every
+    note fits Excel's input-message limits.
+    """
+    spec = build_template_spec(mini_bundle, "sample", ["subject", "visit", "sample"])
+    out = tmp_path / "compact.xlsx"
+    write_template(spec, out, data_rows=5, compact_comments=True)
+
+    wb = openpyxl.load_workbook(out)
+    ws = wb["sample"]
+    assert all(cell.comment is None for cell in ws[1])
+    notes = {dv.promptTitle: dv for dv in ws.data_validations.dataValidation}
+    assert set(notes) == {col.header for col in spec.node_template("sample").columns}
+    assert "Blood" in notes["sample_type"].formula1
+    assert notes["subject.submitter_id"].formula1 == "ids_subject"
+    assert all(len(dv.prompt) <= 255 for dv in notes.values())
+    assert "Dictionary" in notes["submitter_id"].prompt
+    instructions = " ".join(str(c.value) for c in wb[INSTRUCTIONS_SHEET]["A"] if c.value)
+    assert "Select a cell under a header" in instructions
+
+
 def test_dictionary_has_one_row_per_column(sample_workbook):
     """The Dictionary sheet documents every column across every node sheet.
 
@@ -118,7 +208,8 @@ def test_meta_sheet_records_target_path_and_node_order(sample_workbook):
     assert meta["path"] == "subject,visit,sample"
     assert meta["node_order"] == "subject,visit,sample"
     assert meta["target_nodes"] == "sample"
-    assert str(meta["meta_format"]) == "2"
+    assert str(meta["meta_format"]) == "4"
+    assert (meta["layout"], str(meta["first_data_row"])) == ("grid", "3")
 
 
 def test_meta_sheet_target_paths_round_trip_as_json(sample_workbook):
@@ -150,6 +241,31 @@ def test_meta_sheet_records_schema_version_and_source(sample_workbook):
     assert meta["schema_source"] == spec.schema_path
 
 
+def test_output_is_deterministic(sample_workbook, tmp_path):
+    """Writing the same spec again gives byte-identical output.
+
+    Nothing time- or machine-dependent goes into the file, which is what lets a
+    generated workbook be cached and served by content hash.
+    """
+    path, spec = sample_workbook
+    again = tmp_path / "again.xlsx"
+    write_template(spec, again, data_rows=50)
+    assert again.read_bytes() == path.read_bytes()
+    assert openpyxl.load_workbook(again).properties.created.year == 1980
+
+
+def test_template_bytes_match_the_file(sample_workbook):
+    """In-memory output is the same workbook, byte for byte, as the file on disk."""
+    path, spec = sample_workbook
+    data = template_bytes(spec, data_rows=50)
+    assert data == path.read_bytes()
+
+    stream = io.BytesIO()
+    write_template(spec, stream, data_rows=50)
+    assert stream.getvalue() == data
+    assert "sample" in openpyxl.load_workbook(io.BytesIO(data)).sheetnames
+
+
 def test_instructions_sheet_shows_schema_version(sample_workbook):
     """A person opening the workbook can see the schema version on the Instructions sheet."""
     path, _ = sample_workbook